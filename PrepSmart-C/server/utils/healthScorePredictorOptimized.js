@@ -22,6 +22,10 @@ let processReady = false;
 let messageQueue = [];
 let requestId = 0;
 const pendingRequests = new Map();
+let stdoutBuffer = '';
+
+// Bridge drops requests still queued past their deadline
+const PREDICTION_TIMEOUT_MS = 30000;
 
 /**
  * Start and maintain persistent Python process
@@ -58,16 +62,24 @@ export function initializePythonProcess() {
         }
       });
 
-      // Handle stdout continuously
+      // Handle stdout continuously - batch frames can span several 'data' events
       pythonProcess.stdout.on('data', (data) => {
-        const responses = data.toString().trim().split('\n').filter(l => l);
+        stdoutBuffer += data.toString();
+        const lines = stdoutBuffer.split('\n');
+        stdoutBuffer = lines.pop();
+        const responses = lines.map(l => l.trim()).filter(l => l);
         responses.forEach(response => {
           try {
             const msg = JSON.parse(response);
             if (msg.id !== undefined && pendingRequests.has(msg.id)) {
-              const { resolve: resolveFn } = pendingRequests.get(msg.id);
+              const pending = pendingRequests.get(msg.id);
+              // Batch progress frame; the request completes with its summary
+              if (msg.type === 'chunk') {
+                pending.onChunk?.(msg);
+                return;
+              }
               pendingRequests.delete(msg.id);
-              resolveFn(msg);
+              pending.resolve(msg);
             }
           } catch (e) {
             console.error('Failed to parse Python response:', response);
@@ -85,6 +97,7 @@ export function initializePythonProcess() {
         console.error('⚠️ Python process died with code:', code);
         pythonProcess = null;
         processReady = false;
+        stdoutBuffer = '';
         
         // Reject all pending requests
         pendingRequests.forEach(({ reject }) => {
@@ -130,8 +143,9 @@ function sendToPython(message) {
 
 /**
  * Make prediction with persistent Python process
+ * priority: 'interactive' | 'default' | 'bulk' (interactive is served first)
  */
-export async function predictHealthScoreOptimized(lessonPlan) {
+export async function predictHealthScoreOptimized(lessonPlan, { priority = 'interactive' } = {}) {
   try {
     // Initialize process if needed
     if (!pythonProcess) {
@@ -142,15 +156,23 @@ export async function predictHealthScoreOptimized(lessonPlan) {
     const id = ++requestId;
     const request = {
       id,
-      lesson_plan: lessonPlan
+      lesson_plan: lessonPlan,
+      priority,
+      deadline_ms: PREDICTION_TIMEOUT_MS
     };
 
     // Send to Python
     return new Promise((resolve, reject) => {
       const timeout = setTimeout(() => {
         pendingRequests.delete(id);
+        // Let the bridge drop the request if it is still queued
+        try {
+          sendToPython({ cmd: 'cancel', id });
+        } catch (e) {
+          // Process already gone
+        }
         reject(new Error('Prediction timeout after 30 seconds'));
-      }, 30000);
+      }, PREDICTION_TIMEOUT_MS);
 
       pendingRequests.set(id, {
         resolve: (response) => {
@@ -191,16 +213,17 @@ export function shutdownPythonProcess() {
 /**
  * Predict health score with fallback
  */
-export async function predictHealthScoreWithFallback(lessonPlan) {
+export async function predictHealthScoreWithFallback(lessonPlan, options = {}) {
   try {
     const startTime = Date.now();
-    const prediction = await predictHealthScoreOptimized(lessonPlan);
+    const prediction = await predictHealthScoreOptimized(lessonPlan, options);
     const elapsed = Date.now() - startTime;
     
     console.log(`✅ ML Model Score: ${prediction.score} (${elapsed}ms)`);
     return {
       ...prediction,
-      source: 'ml_model',
+      // 'rubric' while the bridge is still loading the model
+      source: prediction.source || 'ml_model',
       elapsed
     };
   } catch (error) {
@@ -240,12 +263,80 @@ function fallbackHealthScore(lessonPlan) {
 
 /**
  * Batch predictions
+ * Sent as one {"cmd": "batch"} request, so a large batch takes a single slot in
+ * the bridge queue instead of one per plan (which overflowed --max-queue-depth
+ * and shed the excess as 'busy'). Plans the bridge could not score fall back.
  */
 export async function predictHealthScoreBatch(lessonPlans) {
-  const predictions = await Promise.all(
-    lessonPlans.map(plan => predictHealthScoreWithFallback(plan))
-  );
-  return predictions;
+  const predictions = new Array(lessonPlans.length).fill(null);
+
+  try {
+    if (!pythonProcess) {
+      await initializePythonProcess();
+    }
+
+    const id = ++requestId;
+    const startTime = Date.now();
+
+    const summary = await new Promise((resolve, reject) => {
+      // Scale with the batch size. The bridge gets the same deadline: it stops at
+      // the first chunk boundary after it, so plans not scored by then fall back
+      const timeoutMs = PREDICTION_TIMEOUT_MS + lessonPlans.length * 100;
+      const timeout = setTimeout(() => {
+        pendingRequests.delete(id);
+        try {
+          sendToPython({ cmd: 'cancel', id });
+        } catch (e) {
+          // Process already gone
+        }
+        reject(new Error(`Batch prediction timeout after ${timeoutMs}ms`));
+      }, timeoutMs);
+
+      pendingRequests.set(id, {
+        onChunk: (frame) => {
+          frame.results.forEach(({ index, result, error }) => {
+            if (!error && result) {
+              predictions[index] = { ...result, source: result.source || 'ml_model' };
+            }
+          });
+        },
+        resolve: (summary) => {
+          clearTimeout(timeout);
+          if (summary.result) {
+            resolve(summary);
+          } else {
+            reject(new Error(summary.error));
+          }
+        },
+        reject: (error) => {
+          clearTimeout(timeout);
+          reject(error);
+        }
+      });
+
+      sendToPython({
+        id,
+        cmd: 'batch',
+        lesson_plans: lessonPlans,
+        priority: 'bulk',
+        deadline_ms: timeoutMs
+      });
+    });
+
+    const elapsed = Date.now() - startTime;
+    const scored = predictions.filter(p => p).length;
+    console.log(`✅ ML Model batch: ${scored}/${lessonPlans.length} scored (${elapsed}ms)`);
+    if (scored < lessonPlans.length) {
+      console.warn(
+        `⚠️  ML Model batch ${summary.status || 'ok'}: ${lessonPlans.length - scored} plans use the fallback score`
+      );
+    }
+  } catch (error) {
+    const fallbacks = predictions.filter(p => !p).length;
+    console.warn(`⚠️  ML Model batch failed, ${fallbacks}/${lessonPlans.length} plans use the fallback score:`, error.message);
+  }
+
+  return predictions.map((prediction, i) => prediction || fallbackHealthScore(lessonPlans[i]));
 }
 
 export default {
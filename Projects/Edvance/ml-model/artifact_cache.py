@@ -0,0 +1,246 @@
+"""
+Content-addressed Training Artifact Cache
+Every fit is keyed by a hash of the training data bytes, feature list,
+estimator class, hyperparameters, fold indices and library versions
+Unchanged (candidate, fold) fits and final refits are loaded from disk
+instead of being trained again, so a no-op retrain finishes in seconds
+The directory is bounded in size: a hit refreshes the artifact's mtime and
+writes evict the least recently used artifacts once max_bytes is exceeded,
+so entries of old datasets and grids age out
+
+Usage:
+    python artifact_cache.py models/.artifact_cache --max-mb 512   # prune now
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+
+import joblib
+import numpy as np
+import sklearn
+
+# Parameters that change how a fit runs, not what it produces
+_IGNORED_PARAMS = ('n_jobs', 'verbose')
+# Eviction frees down to this share of max_bytes, so a full cache is not rescanned on every write
+_PRUNE_TO = 0.9
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(str(part.dtype).encode('utf-8'))
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'|')
+    return digest.hexdigest()
+
+
+def data_key(X, y, feature_names, sample_weight=None):
+    """Fingerprint of the training matrix, targets, row weights and feature list"""
+    parts = [np.asarray(X), np.asarray(y), list(feature_names)]
+    if sample_weight is not None:
+        parts.append(np.asarray(sample_weight))
+    return _digest(*parts)
+
+
+def estimator_key(estimator, params):
+    """Fingerprint of an estimator class with the given hyperparameters applied"""
+    cls = type(estimator)
+    merged = {**estimator.get_params(deep=False), **params}
+    for name in _IGNORED_PARAMS:
+        merged.pop(name, None)
+    return _digest(
+        f"{cls.__module__}.{cls.__qualname__}",
+        sorted((name, repr(value)) for name, value in merged.items()),
+        sklearn.__version__,
+        np.__version__
+    )
+
+
+def task_key(data_key, estimator, params, train_idx, val_idx):
+    """Fingerprint of one (candidate, fold) fit"""
+    return _digest(
+        'fold', data_key, estimator_key(estimator, params),
+        np.asarray(train_idx), np.asarray(val_idx)
+    )
+
+
+def model_key(model):
+    """Fingerprint of a fitted model (its version): hash of the joblib serialization"""
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return hashlib.sha256(buffer.getbuffer()).hexdigest()
+
+
+def importance_key(model, data_key, n_repeats, random_state):
+    """Fingerprint of a permutation-importance run of one model version on one validation set"""
+    return _digest('permutation', model_key(model), data_key, n_repeats, random_state)
+
+
+class ArtifactCache:
+    """Directory of joblib artifacts addressed by content hash, bounded by LRU eviction"""
+
+    def __init__(self, root='models/.artifact_cache', max_bytes=2 * 1024 ** 3):
+        self.root = root
+        self.max_bytes = max_bytes  # None = unbounded
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._size = None  # Bytes on disk; scanned on the first write
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.joblib")
+
+    def _entries(self):
+        """(last used, size, path) of every artifact on disk"""
+        entries = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith('.joblib'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted meanwhile
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def prune(self, max_bytes=None):
+        """
+        Delete the least recently used artifacts until the cache is within
+        _PRUNE_TO of max_bytes (default: the cache's own limit)
+
+        Returns:
+            int: artifacts deleted
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        removed = 0
+        if limit is not None and size > limit:
+            for _, entry_size, path in entries:
+                if size <= limit * _PRUNE_TO:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                size -= entry_size
+                removed += 1
+        self._size = size
+        self.stats['evicted'] += removed
+        return removed
+
+    def get(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.stats['misses'] += 1
+            return None
+        try:
+            value = joblib.load(path)
+        except Exception as e:
+            print(f"⚠️  Artifact cache read error ({key[:12]}): {str(e)}", file=sys.stderr)
+            self.stats['misses'] += 1
+            return None
+        try:
+            os.utime(path)  # Last used, for LRU eviction
+        except OSError:
+            pass
+        self.stats['hits'] += 1
+        return value
+
+    def put(self, key, value):
+        """Write atomically so an interrupted run never leaves a truncated artifact"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            joblib.dump(value, tmp_path)
+            os.replace(tmp_path, path)
+            self.stats['writes'] += 1
+        except Exception as e:
+            print(f"⚠️  Artifact cache write error ({key[:12]}): {str(e)}", file=sys.stderr)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            if self._size is None:
+                self.prune()  # Scans the directory, including this artifact
+            else:
+                self._size += os.path.getsize(path)
+                if self._size > self.max_bytes:
+                    self.prune()
+
+
+class CachingRunner:
+    """
+    Wrap a search runner (SequentialRunner / TrainingScheduler) with an ArtifactCache
+    Only tasks whose inputs changed reach the wrapped runner
+    """
+
+    def __init__(self, runner, cache, data_key):
+        self.runner = runner
+        self.cache = cache
+        self.data_key = data_key
+
+    def run_tasks(self, estimator, tasks, deadline=None, label=None, on_result=None):
+        keys = [task_key(self.data_key, estimator, *task) for task in tasks]
+        results = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if on_result is not None:
+            for i, result in enumerate(results):
+                if result is not None:
+                    on_result(i, result)
+
+        def store(position, result):
+            # Cache each fit as soon as it finishes, so interrupted runs keep their work
+            i = missing[position]
+            if not result.get('error'):
+                self.cache.put(keys[i], result)  # Failures are retried on the next run
+            if on_result is not None:
+                on_result(i, result)
+
+        if missing:
+            fitted = self.runner.run_tasks(
+                estimator, [tasks[i] for i in missing], deadline=deadline, label=label,
+                on_result=store
+            )
+            for i, result in zip(missing, fitted):
+                results[i] = result
+
+        return results
+
+    def refit(self, estimator, params, label=None):
+        key = _digest('refit', self.data_key, estimator_key(estimator, params))
+        model = self.cache.get(key)
+        if model is None:
+            model = self.runner.refit(estimator, params, label=label)
+            self.cache.put(key, model)
+        return model
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Evict least recently used training artifacts")
+    parser.add_argument('root', nargs='?', default='models/.artifact_cache', help="Artifact cache directory")
+    parser.add_argument('--max-mb', type=float, default=2048, help="Evict the oldest artifacts above this size")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    cache = ArtifactCache(args.root, max_bytes=int(args.max_mb * 1024 ** 2))
+    removed = cache.prune()
+    print(f"✅ Removed {removed} artifacts; {cache._size / 1024 ** 2:.1f} MB left in {args.root}")
@@ -0,0 +1,131 @@
+"""
+Benchmark Reports and Baseline Comparison
+Shared by the training and inference benchmarks: a report is a JSON file
+with the machine it ran on and a list of result rows; rows are matched to the
+baseline's by their key fields and each tracked metric is checked against a
+relative tolerance
+"""
+
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+import numpy as np
+import sklearn
+
+
+def machine_info():
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far (None where resource is unavailable)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def latency_stats(seconds):
+    """p50 / p99 / p99.9 / mean in ms and sequential ops/sec of a list of latencies (seconds)"""
+    ms = np.asarray(seconds, dtype=float) * 1000
+    if not len(ms):
+        return {'count': 0}
+    return {
+        'count': len(ms),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'p999_ms': float(np.percentile(ms, 99.9)),
+        'mean_ms': float(ms.mean()),
+        'max_ms': float(ms.max()),
+        'ops_per_s': float(1000 / ms.mean()) if ms.mean() > 0 else None
+    }
+
+
+def write_report(path, benchmark, results, **extra):
+    report = {
+        'benchmark': benchmark,
+        'created': datetime.now().isoformat(),
+        'machine': machine_info(),
+        **extra,
+        'results': results
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def load_report(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results, baseline, keys, metrics, tolerance=0.2):
+    """
+    Compare result rows with the baseline's
+
+    Args:
+        results / baseline: lists of result dicts
+        keys: fields identifying a row, e.g. ('family', 'rows')
+        metrics: metric -> 'lower' or 'higher' (which direction is better),
+            or (direction, absolute tolerance) to override the relative one
+        tolerance: allowed relative change in the worse direction
+
+    Returns:
+        list of comparison dicts, each with 'regressed'
+    """
+    previous = {tuple(row.get(key) for key in keys): row for row in baseline}
+    comparisons = []
+    for row in results:
+        before = previous.get(tuple(row.get(key) for key in keys))
+        if before is None:
+            continue
+        for metric, rule in metrics.items():
+            direction, absolute = rule if isinstance(rule, tuple) else (rule, None)
+            old, new = before.get(metric), row.get(metric)
+            if old is None or new is None:
+                continue
+            change = new - old if direction == 'higher' else old - new  # > 0 is better
+            allowed = absolute if absolute is not None else tolerance * abs(old)
+            comparisons.append({
+                **{key: row.get(key) for key in keys},
+                'metric': metric,
+                'baseline': old,
+                'current': new,
+                'relative_change': (new - old) / abs(old) if old else None,
+                'regressed': change < -allowed
+            })
+    return comparisons
+
+
+def print_comparisons(comparisons, keys):
+    regressions = [comparison for comparison in comparisons if comparison['regressed']]
+    for comparison in comparisons:
+        label = ' / '.join(str(comparison[key]) for key in keys)
+        change = comparison['relative_change']
+        change = f"{change:+.1%}" if change is not None else "n/a"
+        mark = "❌" if comparison['regressed'] else "✓"
+        print(
+            f"   {mark} {label} {comparison['metric']}: {comparison['baseline']:.4g} -> "
+            f"{comparison['current']:.4g} ({change})"
+        )
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) past tolerance")
+    else:
+        print(f"\n✅ No regressions against the baseline")
+    return regressions
@@ -0,0 +1,107 @@
+"""
+Fit Time vs. Rows: Histogram Boosting vs. Exact Gradient Boosting
+Trains on synthetic rows (synthetic_data.py) at 10k / 100k / 1M / 10M rows
+and reports fit time, boosting iterations and holdout R² per size
+Exact GradientBoostingRegressor is only run up to --exact-max-rows
+
+Usage:
+    python benchmark_hist_boosting.py
+    python benchmark_hist_boosting.py --sizes 10000 100000 --threads 4
+"""
+
+import argparse
+import json
+import os
+import time
+
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import r2_score
+
+from synthetic_data import synthetic_training_data
+from train_model import make_hist_gradient_boosting
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+HOLDOUT_ROWS = 20_000
+
+
+def _thread_limit(threads):
+    """Context manager capping OpenMP threads (no-op without threadpoolctl)"""
+    try:
+        from threadpoolctl import threadpool_limits
+        return threadpool_limits(limits=threads, user_api='openmp')
+    except ImportError:
+        import contextlib
+        return contextlib.nullcontext()
+
+
+def time_fit(model, X, y, X_holdout, y_holdout, threads=None):
+    with _thread_limit(threads):
+        started = time.perf_counter()
+        model.fit(X, y)
+        fit_time = time.perf_counter() - started
+    return {
+        'fit_time': fit_time,
+        'iterations': int(getattr(model, 'n_iter_', getattr(model, 'n_estimators_', 0))),
+        'r2': float(r2_score(y_holdout, model.predict(X_holdout)))
+    }
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, exact_max_rows=100_000, threads=None, seed=42):
+    X_holdout, y_holdout = synthetic_training_data(HOLDOUT_ROWS, seed=seed + 1)
+    results = []
+
+    for n_rows in sizes:
+        X, y = synthetic_training_data(n_rows, seed=seed)
+        row = {'rows': n_rows}
+
+        hist = time_fit(make_hist_gradient_boosting(), X, y, X_holdout, y_holdout, threads)
+        row['hist'] = hist
+        print(
+            f"   {n_rows:>10,} rows | hist:  {hist['fit_time']:8.2f}s "
+            f"({hist['iterations']} iters, R² {hist['r2']:.4f})"
+        )
+
+        if n_rows <= exact_max_rows:
+            exact = time_fit(
+                GradientBoostingRegressor(random_state=42, subsample=0.8),
+                X, y, X_holdout, y_holdout, threads
+            )
+            row['exact'] = exact
+            print(
+                f"   {'':>10} rows | exact: {exact['fit_time']:8.2f}s "
+                f"({exact['iterations']} iters, R² {exact['r2']:.4f}) "
+                f"-> hist {exact['fit_time'] / max(hist['fit_time'], 1e-9):.1f}x faster"
+            )
+
+        results.append(row)
+        del X, y
+
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark histogram boosting fit time vs. rows")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts")
+    parser.add_argument(
+        '--exact-max-rows', type=int, default=100_000,
+        help="Largest size also fitted with exact GradientBoostingRegressor"
+    )
+    parser.add_argument('--threads', type=int, default=None, help="OpenMP threads (default: all cores)")
+    parser.add_argument('--output', default=None, help="Optional JSON file for the results")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    print("=" * 70)
+    print("⏱  HISTOGRAM BOOSTING BENCHMARK")
+    print("=" * 70)
+    print(f"   CPU cores: {os.cpu_count()}, threads: {args.threads or 'all'}")
+
+    results = run_benchmark(args.sizes, exact_max_rows=args.exact_max_rows, threads=args.threads)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results saved to {args.output}")
@@ -0,0 +1,252 @@
+"""
+Inference Benchmark and Regression Harness for HealthScorePredictor
+Scores a fixed corpus (data/lesson_plans.json) four ways:
+    cold_start     fresh process: import predict + load model + first prediction
+    single_row     warm predict_with_reasoning, one plan per call
+    batch_<n>      warm predict_batch_with_reasoning at several batch sizes
+    bridge         request/response round trips to node_bridge_persistent.py over pipes
+and reports p50 / p99 latency and ops/sec per benchmark. Results are compared
+with a stored baseline and the run fails on a regression past the tolerance
+
+Usage:
+    python benchmark_inference.py --save-baseline   # accept the current numbers
+    python benchmark_inference.py                   # exits 1 on a regression
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+import warnings
+
+from benchmark_baseline import (
+    compare_to_baseline, latency_stats, load_report, peak_rss_mb, print_comparisons, write_report
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(HERE, 'data', 'lesson_plans.json')
+DEFAULT_BASELINE = 'benchmarks/inference_baseline.json'
+DEFAULT_REPORT = 'benchmarks/inference_report.json'
+DEFAULT_BATCH_SIZES = [1, 16, 64, 256]
+
+warnings.filterwarnings('ignore')
+
+TRACKED_METRICS = {
+    'p50_ms': 'lower',
+    'p99_ms': 'lower',
+    'ops_per_s': 'higher'
+}
+
+
+def load_corpus(path=DEFAULT_CORPUS, size=None):
+    """The benchmark plans, always in file order so every run scores the same inputs"""
+    with open(path) as f:
+        plans = json.load(f)
+    return plans[:size] if size else plans
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silence the predictor's per-call debug prints, as the bridge does"""
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        yield
+
+
+def cold_start_once(corpus_path):
+    """Import + load + first prediction in this (fresh) process"""
+    started = time.perf_counter()
+    from predict import HealthScorePredictor
+    imported = time.perf_counter()
+    predictor = HealthScorePredictor()
+    loaded = time.perf_counter()
+    plan = load_corpus(corpus_path, size=1)[0]
+    first_started = time.perf_counter()
+    with _quiet():
+        predictor.predict_with_reasoning(plan)
+    done = time.perf_counter()
+    return {
+        'import_ms': (imported - started) * 1000,
+        'load_ms': (loaded - imported) * 1000,
+        'first_prediction_ms': (done - first_started) * 1000,
+        'total_ms': (imported - started + loaded - imported + done - first_started) * 1000,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def bench_cold_start(corpus_path, repeats=5):
+    runs = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--cold-start-once', '--corpus', corpus_path],
+            capture_output=True, text=True, cwd=HERE, check=True
+        )
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    stats = latency_stats([run['total_ms'] / 1000 for run in runs])
+    for part in ('import_ms', 'load_ms', 'first_prediction_ms'):
+        stats[part] = sorted(run[part] for run in runs)[len(runs) // 2]
+    stats['peak_rss_mb'] = max(run['peak_rss_mb'] or 0 for run in runs)
+    return stats
+
+
+def bench_single_row(predictor, plans, calls=2000, warmup=50):
+    with _quiet():
+        for i in range(warmup):
+            predictor.predict_with_reasoning(plans[i % len(plans)])
+        latencies = []
+        for i in range(calls):
+            started = time.perf_counter()
+            predictor.predict_with_reasoning(plans[i % len(plans)])
+            latencies.append(time.perf_counter() - started)
+    return latency_stats(latencies)
+
+
+def bench_batch(predictor, plans, batch_size, min_plans=4000, warmup=2):
+    """Per-call latency of one batch; ops_per_s counts plans, not calls"""
+    batches = [
+        [plans[(start + i) % len(plans)] for i in range(batch_size)]
+        for start in range(0, max(min_plans, batch_size * 5), batch_size)
+    ]
+    with _quiet():
+        for batch in batches[:warmup]:
+            predictor.predict_batch_with_reasoning(batch)
+        latencies = []
+        for batch in batches:
+            started = time.perf_counter()
+            predictor.predict_batch_with_reasoning(batch)
+            latencies.append(time.perf_counter() - started)
+    stats = latency_stats(latencies)
+    stats['batch_size'] = batch_size
+    stats['ops_per_s'] = batch_size * len(latencies) / sum(latencies)
+    return stats
+
+
+def start_bridge(extra_args=(), env=None, command=None):
+    """
+    Start node_bridge_persistent.py with the trained model loaded; returns (process, seconds to READY)
+
+    command replaces the default interpreter + script, e.g. another build's
+    bridge or `ssh host python .../node_bridge_persistent.py`
+    """
+    started = time.perf_counter()
+    command = list(command) if command else [
+        sys.executable, os.path.join(HERE, 'node_bridge_persistent.py'), '--wait-for-model'
+    ]
+    process = subprocess.Popen(
+        [*command, *extra_args],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, bufsize=1, cwd=HERE, env=env
+    )
+    for line in process.stdout:
+        if line.strip() == 'READY':
+            return process, time.perf_counter() - started
+    raise RuntimeError("Bridge exited before printing READY")
+
+
+def bench_bridge(plans, calls=1000, warmup=20):
+    """Sequential request -> response round trips over the bridge's stdin/stdout pipes"""
+    process, ready_time = start_bridge()
+    try:
+        latencies = []
+        errors = 0
+        for i in range(warmup + calls):
+            request = json.dumps({'id': i, 'lesson_plan': plans[i % len(plans)]})
+            started = time.perf_counter()
+            process.stdin.write(request + '\n')
+            process.stdin.flush()
+            response = json.loads(process.stdout.readline())
+            elapsed = time.perf_counter() - started
+            if response.get('error'):
+                errors += 1
+            if i >= warmup:
+                latencies.append(elapsed)
+    finally:
+        process.stdin.close()
+        process.wait(timeout=30)
+    stats = latency_stats(latencies)
+    stats['ready_ms'] = ready_time * 1000
+    stats['errors'] = errors
+    return stats
+
+
+def run_benchmark(corpus_path=DEFAULT_CORPUS, batch_sizes=DEFAULT_BATCH_SIZES, cold_repeats=5,
+                  single_calls=2000, bridge_calls=1000, skip_bridge=False):
+    plans = load_corpus(corpus_path)
+    results = []
+
+    def record(name, stats):
+        results.append({'name': name, **stats})
+        print(
+            f"   {name:<14} p50 {stats['p50_ms']:8.3f} ms | p99 {stats['p99_ms']:8.3f} ms | "
+            f"{stats['ops_per_s']:>12,.1f} ops/s"
+        )
+
+    record('cold_start', bench_cold_start(corpus_path, cold_repeats))
+
+    from predict import HealthScorePredictor
+    predictor = HealthScorePredictor()
+    predictor.warm_up()
+    record('single_row', bench_single_row(predictor, plans, calls=single_calls))
+    for batch_size in batch_sizes:
+        record(f'batch_{batch_size}', bench_batch(predictor, plans, batch_size))
+
+    if not skip_bridge:
+        record('bridge', bench_bridge(plans, calls=bridge_calls))
+
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HealthScorePredictor inference")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="Lesson plans JSON list")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=DEFAULT_BATCH_SIZES)
+    parser.add_argument('--cold-repeats', type=int, default=5, help="Fresh processes for cold start")
+    parser.add_argument('--single-calls', type=int, default=2000)
+    parser.add_argument('--bridge-calls', type=int, default=1000)
+    parser.add_argument('--skip-bridge', action='store_true')
+    parser.add_argument('--output', default=DEFAULT_REPORT, help="JSON report")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline report to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--cold-start-once', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.chdir(HERE)  # Model paths in predict.py are relative to ml-model/
+
+    if args.cold_start_once:
+        print(json.dumps(cold_start_once(args.corpus)))
+        sys.exit(0)
+
+    print("=" * 70)
+    print("⏱  INFERENCE BENCHMARK")
+    print("=" * 70)
+    print(f"   Corpus: {args.corpus}")
+
+    results = run_benchmark(
+        args.corpus, args.batch_sizes, cold_repeats=args.cold_repeats,
+        single_calls=args.single_calls, bridge_calls=args.bridge_calls, skip_bridge=args.skip_bridge
+    )
+    write_report(args.output, 'inference', results, corpus=os.path.relpath(args.corpus))
+    print(f"\n✅ Report saved to {args.output}")
+
+    if args.save_baseline:
+        write_report(args.baseline, 'inference', results, corpus=os.path.relpath(args.corpus))
+        print(f"✅ Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    baseline = load_report(args.baseline)
+    if baseline is None:
+        print(f"ℹ️  No baseline at {args.baseline} - run with --save-baseline to create one")
+        sys.exit(0)
+
+    print(f"\n📊 Against baseline {args.baseline} ({baseline['created']}):")
+    comparisons = compare_to_baseline(
+        results, baseline['results'], ('name',), TRACKED_METRICS, tolerance=args.tolerance
+    )
+    regressions = print_comparisons(comparisons, ('name',))
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,166 @@
+"""
+Training Scaling Benchmark
+Fits every model family of HealthScoreModelTrainer (untuned estimators, as
+the searches start from) on synthetic rows (synthetic_data.py) at 10k / 100k
+/ 1M rows and records fit and predict wall time, peak RSS and holdout R²
+Each (family, size) runs in its own process, so peak RSS belongs to that fit
+alone; a family that hits --timeout is not run at larger sizes
+The JSON report is compared with a stored baseline and the run fails when
+fit time, memory or R² regress past the tolerance
+
+Usage:
+    python benchmark_training.py                                   # compare with the baseline
+    python benchmark_training.py --sizes 10000 100000 --families HistGradientBoosting
+    python benchmark_training.py --save-baseline                   # accept the current numbers
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmark_baseline import compare_to_baseline, load_report, peak_rss_mb, print_comparisons, write_report
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+FAMILIES = ['RandomForest', 'GradientBoosting', 'AdaBoost', 'HistGradientBoosting']
+HOLDOUT_ROWS = 20_000
+DEFAULT_BASELINE = 'benchmarks/training_baseline.json'
+DEFAULT_REPORT = 'benchmarks/training_report.json'
+
+# Direction of improvement; R² is held to an absolute 0.01 instead of a relative tolerance
+TRACKED_METRICS = {
+    'fit_time': 'lower',
+    'peak_rss_mb': 'lower',
+    'r2': ('higher', 0.01)
+}
+
+
+def run_one(family, n_rows, seed=42):
+    """Fit and score one family at one size in this process"""
+    from sklearn.metrics import r2_score
+
+    from synthetic_data import synthetic_training_data
+    from train_model import HealthScoreModelTrainer
+
+    X, y = synthetic_training_data(n_rows, seed=seed)
+    X_holdout, y_holdout = synthetic_training_data(HOLDOUT_ROWS, seed=seed + 1)
+    rss_before = peak_rss_mb()
+
+    model = HealthScoreModelTrainer(cache_dir=None, checkpoint_path=None)._estimator(family)
+    started = time.perf_counter()
+    model.fit(X, y)
+    fit_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    predictions = model.predict(X_holdout)
+    predict_time = time.perf_counter() - started
+
+    return {
+        'family': family,
+        'rows': n_rows,
+        'status': 'ok',
+        'fit_time': fit_time,
+        'predict_time': predict_time,
+        'predict_rows_per_s': HOLDOUT_ROWS / predict_time if predict_time > 0 else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'data_rss_mb': rss_before,
+        'r2': float(r2_score(y_holdout, predictions))
+    }
+
+
+def run_isolated(family, n_rows, seed=42, timeout=None):
+    """run_one in a child process; the result's peak RSS is the child's"""
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run-one', family, str(n_rows), '--seed', str(seed)],
+            capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {'family': family, 'rows': n_rows, 'status': 'timeout', 'wall_time': time.perf_counter() - started}
+
+    if completed.returncode != 0:
+        if completed.returncode < 0:
+            error = f"killed by signal {-completed.returncode} (out of memory?)"
+        else:
+            error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else completed.returncode
+        return {'family': family, 'rows': n_rows, 'status': 'error', 'error': error}
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['wall_time'] = time.perf_counter() - started
+    return result
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, families=FAMILIES, seed=42, timeout=900):
+    results = []
+    for family in families:
+        for n_rows in sizes:
+            result = run_isolated(family, n_rows, seed=seed, timeout=timeout)
+            results.append(result)
+            if result['status'] != 'ok':
+                print(f"   {family:<22} {n_rows:>10,} rows | {result['status']}"
+                      + (f": {result['error']}" if 'error' in result else ""))
+                break  # Larger sizes would only take longer
+            print(
+                f"   {family:<22} {n_rows:>10,} rows | fit {result['fit_time']:8.2f}s, "
+                f"predict {result['predict_rows_per_s']:>12,.0f} rows/s, "
+                f"peak RSS {result['peak_rss_mb']:7.0f} MB, R² {result['r2']:.4f}"
+            )
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model-family training time and memory vs. rows")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts")
+    parser.add_argument('--families', nargs='+', default=FAMILIES, choices=FAMILIES, help="Model families")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=900, help="Seconds per (family, size) run")
+    parser.add_argument('--output', default=DEFAULT_REPORT, help="JSON report")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline report to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown / memory growth")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--run-one', nargs=2, metavar=('FAMILY', 'ROWS'), help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.run_one:
+        family, n_rows = args.run_one
+        print(json.dumps(run_one(family, int(n_rows), seed=args.seed)))
+        sys.exit(0)
+
+    print("=" * 70)
+    print("⏱  TRAINING SCALING BENCHMARK")
+    print("=" * 70)
+    print(f"   CPU cores: {os.cpu_count()}, holdout: {HOLDOUT_ROWS:,} rows")
+
+    results = run_benchmark(args.sizes, args.families, seed=args.seed, timeout=args.timeout)
+    write_report(args.output, 'training', results, sizes=args.sizes, holdout_rows=HOLDOUT_ROWS)
+    print(f"\n✅ Report saved to {args.output}")
+
+    if args.save_baseline:
+        write_report(args.baseline, 'training', results, sizes=args.sizes, holdout_rows=HOLDOUT_ROWS)
+        print(f"✅ Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    baseline = load_report(args.baseline)
+    if baseline is None:
+        print(f"ℹ️  No baseline at {args.baseline} - run with --save-baseline to create one")
+        sys.exit(0)
+
+    print(f"\n📊 Against baseline {args.baseline} ({baseline['created']}):")
+    ok = [result for result in results if result['status'] == 'ok']
+    comparisons = compare_to_baseline(
+        ok, baseline['results'], ('family', 'rows'), TRACKED_METRICS, tolerance=args.tolerance
+    )
+    # A run that finished in the baseline but not now is a regression too
+    finished_before = {(row['family'], row['rows']) for row in baseline['results'] if row.get('status') == 'ok'}
+    missing = [result for result in results
+               if result['status'] != 'ok' and (result['family'], result['rows']) in finished_before]
+    for result in missing:
+        print(f"   ❌ {result['family']} / {result['rows']}: {result['status']} (finished in the baseline)")
+    regressions = print_comparisons(comparisons, ('family', 'rows'))
+    sys.exit(1 if regressions or missing else 0)
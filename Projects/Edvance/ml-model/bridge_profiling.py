@@ -0,0 +1,195 @@
+"""
+On-demand Profiling Windows for the Persistent Bridge
+{"cmd": "profile", "seconds": 30}      cProfile every request served in the window
+{"cmd": "heap_snapshot", "seconds": 10} tracemalloc the window, then snapshot it
+Each window writes its full output (a .prof file for pstats / snakeviz, or a
+text report of allocation sites) and returns a short summary as the response
+to the control message once the window closes
+Nothing is hooked while no window is open: the bridge checks one global for
+None per request, and tracemalloc runs only for the length of a heap window
+"""
+
+import cProfile
+import io
+import linecache
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Control messages that open a window (handled inline by the bridge, never queued)
+PROFILING_COMMANDS = ('profile', 'heap_snapshot')
+
+MAX_WINDOW_SECONDS = 600
+DEFAULT_PROFILE_SECONDS = 30
+DEFAULT_HEAP_SECONDS = 10
+TOP_ENTRIES = 20
+
+
+def window_seconds(request):
+    """Length of the window a control message asks for (ValueError if out of range)"""
+    default = DEFAULT_PROFILE_SECONDS if request.get('cmd') == 'profile' else DEFAULT_HEAP_SECONDS
+    seconds = float(request.get('seconds', default))
+    if not 0 < seconds <= MAX_WINDOW_SECONDS:
+        raise ValueError(f"seconds must be in (0, {MAX_WINDOW_SECONDS}]")
+    return seconds
+
+
+def _output_path(output_dir, kind, suffix):
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    return os.path.join(output_dir, f"bridge-{kind}-{stamp}-{os.getpid()}{suffix}")
+
+
+class ProfileWindow:
+    """
+    cProfile the requests dispatched on the worker thread until the window closes
+
+    cProfile only sees the thread that enables it, so the worker wraps each
+    dispatch in run(); the lock keeps finish() from writing the stats mid-request
+    """
+
+    def __init__(self, request_id, seconds, output_dir, on_done):
+        self.request_id = request_id
+        self.seconds = seconds
+        self.output_dir = output_dir
+        self.on_done = on_done
+        self.requests = 0
+        self._profile = cProfile.Profile()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._started = time.perf_counter()
+        self._timer = threading.Timer(seconds, self.finish)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def run(self, function, *args):
+        with self._lock:
+            if self._closed:
+                return function(*args)
+            self.requests += 1
+            self._profile.enable()
+            try:
+                return function(*args)
+            finally:
+                self._profile.disable()
+
+    def finish(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._timer.cancel()
+        try:
+            path = _output_path(self.output_dir, 'profile', '.prof')
+            self._profile.dump_stats(path)
+            result = {
+                'cmd': 'profile',
+                'file': path,
+                'seconds': round(time.perf_counter() - self._started, 1),
+                'requests': self.requests,
+                'thread': 'bridge-worker',
+                'top': self.top() if self.requests else []
+            }
+            self.on_done(self, {'id': self.request_id, 'result': result, 'error': None})
+        except Exception as e:
+            self.on_done(self, {'id': self.request_id, 'result': None, 'error': f"Profile failed: {str(e)}"})
+
+    def top(self, limit=TOP_ENTRIES):
+        """Functions with the most cumulative time"""
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (_, calls, total, cumulative, _) in stats.stats.items():
+            rows.append({
+                'function': f"{os.path.basename(filename)}:{line}({name})",
+                'calls': calls,
+                'total_ms': round(total * 1000, 3),
+                'cumulative_ms': round(cumulative * 1000, 3)
+            })
+        rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+        return rows[:limit]
+
+
+class HeapWindow:
+    """
+    Trace allocations for a window, then report the largest allocation sites
+    and the sites that grew most during the window (leak candidates)
+
+    If tracemalloc was already on (PYTHONTRACEMALLOC), it is left on afterwards
+    """
+
+    def __init__(self, request_id, seconds, output_dir, on_done, frames=1):
+        self.request_id = request_id
+        self.seconds = seconds
+        self.output_dir = output_dir
+        self.on_done = on_done
+        self._lock = threading.Lock()
+        self._closed = False
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start(frames)
+        self._start_snapshot = tracemalloc.take_snapshot()
+        self._started = time.perf_counter()
+        self._timer = threading.Timer(seconds, self.finish)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def finish(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._timer.cancel()
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if not self._was_tracing:
+                tracemalloc.stop()
+
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, linecache.__file__)]
+            snapshot = snapshot.filter_traces(ignore)
+            largest = snapshot.statistics('lineno')
+            growth = snapshot.compare_to(self._start_snapshot.filter_traces(ignore), 'lineno')
+
+            path = _output_path(self.output_dir, 'heap', '.txt')
+            with open(path, 'w') as f:
+                f.write(f"Traced: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak\n\n")
+                f.write("Largest allocation sites:\n")
+                for stat in largest[:100]:
+                    f.write(f"{stat}\n")
+                f.write("\nGrowth during the window:\n")
+                for stat in growth[:100]:
+                    f.write(f"{stat}\n")
+
+            def site(stat):
+                frame = stat.traceback[0]
+                return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+            result = {
+                'cmd': 'heap_snapshot',
+                'file': path,
+                'seconds': round(time.perf_counter() - self._started, 1),
+                'traced_kib': round(current / 1024, 1),
+                'peak_kib': round(peak / 1024, 1),
+                'top': [
+                    {'site': site(stat), 'size_kib': round(stat.size / 1024, 1), 'blocks': stat.count}
+                    for stat in largest[:TOP_ENTRIES]
+                ],
+                'growth': [
+                    {'site': site(stat), 'size_diff_kib': round(stat.size_diff / 1024, 1),
+                     'blocks_diff': stat.count_diff}
+                    for stat in growth[:TOP_ENTRIES] if stat.size_diff > 0
+                ]
+            }
+            self.on_done(self, {'id': self.request_id, 'result': result, 'error': None})
+        except Exception as e:
+            if not self._was_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self.on_done(self, {'id': self.request_id, 'result': None, 'error': f"Heap snapshot failed: {str(e)}"})
+
+
+def start_window(request, seconds, output_dir, on_done):
+    """Open the profile / heap_snapshot window a control message asks for"""
+    window = ProfileWindow if request.get('cmd') == 'profile' else HeapWindow
+    return window(request.get('id'), seconds, output_dir, on_done)
@@ -0,0 +1,247 @@
+"""
+Deadline-aware Priority Scheduling for the Persistent Bridge
+Requests carry an optional priority class and deadline
+Interactive requests are served before bulk ones, expired requests fail fast,
+and the queue is bounded so overload produces fast "busy" errors
+"""
+
+import heapq
+import itertools
+from collections import deque
+import threading
+import time
+
+# Lower rank is served first
+PRIORITY_CLASSES = {
+    'interactive': 0,
+    'default': 1,
+    'bulk': 2
+}
+
+
+class QueueFullError(Exception):
+    """Raised when a request arrives while the queue is at its configured depth"""
+
+
+class ScheduledRequest:
+    """A queued request with its priority, deadline and cancellation flag"""
+
+    __slots__ = ('request', 'request_id', 'rank', 'deadline', 'arrival', 'cancelled')
+
+    def __init__(self, request, rank, deadline, arrival):
+        self.request = request
+        self.request_id = request.get('id')
+        self.rank = rank
+        self.deadline = deadline
+        self.arrival = arrival
+        self.cancelled = False
+
+    def expired(self, now=None):
+        if self.deadline is None:
+            return False
+        return (now if now is not None else time.monotonic()) >= self.deadline
+
+    def remaining(self, now=None):
+        """Seconds left before the deadline (None if there is no deadline)"""
+        if self.deadline is None:
+            return None
+        return self.deadline - (now if now is not None else time.monotonic())
+
+
+def parse_priority(request):
+    """Map a request's priority class to a queue rank"""
+    priority = request.get('priority', 'default')
+    if not isinstance(priority, str) or priority not in PRIORITY_CLASSES:
+        raise ValueError(
+            f"Unknown priority {priority!r}, expected one of {sorted(PRIORITY_CLASSES)}"
+        )
+    return PRIORITY_CLASSES[priority]
+
+
+def parse_deadline(request, arrival):
+    """
+    Convert a request deadline to a monotonic timestamp
+
+    Accepts either:
+        - deadline_ms: time budget in milliseconds, relative to arrival
+        - deadline: absolute Unix epoch time in milliseconds (e.g. Date.now() + 30000)
+    """
+    for field in ('deadline_ms', 'deadline'):
+        value = request.get(field)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{field} must be a number of milliseconds")
+        try:
+            milliseconds = float(value)
+        except ValueError:
+            raise ValueError(f"{field} must be a number of milliseconds")
+        if field == 'deadline_ms':
+            return arrival + milliseconds / 1000.0
+        return arrival + (milliseconds / 1000.0 - time.time())
+    return None
+
+
+def parse_request_id(request):
+    """A request's id, which keys cancellation and must therefore be hashable"""
+    request_id = request.get('id')
+    if isinstance(request_id, (list, dict)):
+        raise ValueError("id must be a string or number")
+    return request_id
+
+
+class RequestScheduler:
+    """Bounded priority queue of bridge requests shared by reader and worker threads"""
+
+    def __init__(self, max_depth=64):
+        self.max_depth = max_depth
+        self._heap = []
+        self._pending = {}  # request id -> ScheduledRequest (for cancel)
+        self._running = {}  # request id -> ScheduledRequest being processed
+        self._expired = deque()  # Purged from the heap at capacity, still to be fast-failed
+        self._depth = 0
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.stats = {
+            'accepted': 0,
+            'rejected_busy': 0,
+            'cancelled': 0,
+            'expired': 0
+        }
+
+    def __len__(self):
+        with self._condition:
+            return self._depth
+
+    def submit(self, request):
+        """
+        Queue a request
+
+        Returns:
+            ScheduledRequest
+
+        Raises:
+            ValueError: invalid id, priority or deadline, or the id is already queued or running
+            QueueFullError: the queue already holds max_depth live requests
+        """
+        parse_request_id(request)
+        arrival = time.monotonic()
+        entry = ScheduledRequest(
+            request,
+            parse_priority(request),
+            parse_deadline(request, arrival),
+            arrival
+        )
+
+        with self._condition:
+            request_id = entry.request_id
+            if request_id is not None and (request_id in self._pending or request_id in self._running):
+                raise ValueError(f"Duplicate request id {request_id!r}: a request with this id is still pending")
+            if self._depth >= self.max_depth:
+                self._purge_expired()
+            if self._depth >= self.max_depth:
+                self.stats['rejected_busy'] += 1
+                raise QueueFullError(
+                    f"Bridge busy: queue depth {self._depth} reached limit {self.max_depth}"
+                )
+
+            # FIFO within a priority class
+            heapq.heappush(self._heap, (entry.rank, next(self._sequence), entry))
+            if entry.request_id is not None:
+                self._pending[entry.request_id] = entry
+            self._depth += 1
+            self.stats['accepted'] += 1
+            self._condition.notify()
+
+        return entry
+
+    def _purge_expired(self):
+        """
+        Move expired requests out of the heap so they stop counting toward the depth
+
+        They are still handed out by next() (ahead of live work) so the caller
+        can answer them with an 'expired' rejection. Caller holds the lock.
+        """
+        now = time.monotonic()
+        live = []
+        for item in self._heap:
+            entry = item[2]
+            if entry.cancelled:
+                continue
+            if entry.expired(now):
+                self._pending.pop(entry.request_id, None)
+                self._expired.append(entry)
+                self._depth -= 1
+            else:
+                live.append(item)
+        heapq.heapify(live)
+        self._heap = live
+
+    def cancel(self, request_id):
+        """
+        Cancel a queued request by id
+
+        A request that is already running is only flagged; long-running handlers
+        (e.g. batches) check the flag between chunks and stop early.
+
+        Returns:
+            ScheduledRequest if it was still queued, else None (unknown or already running)
+        """
+        if isinstance(request_id, (list, dict)):
+            return None
+        with self._condition:
+            entry = self._pending.pop(request_id, None)
+            if entry is None:
+                running = self._running.get(request_id)
+                if running is not None:
+                    running.cancelled = True
+                return None
+            # Removed lazily when it reaches the top of the heap
+            entry.cancelled = True
+            self._depth -= 1
+            self.stats['cancelled'] += 1
+            return entry
+
+    def next(self):
+        """
+        Block until the next live request is available
+
+        Returns:
+            ScheduledRequest, or None once the scheduler is closed and drained.
+            Expired requests are returned too so the caller can fast-fail them.
+        """
+        with self._condition:
+            while True:
+                if self._expired:
+                    entry = self._expired.popleft()
+                    self.stats['expired'] += 1
+                    return entry
+
+                while self._heap:
+                    _, _, entry = heapq.heappop(self._heap)
+                    if entry.cancelled:
+                        continue
+                    self._pending.pop(entry.request_id, None)
+                    self._depth -= 1
+                    if entry.request_id is not None:
+                        self._running[entry.request_id] = entry
+                    if entry.expired():
+                        self.stats['expired'] += 1
+                    return entry
+
+                if self._closed:
+                    return None
+                self._condition.wait()
+
+    def finish(self, entry):
+        """Mark a request returned by next() as done"""
+        with self._condition:
+            if self._running.get(entry.request_id) is entry:
+                del self._running[entry.request_id]
+
+    def close(self):
+        """Stop accepting work; next() returns None once the queue is drained"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
@@ -0,0 +1,262 @@
+"""
+Compact Columnar Cache for Training CSVs
+Each column is stored as its own .npy file with the smallest dtype that holds
+it exactly - small counts as uint8/uint16, the health score as float32, text
+columns as uint8/uint16 category codes - and memory-mapped on load
+Dtypes are chosen from the whole CSV before anything is written: a column that
+turns out to be text in a later chunk is re-scanned for its categories, and
+every written chunk is checked to decode back to the values read
+The cache is used only while it is newer than its CSV, so edits are picked up
+
+Usage:
+    python columnar_cache.py data/training_data.csv   # build (chunked, any CSV size)
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = 'manifest.json'
+_UNSIGNED = (np.uint8, np.uint16, np.uint32, np.uint64)
+_SIGNED = (np.int8, np.int16, np.int32, np.int64)
+_FLOAT32_EXACT_INT = 2 ** 24  # Larger integers lose digits in float32 (needed when there are NaNs)
+
+
+def cache_dir_for(csv_path):
+    """data/training_data.csv -> data/.columnar/training_data"""
+    directory, filename = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, '.columnar', os.path.splitext(filename)[0])
+
+
+class _ColumnStats:
+    """Running min / max / integrality of a numeric column, or categories of a text column"""
+
+    def __init__(self):
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.integral = True
+        self.float32_exact = True  # Every value reads back as the same decimal from float32
+        self.has_nan = False
+        self.categories = None
+        self.promoted = False  # Became text after numeric chunks: categories need a re-scan
+        self._seen_numeric = False
+        self._known = set()
+
+    def update(self, series):
+        numeric = pd.to_numeric(series, errors='coerce')
+        if self.categories is None and numeric.notna().sum() < series.notna().sum():
+            self.categories = []  # Text column from here on
+            self.promoted = self._seen_numeric
+        if self.categories is not None:
+            for value in pd.unique(series.dropna().astype(str)):
+                if value not in self._known:
+                    self._known.add(value)
+                    self.categories.append(value)
+            return
+
+        self._seen_numeric = True
+        values = numeric.to_numpy(dtype=float)
+        finite = values[~np.isnan(values)]
+        self.has_nan |= len(finite) < len(values)
+        if len(finite):
+            self.minimum = min(self.minimum, float(finite.min()))
+            self.maximum = max(self.maximum, float(finite.max()))
+            self.integral &= bool(np.all(finite == np.round(finite)))
+            if self.float32_exact and not self.integral:
+                self.float32_exact = _float32_exact(finite)
+
+    def restart_categories(self):
+        """Collect the categories again from the first chunk (after a late switch to text)"""
+        self.categories = []
+        self._known = set()
+        self.promoted = False
+
+    def dtype(self):
+        if self.categories is not None:
+            # The largest code of each type is reserved for missing values
+            for candidate in _UNSIGNED:
+                if len(self.categories) < np.iinfo(candidate).max:
+                    return np.dtype(candidate)
+        if self.minimum == np.inf:
+            return np.dtype(np.float32)
+        if self.has_nan or not self.integral:
+            if self.integral:
+                fits = max(abs(self.minimum), abs(self.maximum)) <= _FLOAT32_EXACT_INT
+            else:
+                fits = self.float32_exact
+            return np.dtype(np.float32 if fits else np.float64)
+        for candidate in (_UNSIGNED if self.minimum >= 0 else _SIGNED):
+            info = np.iinfo(candidate)
+            if info.min <= self.minimum and self.maximum <= info.max:
+                return np.dtype(candidate)
+        return np.dtype(np.float64)
+
+
+def _float32_exact(values):
+    """Whether float32's shortest repr of every value parses back to the same float64"""
+    unique = np.unique(values)  # Few distinct values (scores, counts) keep the text round trip cheap
+    return bool(np.all(unique.astype(np.float32).astype(str).astype(float) == unique))
+
+
+def _encode(series, stats, dtype):
+    if stats.categories is not None:
+        codes = pd.Categorical(series.astype('string'), categories=stats.categories).codes
+        # Missing text -> last code
+        return np.where(codes < 0, np.iinfo(dtype).max, codes).astype(dtype)
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float).astype(dtype)
+
+
+def _encode_checked(column, series, stats, dtype):
+    """_encode, raising if the chunk does not decode back to the values read from the CSV"""
+    if stats.categories is not None:
+        encoded = _encode(series, stats, dtype)
+        if np.any(series.notna().to_numpy() & (encoded == np.iinfo(dtype).max)):
+            raise ValueError(f"Column {column!r}: text values missing from the categories")
+        return encoded
+    values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)  # Parsed once per chunk
+    encoded = values.astype(dtype)
+    finite = values[~np.isnan(values)]
+    if dtype == np.float32:
+        fits = _float32_exact(finite)  # Compared at the decimal the CSV holds
+    else:
+        fits = np.array_equal(finite.astype(dtype).astype(float), finite)
+    if not fits:
+        raise ValueError(f"Column {column!r}: values do not fit the chosen dtype {dtype}")
+    return encoded
+
+
+def _write_manifest(cache_dir, csv_path, n_rows, columns):
+    stat = os.stat(csv_path)
+    manifest = {
+        'csv': os.path.abspath(csv_path),
+        'csv_size': stat.st_size,
+        'csv_mtime_ns': stat.st_mtime_ns,
+        'rows': n_rows,
+        'columns': columns
+    }
+    tmp_path = os.path.join(cache_dir, MANIFEST + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    # Written last: a cache without a manifest is never used
+    os.replace(tmp_path, os.path.join(cache_dir, MANIFEST))
+    return manifest
+
+
+def build_columnar_cache(csv_path, chunk_rows=1_000_000):
+    """
+    Convert a CSV into per-column .npy files in two chunked passes
+    (dtypes first, then values), so memory does not grow with the CSV
+    """
+    cache_dir = cache_dir_for(csv_path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    stats = {}
+    n_rows = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=str, keep_default_na=True):
+        for column in chunk.columns:
+            stats.setdefault(column, _ColumnStats()).update(chunk[column])
+        n_rows += len(chunk)
+
+    promoted = [column for column, column_stats in stats.items() if column_stats.promoted]
+    if promoted:
+        # Text showed up after numeric chunks: the earlier values are categories too
+        for column in promoted:
+            stats[column].restart_categories()
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=str, keep_default_na=True,
+                                 usecols=promoted):
+            for column in promoted:
+                stats[column].update(chunk[column])
+
+    dtypes = {column: column_stats.dtype() for column, column_stats in stats.items()}
+    arrays = {
+        column: np.lib.format.open_memmap(
+            os.path.join(cache_dir, f"{column}.npy"), mode='w+', dtype=dtypes[column], shape=(n_rows,)
+        )
+        for column in stats
+    }
+
+    offset = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=str, keep_default_na=True):
+        for column in chunk.columns:
+            arrays[column][offset:offset + len(chunk)] = _encode_checked(
+                column, chunk[column], stats[column], dtypes[column]
+            )
+        offset += len(chunk)
+    for array in arrays.values():
+        array.flush()
+
+    return _write_manifest(cache_dir, csv_path, n_rows, [
+        {'name': column, 'dtype': dtypes[column].str, 'categories': stats[column].categories}
+        for column in stats
+    ])
+
+
+def write_columnar_cache(df, csv_path):
+    """Cache a DataFrame that was just read from csv_path (no second CSV parse)"""
+    cache_dir = cache_dir_for(csv_path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    columns = []
+    for column in df.columns:
+        column_stats = _ColumnStats()
+        column_stats.update(df[column])
+        dtype = column_stats.dtype()
+        np.save(os.path.join(cache_dir, f"{column}.npy"), _encode(df[column], column_stats, dtype))
+        columns.append({'name': column, 'dtype': dtype.str, 'categories': column_stats.categories})
+
+    return _write_manifest(cache_dir, csv_path, len(df), columns)
+
+
+def load_columnar_cache(csv_path, columns=None):
+    """
+    Memory-map the cached columns of a CSV
+
+    Returns:
+        DataFrame backed by the memory-mapped arrays, or None when the cache
+        is missing or older than the CSV
+    """
+    cache_dir = cache_dir_for(csv_path)
+    manifest_path = os.path.join(cache_dir, MANIFEST)
+    if not os.path.exists(manifest_path) or not os.path.exists(csv_path):
+        return None
+
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    stat = os.stat(csv_path)
+    if (manifest.get('csv_size') != stat.st_size
+            or manifest.get('csv_mtime_ns') != stat.st_mtime_ns
+            or os.stat(manifest_path).st_mtime_ns < stat.st_mtime_ns):
+        return None
+
+    data = {}
+    for column in manifest['columns']:
+        if columns is not None and column['name'] not in columns:
+            continue
+        try:
+            values = np.load(os.path.join(cache_dir, f"{column['name']}.npy"), mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Columnar cache unreadable ({column['name']}): {str(e)}", file=sys.stderr)
+            return None
+        if column['categories'] is not None:
+            values = pd.Categorical.from_codes(
+                np.where(values < len(column['categories']), values, -1).astype(np.int32),
+                categories=column['categories']
+            )
+        data[column['name']] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or ['data/training_data.csv']:
+        manifest = build_columnar_cache(path)
+        print(f"✅ Cached {manifest['rows']} rows of {path} in {cache_dir_for(path)}")
+        for column in manifest['columns']:
+            print(f"   {column['name']}: {np.dtype(column['dtype'])}")
@@ -0,0 +1,495 @@
+"""
+Distributed Hyperparameter Search over a File-system Work Queue
+The coordinator (the trainer) publishes every (candidate, fold) fit as a task
+file in a shared queue directory; workers on any machine that can see the
+directory claim tasks by atomic rename, fit, and write the result back.
+QueueCoordinator is a drop-in for TrainingScheduler, so GridSearch /
+SuccessiveHalvingSearch aggregate the scores exactly as before, and the
+artifact cache / checkpoint wrappers keep working
+Tasks of a worker whose heartbeat stops, or whose fit raised, are requeued up
+to max_retries times; a fit that still fails is scored NaN like a local one. If tasks sit unclaimed with no live worker for
+no_worker_timeout seconds, the search fails instead of waiting forever
+
+Queue layout:
+    data/<data key>.joblib      training data, published once per run
+    pending/<task>.joblib       waiting to be claimed
+    claimed/<task>@<worker>.joblib
+    results/<task>.joblib
+    workers/<worker>.json       heartbeat
+
+Usage:
+    python train_model.py --queue /shared/edvance-queue --local-workers 2   # coordinator
+    python distributed_search.py /shared/edvance-queue                      # worker, per machine
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+import joblib
+
+from artifact_cache import data_key
+from hyperparameter_search import failed_fit, fit_and_score, fit_with_weights, single_threaded
+from training_scheduler import TrainingScheduler
+
+QUEUE_DIRS = ('data', 'pending', 'claimed', 'results', 'workers')
+
+
+def _atomic_dump(value, path):
+    """Write to a temp file in the same directory, then rename - readers never see partial files"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class WorkQueue:
+    """Shared queue directory; every state change is a single atomic rename or replace"""
+
+    def __init__(self, root):
+        self.root = root
+        for name in QUEUE_DIRS:
+            os.makedirs(os.path.join(root, name), exist_ok=True)
+
+    def _path(self, kind, name):
+        return os.path.join(self.root, kind, name)
+
+    def publish_data(self, key, X, y, sample_weight=None):
+        path = self._path('data', f"{key}.joblib")
+        if not os.path.exists(path):
+            _atomic_dump({'X': X, 'y': y, 'sample_weight': sample_weight}, path)
+
+    def load_data(self, key):
+        return joblib.load(self._path('data', f"{key}.joblib"), mmap_mode='r')
+
+    def submit(self, task_id, payload):
+        _atomic_dump(payload, self._path('pending', f"{task_id}.joblib"))
+
+    def cancel(self, task_id):
+        """Withdraw a task nobody has claimed yet; False if a worker already has it"""
+        try:
+            os.remove(self._path('pending', f"{task_id}.joblib"))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def claim(self, worker_id):
+        """Move the oldest pending task to claimed/; None when the queue is empty"""
+        for name in sorted(os.listdir(os.path.join(self.root, 'pending'))):
+            if not name.endswith('.joblib'):
+                continue
+            task_id = name[:-len('.joblib')]
+            claimed = self._path('claimed', f"{task_id}@{worker_id}.joblib")
+            try:
+                os.rename(self._path('pending', name), claimed)
+            except FileNotFoundError:
+                continue  # Another worker got it first
+            return task_id, joblib.load(claimed)
+        return None
+
+    def claims(self):
+        """task id -> worker id of every claimed task"""
+        owners = {}
+        for name in os.listdir(os.path.join(self.root, 'claimed')):
+            if name.endswith('.joblib') and '@' in name:
+                task_id, worker_id = name[:-len('.joblib')].rsplit('@', 1)
+                owners[task_id] = worker_id
+        return owners
+
+    def requeue(self, task_id, worker_id):
+        try:
+            os.rename(
+                self._path('claimed', f"{task_id}@{worker_id}.joblib"),
+                self._path('pending', f"{task_id}.joblib")
+            )
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, task_id, worker_id, result):
+        _atomic_dump(result, self._path('results', f"{task_id}.joblib"))
+        try:
+            os.remove(self._path('claimed', f"{task_id}@{worker_id}.joblib"))
+        except FileNotFoundError:
+            pass  # Requeued meanwhile; the coordinator keeps the first result
+
+    def take_result(self, task_id):
+        """Load and remove a task's result; None if it is not there yet"""
+        path = self._path('results', f"{task_id}.joblib")
+        if not os.path.exists(path):
+            return None
+        result = joblib.load(path)
+        os.remove(path)
+        return result
+
+    def heartbeat(self, worker_id, state):
+        path = self._path('workers', f"{worker_id}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def heartbeats(self):
+        beats = {}
+        for name in os.listdir(os.path.join(self.root, 'workers')):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.root, 'workers', name)) as f:
+                    beats[name[:-len('.json')]] = json.load(f)
+            except (OSError, ValueError):
+                continue  # Being replaced right now
+        return beats
+
+
+class QueueCoordinator(TrainingScheduler):
+    """
+    TrainingScheduler that runs fits on queue workers instead of a local pool
+
+    Args:
+        queue_dir: shared queue directory
+        spawn_workers: local worker processes to start (0 = only external workers)
+        worker_timeout: seconds without a heartbeat before a worker's tasks are requeued
+        max_retries: times a task is requeued after a worker failure or a fit error
+        no_worker_timeout: seconds tasks may wait with no live worker before the run fails
+    """
+
+    def __init__(self, queue_dir, spawn_workers=0, worker_timeout=30.0, max_retries=2,
+                 poll_interval=0.05, no_worker_timeout=120.0):
+        super().__init__(n_workers=max(1, spawn_workers))
+        self.queue = WorkQueue(queue_dir)
+        self.spawn_workers = spawn_workers
+        self.worker_timeout = worker_timeout
+        self.max_retries = max_retries
+        self.poll_interval = poll_interval
+        self.no_worker_timeout = no_worker_timeout
+        self._run_id = f"{int(time.time())}-{os.getpid()}"
+        self._sequence = 0
+        self._data_key = None
+        self._processes = []
+        self._beats = {}  # worker -> (heartbeat counter, local time it last changed)
+        self._liveness = {}  # worker -> (heartbeat counter, local time seen changing or None)
+        self._nodes = {}  # worker -> throughput stats
+        self._retries = 0
+        self._open_tasks = set()
+
+    def start(self, X, y, sample_weight=None):
+        """Publish the training data and start the local workers"""
+        self.shutdown()
+        self._data = (X, y, sample_weight)
+        self._data_key = data_key(X, y, [], sample_weight)
+        self.queue.publish_data(self._data_key, X, y, sample_weight)
+        for i in range(self.spawn_workers):
+            self._processes.append(subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), self.queue.root,
+                 '--worker-id', f"{socket.gethostname()}-local{i}-{self._run_id}"],
+                stdin=subprocess.DEVNULL
+            ))
+        self._started = time.perf_counter()
+        self._family_stats = {}
+        return self
+
+    def _abort(self):
+        for task_id in list(self._open_tasks):
+            self.queue.cancel(task_id)
+
+    def shutdown(self):
+        self._abort()
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.wait()
+        self._processes = []
+
+    def _next_task_id(self):
+        with self._lock:
+            self._sequence += 1
+            return f"{self._run_id}-{self._sequence:06d}"
+
+    def _dead_workers(self, owners):
+        """Workers holding tasks whose heartbeat has not changed for worker_timeout"""
+        beats = self.queue.heartbeats()
+        now = time.perf_counter()
+        dead = set()
+        with self._lock:
+            for worker_id in set(owners.values()):
+                count = beats.get(worker_id, {}).get('beat')
+                seen = self._beats.get(worker_id)
+                if seen is None or seen[0] != count:
+                    self._beats[worker_id] = (count, now)
+                elif now - seen[1] > self.worker_timeout:
+                    dead.add(worker_id)
+        return dead
+
+    def _live_workers(self):
+        """
+        Workers whose heartbeat counter changed within worker_timeout
+
+        A heartbeat file left behind by a stopped worker never counts: a worker
+        is only live once its counter has been seen changing
+        """
+        now = time.perf_counter()
+        live = set()
+        for worker_id, state in self.queue.heartbeats().items():
+            count = state.get('beat')
+            seen = self._liveness.get(worker_id)
+            if seen is None:
+                self._liveness[worker_id] = (count, None)
+                continue
+            changed = now if seen[0] != count else seen[1]
+            self._liveness[worker_id] = (count, changed)
+            if changed is not None and now - changed <= self.worker_timeout:
+                live.add(worker_id)
+        return live
+
+    def _record_node(self, worker_id, result=None, failed=False):
+        with self._lock:
+            node = self._nodes.setdefault(
+                worker_id, {'tasks': 0, 'busy_time': 0.0, 'cpu_time': 0.0, 'failures': 0}
+            )
+            if failed:
+                node['failures'] += 1
+            else:
+                node['tasks'] += 1
+                node['busy_time'] += result.get('fit_time', 0.0)
+                node['cpu_time'] += result.get('cpu_time', 0.0)
+
+    def _retry(self, task_id, payload, attempts, reason):
+        """True if the task should be queued again; False once a fit task has used its retries"""
+        attempts[task_id] = attempts.get(task_id, 0) + 1
+        if attempts[task_id] > self.max_retries:
+            if payload['kind'] == 'fit':
+                print(f"⚠️  Task {task_id} failed {attempts[task_id]} times, scoring it NaN: {reason}",
+                      file=sys.stderr)
+                return False
+            raise RuntimeError(f"Task {task_id} failed {attempts[task_id]} times: {reason}")
+        with self._lock:
+            self._retries += 1
+        print(f"🔁 Retrying task {task_id} ({reason})", file=sys.stderr)
+        return True
+
+    def _run(self, payloads, deadline=None, on_done=None):
+        """Submit payloads and wait for their results; task position -> result (None if cancelled)"""
+        task_ids = [self._next_task_id() for _ in payloads]
+        positions = dict(zip(task_ids, range(len(payloads))))
+        for task_id, payload in zip(task_ids, payloads):
+            self.queue.submit(task_id, payload)
+        with self._lock:
+            self._open_tasks.update(task_ids)
+
+        results = [None] * len(payloads)
+        waiting = set(task_ids)
+        attempts = {}
+        progress = time.perf_counter()  # Last time a worker was live, held a task or answered
+        warned = progress
+        try:
+            while waiting:
+                for task_id in sorted(waiting):
+                    result = self.queue.take_result(task_id)
+                    if result is None:
+                        continue
+                    progress = time.perf_counter()
+                    payload = payloads[positions[task_id]]
+                    if 'error' in result:
+                        self._record_node(result['worker'], failed=True)
+                        reason = f"error on {result['worker']}: {result['error'].strip().splitlines()[-1]}"
+                        if self._retry(task_id, payload, attempts, reason):
+                            self.queue.submit(task_id, payload)
+                            continue
+                        result = {**failed_fit(reason), 'worker': result['worker']}
+                    waiting.discard(task_id)
+                    if not result.get('error'):
+                        self._record_node(result['worker'], result)
+                    results[positions[task_id]] = result
+                    if on_done is not None:
+                        on_done(positions[task_id], result)
+
+                owners = {task_id: worker for task_id, worker in self.queue.claims().items()
+                          if task_id in waiting}
+                dead = self._dead_workers(owners)
+                for task_id, worker_id in owners.items():
+                    if worker_id in dead and self.queue.requeue(task_id, worker_id):
+                        self._record_node(worker_id, failed=True)
+                        reason = f"worker {worker_id} stopped responding"
+                        if not self._retry(task_id, payloads[positions[task_id]], attempts, reason):
+                            self.queue.cancel(task_id)
+                            waiting.discard(task_id)
+                            results[positions[task_id]] = failed_fit(reason)
+                            if on_done is not None:
+                                on_done(positions[task_id], results[positions[task_id]])
+
+                now = time.perf_counter()
+                if owners or self._live_workers():
+                    progress = warned = now
+                elif now - progress > self.no_worker_timeout:
+                    raise RuntimeError(
+                        f"No live queue workers for {self.no_worker_timeout:.0f}s with {len(waiting)} "
+                        f"tasks unclaimed - start `python distributed_search.py {self.queue.root}` "
+                        f"or pass --local-workers"
+                    )
+                elif now - warned >= 10:
+                    warned = now
+                    print(f"⚠️  {len(waiting)} tasks unclaimed and no live workers on {self.queue.root} "
+                          f"for {now - progress:.0f}s (giving up after {self.no_worker_timeout:.0f}s)",
+                          file=sys.stderr)
+
+                if deadline is not None and time.perf_counter() > deadline:
+                    # Withdraw unclaimed tasks; claimed ones are allowed to finish
+                    waiting = {task_id for task_id in waiting if not self.queue.cancel(task_id)}
+                    deadline = None
+                if waiting:
+                    time.sleep(self.poll_interval)
+        finally:
+            for task_id in waiting:
+                self.queue.cancel(task_id)
+            with self._lock:
+                self._open_tasks.difference_update(task_ids)
+        return results
+
+    def run_tasks(self, estimator, tasks, deadline=None, label=None, on_result=None):
+        """Queue (params, train_idx, val_idx) fit tasks; same contract as TrainingScheduler.run_tasks"""
+        estimator = single_threaded(estimator)
+        payloads = [
+            {'kind': 'fit', 'data': self._data_key, 'estimator': estimator, 'params': params,
+             'train_idx': train_idx, 'val_idx': val_idx}
+            for params, train_idx, val_idx in tasks
+        ]
+
+        def done(position, result):
+            self._record(label, result['cpu_time'])
+            if on_result is not None:
+                on_result(position, result)
+
+        return self._run(payloads, deadline=deadline, on_done=done)
+
+    def refit(self, estimator, params, label=None):
+        """Fit the chosen candidate on all training data on a queue worker"""
+        result = self._run([{
+            'kind': 'refit', 'data': self._data_key, 'estimator': single_threaded(estimator),
+            'params': params
+        }])[0]
+        self._record(label, result['cpu_time'])
+        return result['model']
+
+    def report(self):
+        """TrainingScheduler.report plus per-worker throughput and the retry count"""
+        report = super().report()
+        with self._lock:
+            nodes = {name: dict(stats) for name, stats in self._nodes.items()}
+            retries = self._retries
+        for stats in nodes.values():
+            stats['tasks_per_min'] = stats['tasks'] / report['wall_time'] * 60 if report['wall_time'] else 0.0
+            stats['busy'] = stats['busy_time'] / report['wall_time'] if report['wall_time'] else 0.0
+        busy_workers = max(1, len(nodes))
+        report['workers'] = busy_workers
+        report['utilization'] = (
+            report['cpu_time'] / (report['wall_time'] * busy_workers) if report['wall_time'] else 0.0
+        )
+        report['nodes'] = nodes
+        report['retries'] = retries
+        report['queue'] = self.queue.root
+        return report
+
+
+def _cap_threads():
+    for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[variable] = '1'
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+
+def _execute(payload, data):
+    if payload['kind'] == 'refit':
+        cpu_started = time.process_time()
+        model = payload['estimator'].set_params(**payload['params'])
+        fit_with_weights(model, data['X'], data['y'], data['sample_weight'])
+        return {'model': model, 'cpu_time': time.process_time() - cpu_started}
+    return fit_and_score(
+        payload['estimator'], payload['params'], data['X'], data['y'],
+        payload['train_idx'], payload['val_idx'], data['sample_weight']
+    )
+
+
+def run_worker(queue_dir, worker_id=None, idle_exit=None, poll_interval=0.1, heartbeat_interval=2.0):
+    """
+    Claim and run tasks until stopped (or idle for idle_exit seconds)
+
+    A background thread keeps the heartbeat going while a fit runs, so long
+    fits are not mistaken for a dead worker
+    """
+    _cap_threads()
+    queue = WorkQueue(queue_dir)
+    worker_id = (worker_id or f"{socket.gethostname()}-{os.getpid()}").replace('@', '_')
+    state = {'worker': worker_id, 'host': socket.gethostname(), 'pid': os.getpid(),
+             'beat': 0, 'completed': 0, 'failed': 0}
+    stop = threading.Event()
+
+    def beat():
+        while not stop.is_set():
+            state['beat'] += 1
+            queue.heartbeat(worker_id, state)
+            stop.wait(heartbeat_interval)
+
+    threading.Thread(target=beat, name='heartbeat', daemon=True).start()
+    print(f"👷 Worker {worker_id} polling {queue_dir}")
+
+    data_cache = {}
+    idle_since = time.monotonic()
+    try:
+        while True:
+            claimed = queue.claim(worker_id)
+            if claimed is None:
+                if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            task_id, payload = claimed
+            try:
+                if payload['data'] not in data_cache:
+                    data_cache.clear()  # One training set at a time
+                    data_cache[payload['data']] = queue.load_data(payload['data'])
+                result = _execute(payload, data_cache[payload['data']])
+                state['completed'] += 1
+            except Exception:
+                result = {'error': traceback.format_exc()}
+                state['failed'] += 1
+            result['worker'] = worker_id
+            queue.complete(task_id, worker_id, result)
+            idle_since = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+    return state
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run hyperparameter-search fits from a shared queue")
+    parser.add_argument('queue', help="Queue directory shared with the coordinator")
+    parser.add_argument('--worker-id', default=None, help="Default: <hostname>-<pid>")
+    parser.add_argument(
+        '--idle-exit', type=float, default=None,
+        help="Exit after this many seconds without tasks (default: run until stopped)"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    state = run_worker(args.queue, worker_id=args.worker_id, idle_exit=args.idle_exit)
+    print(f"✅ Worker {state['worker']}: {state['completed']} tasks, {state['failed']} failed")
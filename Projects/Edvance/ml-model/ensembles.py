@@ -0,0 +1,79 @@
+"""
+Stacked Ensemble of Trained Model Families
+Blend weights are learned from the searches' out-of-fold predictions, so
+stacking needs no extra model fits
+Kept in its own module so pickled models load wherever predict.py does
+"""
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+
+def fit_blend_weights(oof_matrix, y, sample_weight=None):
+    """
+    Non-negative blend weights (plus intercept) from out-of-fold predictions
+
+    Args:
+        oof_matrix: array (n_samples, n_models), NaN where a sample was never validated
+        y: targets
+        sample_weight: optional row weights (e.g. counts of compacted rows)
+
+    Returns:
+        tuple: (weights array, intercept)
+    """
+    oof_matrix = np.asarray(oof_matrix, dtype=float)
+    y = np.asarray(y, dtype=float)
+    rows = ~np.isnan(oof_matrix).any(axis=1)
+    if not rows.any():
+        raise ValueError("No samples with out-of-fold predictions from every model")
+
+    blender = LinearRegression(positive=True)
+    blender.fit(
+        oof_matrix[rows], y[rows],
+        sample_weight=None if sample_weight is None else np.asarray(sample_weight)[rows]
+    )
+    return blender.coef_, float(blender.intercept_)
+
+
+class StackedRegressor:
+    """Weighted blend of already-fitted regressors"""
+
+    def __init__(self, models, weights, intercept=0.0):
+        self.models = dict(models)  # name -> fitted estimator
+        self.weights = np.asarray(weights, dtype=float)
+        self.intercept = intercept
+
+    @classmethod
+    def from_oof(cls, models, oof_predictions, y, sample_weight=None):
+        """Build from fitted models and their out-of-fold predictions (same keys)"""
+        names = list(models)
+        oof_matrix = np.column_stack([oof_predictions[name] for name in names])
+        weights, intercept = fit_blend_weights(oof_matrix, y, sample_weight)
+        return cls({name: models[name] for name in names}, weights, intercept)
+
+    def blend(self, prediction_matrix):
+        """Combine a (n_samples, n_models) matrix of member predictions"""
+        return np.asarray(prediction_matrix, dtype=float) @ self.weights + self.intercept
+
+    def predict(self, X):
+        return self.blend(np.column_stack([model.predict(X) for model in self.models.values()]))
+
+    def get_params(self, deep=False):
+        return {
+            'models': list(self.models),
+            'weights': dict(zip(self.models, self.weights.tolist())),
+            'intercept': self.intercept
+        }
+
+    @property
+    def feature_importances_(self):
+        """Weight-averaged importances of the members that expose them"""
+        members = [
+            (weight, model.feature_importances_)
+            for weight, model in zip(self.weights, self.models.values())
+            if hasattr(model, 'feature_importances_')
+        ]
+        total = sum(weight for weight, _ in members)
+        if not members or total <= 0:
+            raise AttributeError("No member model exposes feature_importances_")
+        return sum(weight * importances for weight, importances in members) / total
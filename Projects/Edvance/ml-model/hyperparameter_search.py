@@ -0,0 +1,420 @@
+"""
+Hyperparameter Search Engine
+Candidates are evaluated as independent (candidate, fold) fit tasks, so the
+same searches run sequentially or on a shared TrainingScheduler worker pool
+
+GridSearch: exhaustive, equivalent to GridSearchCV(cv=3, scoring='r2')
+SuccessiveHalvingSearch: every candidate is first evaluated on a small budget -
+a sample of the training folds and (for ensembles) a fraction of the trees -
+only the best 1/factor survive to the next rung, which gets factor x more,
+until the survivors are fitted with all the data and their full tree count
+Both honor a wall-clock budget; halving logs which candidates were pruned when
+Searches can share precomputed folds and keep the best candidate's
+out-of-fold predictions, so evaluation and stacking need no refits
+A fit that raises scores NaN (GridSearchCV's error_score=np.nan): the
+candidate is recorded with its error and left out of the ranking
+"""
+
+import math
+import os
+import time
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterGrid
+
+
+def candidate_grid(param_grid):
+    """Expand a GridSearchCV-style param grid into a list of candidate dicts"""
+    return list(ParameterGrid(param_grid))
+
+
+def cv_folds(n_samples, n_splits=3):
+    """Train/validation index pairs, same splits as GridSearchCV(cv=n_splits) for a regressor"""
+    return list(KFold(n_splits=n_splits).split(np.zeros((n_samples, 1))))
+
+
+def out_of_fold(folds, fold_predictions, n_samples):
+    """Assemble per-fold validation predictions into one out-of-fold vector"""
+    oof = np.full(n_samples, np.nan)
+    for (_, val_idx), predictions in zip(folds, fold_predictions):
+        oof[val_idx] = predictions
+    return oof
+
+
+def single_threaded(estimator):
+    """Clone with n_jobs=1 so parallelism comes only from the task runner"""
+    estimator = clone(estimator)
+    if 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=1)
+    return estimator
+
+
+def fit_with_weights(model, X, y, sample_weight=None):
+    """Fit, passing sample_weight only when rows carry weights"""
+    if sample_weight is None:
+        return model.fit(X, y)
+    return model.fit(X, y, sample_weight=sample_weight)
+
+
+def fit_and_score(estimator, params, X, y, train_idx, val_idx, sample_weight=None):
+    """
+    Fit one candidate on one training fold and score it on the validation fold
+
+    Returns:
+        dict with r2 score, fit wall/CPU time and validation predictions
+    """
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    model = clone(estimator).set_params(**params)
+    fit_with_weights(
+        model, X[train_idx], y[train_idx],
+        None if sample_weight is None else sample_weight[train_idx]
+    )
+    predictions = model.predict(X[val_idx])
+    return {
+        'score': r2_score(
+            y[val_idx], predictions,
+            sample_weight=None if sample_weight is None else sample_weight[val_idx]
+        ),
+        'fit_time': time.perf_counter() - started,
+        'cpu_time': time.process_time() - cpu_started,
+        'predictions': predictions,
+        'worker': os.getpid()
+    }
+
+
+def failed_fit(error, started=None):
+    """Result of a fit task that raised; scored NaN and never cached or checkpointed"""
+    return {
+        'score': float('nan'),
+        'fit_time': 0.0 if started is None else time.perf_counter() - started,
+        'cpu_time': 0.0,
+        'predictions': None,
+        'worker': os.getpid(),
+        'error': f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+    }
+
+
+class SequentialRunner:
+    """Run fit tasks one after another in the calling process"""
+
+    def __init__(self, X, y, sample_weight=None):
+        self.X = X
+        self.y = y
+        self.sample_weight = sample_weight
+
+    def run_tasks(self, estimator, tasks, deadline=None, label=None, on_result=None):
+        """
+        Args:
+            tasks: list of (params, train_idx, val_idx)
+            deadline: time.perf_counter() value after which tasks are skipped
+            on_result: optional callback(task position, result) as each fit finishes
+
+        Returns:
+            list: fit_and_score result per task, None for skipped tasks
+        """
+        results = []
+        for position, (params, train_idx, val_idx) in enumerate(tasks):
+            if deadline is not None and time.perf_counter() > deadline:
+                results.append(None)
+                continue
+            started = time.perf_counter()
+            try:
+                result = fit_and_score(
+                    estimator, params, self.X, self.y, train_idx, val_idx, self.sample_weight
+                )
+            except Exception as e:
+                result = failed_fit(e, started)
+            if on_result is not None:
+                on_result(position, result)
+            results.append(result)
+        return results
+
+    def refit(self, estimator, params, label=None):
+        model = clone(estimator).set_params(**params)
+        return fit_with_weights(model, self.X, self.y, self.sample_weight)
+
+
+class GridSearch:
+    """
+    Exhaustive search over a parameter grid
+
+    Exposes the GridSearchCV attributes the trainer uses:
+    best_estimator_, best_params_, best_score_, cv_results_
+    plus oof_predictions_ - the best candidate's out-of-fold predictions
+    (NaN for samples outside every validation fold)
+
+    Pass folds (from cv_folds) to share one set of splits across searches.
+    """
+
+    def __init__(self, estimator, param_grid, cv=3, time_budget=None, random_state=42,
+                 verbose=1, name=None, folds=None):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.folds = folds
+        self.cv = cv if folds is None else len(folds)
+        self.time_budget = time_budget
+        self.random_state = random_state
+        self.verbose = verbose
+        self.name = name or type(estimator).__name__
+
+        self.best_estimator_ = None
+        self.best_params_ = None
+        self.best_score_ = None
+        self.cv_results_ = []
+        self.oof_predictions_ = None
+        self._best_oof = (None, None)  # (candidate index, out-of-fold predictions)
+        self.n_fits_ = 0
+        self.full_fit_equivalents_ = 0.0  # Sum of (sample fraction x tree fraction)
+        self.budget_exhausted_ = False
+        self.failed_candidates_ = []  # Candidates whose fits raised, with the error
+        self.elapsed_ = None
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _folds(self, X):
+        if self.folds is not None:
+            return self.folds
+        return cv_folds(len(X), self.cv)
+
+    def _deadline(self, started):
+        return None if self.time_budget is None else started + self.time_budget
+
+    def _evaluate(self, runner, candidates, indices, folds, deadline, rung=0,
+                  n_resources=None, params_for=None):
+        """
+        Score candidates on every fold through the runner
+
+        Returns:
+            dict: candidate index -> mean validation R² (only fully evaluated candidates)
+        """
+        params_for = params_for or (lambda index: candidates[index])
+        n_full = max(len(train_idx) for train_idx, _ in folds)
+
+        tasks, owners = [], []
+        for index in indices:
+            params = params_for(index)
+            for train_idx, val_idx in folds:
+                train_subset = train_idx if n_resources is None else train_idx[:n_resources]
+                tasks.append((params, train_subset, val_idx))
+                owners.append(index)
+
+        results = runner.run_tasks(self.estimator, tasks, deadline=deadline, label=self.name)
+
+        by_candidate = {}
+        for index, (params, train_subset, _), result in zip(owners, tasks, results):
+            by_candidate.setdefault(index, []).append(result)
+            if result is not None and not result.get('error'):
+                self.n_fits_ += 1
+                tree_fraction = (
+                    params['n_estimators'] / candidates[index]['n_estimators']
+                    if 'n_estimators' in candidates[index] else 1.0
+                )
+                self.full_fit_equivalents_ += len(train_subset) / n_full * tree_fraction
+
+        scores = {}
+        for index in indices:
+            fold_results = by_candidate.get(index, [])
+            if not fold_results or any(result is None for result in fold_results):
+                self.budget_exhausted_ = True
+                continue
+            errors = [result['error'] for result in fold_results if result.get('error')]
+            if errors:
+                self.failed_candidates_.append({'params': params_for(index), 'rung': rung, 'error': errors[0]})
+                self.cv_results_.append({
+                    'params': candidates[index],
+                    'rung': rung,
+                    'n_resources': n_resources,
+                    'mean_test_score': float('nan'),
+                    'std_test_score': float('nan'),
+                    'error': errors[0]
+                })
+                self._log(f"   ⚠️  {self.name} candidate {candidates[index]} failed: {errors[0]}")
+                continue
+            fold_scores = [result['score'] for result in fold_results]
+            scores[index] = float(np.mean(fold_scores))
+            self.cv_results_.append({
+                'params': candidates[index],
+                'rung': rung,
+                'n_resources': n_resources,
+                'mean_test_score': scores[index],
+                'std_test_score': float(np.std(fold_scores)),
+                'mean_fit_time': float(np.mean([r['fit_time'] for r in fold_results]))
+            })
+
+        # Keep validation predictions only for this call's best candidate
+        if scores:
+            best = max(scores, key=scores.get)
+            n_samples = sum(len(val_idx) for _, val_idx in folds)
+            self._best_oof = (best, out_of_fold(
+                folds, [result['predictions'] for result in by_candidate[best]], n_samples
+            ))
+
+        return scores
+
+    def _finish(self, runner, candidates, best_index, best_score, started):
+        if best_index is None:
+            if self.failed_candidates_ and not self.budget_exhausted_:
+                raise RuntimeError(
+                    f"All {len(self.failed_candidates_)} candidates failed, "
+                    f"e.g. {self.failed_candidates_[0]['error']}"
+                )
+            raise RuntimeError("Time budget exhausted before any candidate was evaluated")
+
+        self.best_params_ = candidates[best_index]
+        self.best_score_ = best_score
+        oof_index, oof = self._best_oof
+        self.oof_predictions_ = oof if oof_index == best_index else None
+        self.best_estimator_ = runner.refit(self.estimator, self.best_params_, label=self.name)
+
+        # Runners may fit single-threaded; restore the estimator's own n_jobs for prediction
+        if 'n_jobs' in self.estimator.get_params():
+            self.best_estimator_.set_params(n_jobs=self.estimator.get_params()['n_jobs'])
+
+        self.elapsed_ = time.perf_counter() - started
+        self._log(
+            f"   {self.name}: {self.n_fits_} fits in {self.elapsed_:.1f}s, equivalent to "
+            f"{self.full_fit_equivalents_:.0f} full fits (exhaustive grid: {len(candidates) * self.cv})"
+        )
+        return self
+
+    def fit(self, X, y, runner=None, sample_weight=None):
+        X = np.asarray(X)
+        y = np.asarray(y)
+        runner = runner or SequentialRunner(X, y, sample_weight)
+        started = time.perf_counter()
+
+        candidates = candidate_grid(self.param_grid)
+        self._log(
+            f"   {self.name}: fitting {self.cv} folds for each of {len(candidates)} candidates, "
+            f"totalling {len(candidates) * self.cv} fits"
+        )
+
+        scores = self._evaluate(
+            runner, candidates, range(len(candidates)), self._folds(X), self._deadline(started)
+        )
+        if self.budget_exhausted_:
+            self._log(
+                f"   ⏱ Time budget of {self.time_budget:.0f}s exhausted after "
+                f"{len(scores)}/{len(candidates)} candidates"
+            )
+
+        best_index = max(scores, key=scores.get) if scores else None
+        return self._finish(runner, candidates, best_index, scores.get(best_index), started)
+
+
+class SuccessiveHalvingSearch(GridSearch):
+    """Successive-halving search over a parameter grid with an optional time budget"""
+
+    def __init__(self, estimator, param_grid, cv=3, factor=3, min_resources=30,
+                 scale_estimators=True, min_estimators=10, time_budget=None,
+                 random_state=42, verbose=1, name=None, folds=None):
+        super().__init__(estimator, param_grid, cv=cv, time_budget=time_budget,
+                         random_state=random_state, verbose=verbose, name=name, folds=folds)
+        self.factor = factor
+        self.min_resources = min_resources
+        self.scale_estimators = scale_estimators
+        self.min_estimators = min_estimators
+        self.pruning_log = []
+
+    def _schedule(self, n_candidates, n_train):
+        """Sample counts per rung; the last rung uses the full training folds"""
+        by_candidates = 1 + int(math.floor(math.log(max(1, n_candidates), self.factor)))
+        by_samples = 1 + int(math.floor(math.log(max(1, n_train / self.min_resources), self.factor)))
+        n_rungs = max(1, min(by_candidates, by_samples))
+        return [
+            max(1, n_train // self.factor ** (n_rungs - 1 - rung))
+            for rung in range(n_rungs)
+        ]
+
+    def _rung_params(self, params, fraction):
+        """Shrink n_estimators with the rung's sample fraction"""
+        if not self.scale_estimators or fraction >= 1:
+            return params
+        defaults = self.estimator.get_params()
+        if 'n_estimators' not in defaults:
+            return params
+        n_estimators = params.get('n_estimators', defaults['n_estimators'])
+        scaled = max(self.min_estimators, int(round(n_estimators * fraction)))
+        return {**params, 'n_estimators': min(n_estimators, scaled)}
+
+    def fit(self, X, y, runner=None, sample_weight=None):
+        X = np.asarray(X)
+        y = np.asarray(y)
+        runner = runner or SequentialRunner(X, y, sample_weight)
+        started = time.perf_counter()
+        deadline = self._deadline(started)
+
+        candidates = candidate_grid(self.param_grid)
+
+        # Fixed sample order per fold so every rung trains on a superset of the last
+        rng = np.random.RandomState(self.random_state)
+        folds = [(rng.permutation(train_idx), val_idx) for train_idx, val_idx in self._folds(X)]
+
+        n_train = min(len(train_idx) for train_idx, _ in folds)
+        schedule = self._schedule(len(candidates), n_train)
+        self._log(
+            f"   {self.name}: successive halving over {len(candidates)} candidates, "
+            f"{len(schedule)} rungs, samples per rung {schedule}"
+        )
+
+        survivors = list(range(len(candidates)))
+        best_index, best_score, best_rung = None, None, None
+
+        for rung, n_resources in enumerate(schedule):
+            fraction = n_resources / n_train
+            rung_scores = self._evaluate(
+                runner, candidates, survivors, folds, deadline, rung=rung,
+                n_resources=n_resources,
+                params_for=lambda index: self._rung_params(candidates[index], fraction)
+            )
+
+            if self.budget_exhausted_:
+                # A cut-short rung has scored an arbitrary subset of the survivors, at a
+                # larger sample size than the last rung - its scores do not rank them.
+                # Keep the last complete rung's winner; only rung 0 falls back to its
+                # partial scores, which all share one resource level
+                if best_index is None and rung_scores:
+                    best_index = max(rung_scores, key=rung_scores.get)
+                    best_score, best_rung = rung_scores[best_index], f"partial rung {rung}"
+                self._log(
+                    f"   ⏱ Time budget of {self.time_budget:.0f}s exhausted in rung {rung} "
+                    f"after {len(rung_scores)}/{len(survivors)} candidates"
+                    + (f" - best from {best_rung}" if best_rung is not None else "")
+                )
+                break
+
+            if rung_scores:
+                best_index = max(rung_scores, key=rung_scores.get)
+                best_score, best_rung = rung_scores[best_index], f"rung {rung}"
+
+            if rung == len(schedule) - 1:
+                break
+
+            ranked = sorted(rung_scores, key=rung_scores.get, reverse=True)
+            keep = max(1, int(math.ceil(len(ranked) / self.factor)))
+            survivors, pruned = ranked[:keep], ranked[keep:]
+            elapsed = time.perf_counter() - started
+
+            self.pruning_log.append({
+                'rung': rung,
+                'n_resources': n_resources,
+                'elapsed': elapsed,
+                'kept': [candidates[i] for i in survivors],
+                'pruned': [
+                    {'params': candidates[i], 'score': rung_scores[i]} for i in pruned
+                ]
+            })
+            self._log(
+                f"   {self.name} rung {rung} ({n_resources} samples, {elapsed:.1f}s): "
+                f"kept {len(survivors)}, pruned {len(pruned)} (best R² {rung_scores[ranked[0]]:.4f})"
+            )
+            if self.verbose > 1:
+                for i in pruned:
+                    self._log(f"      pruned {candidates[i]} (R² {rung_scores[i]:.4f})")
+
+        return self._finish(runner, candidates, best_index, best_score, started)
@@ -0,0 +1,134 @@
+"""
+Warm-start Incremental Retraining
+When only a few hundred labeled plans were appended to the training data, the
+saved model is refreshed instead of searched and refitted from scratch:
+- RandomForest: trees fitted on a sliding window of the most recent rows are
+  added with warm_start, and the same number of oldest trees are retired
+- GradientBoosting / HistGradientBoosting: boosting stages fitted on the
+  recent window are appended
+A drift check on the new rows decides when a full retrain is warranted instead
+"""
+
+import numpy as np
+from sklearn.ensemble import (
+    GradientBoostingRegressor, HistGradientBoostingRegressor, RandomForestRegressor
+)
+from sklearn.metrics import mean_squared_error
+
+# Population stability index above this means a feature's distribution moved
+PSI_THRESHOLD = 0.2
+# New-row RMSE above this multiple of the recorded test RMSE means the model went stale
+ERROR_RATIO_THRESHOLD = 1.5
+# More new rows than this fraction of the trained rows always triggers a full retrain
+MAX_NEW_FRACTION = 0.5
+
+
+def population_stability_index(reference, current, bins=10):
+    """PSI of one feature, with quantile bins taken from the reference sample"""
+    reference = np.asarray(reference, dtype=float)
+    current = np.asarray(current, dtype=float)
+
+    edges = np.unique(np.quantile(reference, np.linspace(0, 1, bins + 1)))
+    if len(edges) < 3:
+        # (Near-)constant feature: compare the share of rows at the reference value
+        ref_share = np.clip(np.mean(reference == edges[0]), 1e-4, 1 - 1e-4)
+        cur_share = np.clip(np.mean(current == edges[0]), 1e-4, 1 - 1e-4)
+        ref_dist = np.array([ref_share, 1 - ref_share])
+        cur_dist = np.array([cur_share, 1 - cur_share])
+    else:
+        inner = edges[1:-1]
+        ref_dist = np.bincount(np.searchsorted(inner, reference, side='right'), minlength=len(edges) - 1)
+        cur_dist = np.bincount(np.searchsorted(inner, current, side='right'), minlength=len(edges) - 1)
+        ref_dist = np.clip(ref_dist / len(reference), 1e-4, None)
+        cur_dist = np.clip(cur_dist / max(1, len(current)), 1e-4, None)
+
+    return float(np.sum((cur_dist - ref_dist) * np.log(cur_dist / ref_dist)))
+
+
+def detect_drift(model, X_reference, X_new, y_new, feature_names, reference_rmse=None):
+    """
+    Decide whether new rows can be absorbed incrementally
+
+    Returns:
+        dict: {'retrain': bool, 'reasons': [...], 'psi': {feature: value}, 'new_rmse': float}
+    """
+    X_reference = np.asarray(X_reference, dtype=float)
+    X_new = np.asarray(X_new, dtype=float)
+    reasons = []
+
+    psi = {
+        name: population_stability_index(X_reference[:, i], X_new[:, i])
+        for i, name in enumerate(feature_names)
+    }
+    drifted = [name for name, value in psi.items() if value > PSI_THRESHOLD]
+    if drifted:
+        reasons.append(f"feature drift (PSI > {PSI_THRESHOLD}): {', '.join(drifted)}")
+
+    new_rmse = float(np.sqrt(mean_squared_error(y_new, np.clip(model.predict(X_new), 1, 10))))
+    if reference_rmse and new_rmse > ERROR_RATIO_THRESHOLD * reference_rmse:
+        reasons.append(
+            f"error on new rows {new_rmse:.3f} > {ERROR_RATIO_THRESHOLD}x test RMSE {reference_rmse:.3f}"
+        )
+
+    if len(X_new) > MAX_NEW_FRACTION * len(X_reference):
+        reasons.append(f"{len(X_new)} new rows exceed {MAX_NEW_FRACTION:.0%} of {len(X_reference)} trained rows")
+
+    return {'retrain': bool(reasons), 'reasons': reasons, 'psi': psi, 'new_rmse': new_rmse}
+
+
+def extend_forest(model, X_window, y_window, n_new_trees):
+    """Add trees fitted on the recent window, then retire as many of the oldest trees"""
+    n_trees = len(model.estimators_)
+    n_new_trees = min(n_new_trees, n_trees)
+
+    model.set_params(warm_start=True, n_estimators=n_trees + n_new_trees)
+    model.fit(X_window, y_window)
+
+    model.estimators_ = model.estimators_[n_new_trees:]
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_))
+    return model
+
+
+def extend_boosting(model, X_window, y_window, n_new_stages):
+    """Append boosting stages fitted to the residuals on the recent window"""
+    model.set_params(warm_start=True, n_estimators=model.n_estimators_ + n_new_stages)
+    model.fit(X_window, y_window)
+    model.set_params(warm_start=False)
+    return model
+
+
+def extend_hist_boosting(model, X_window, y_window, n_new_stages):
+    """
+    Append histogram boosting iterations fitted to the residuals on the recent window
+    Early stopping is paused for the update: its score history comes from the
+    original fit, which had already stalled, so it would stop after one iteration
+    """
+    early_stopping = model.get_params()['early_stopping']
+    model.set_params(warm_start=True, early_stopping=False, max_iter=model.n_iter_ + n_new_stages)
+    model.fit(X_window, y_window)
+    model.set_params(warm_start=False, early_stopping=early_stopping)
+    return model
+
+
+def supports_incremental(model):
+    return isinstance(model, (RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor))
+
+
+def update_model(model, X_window, y_window, n_new_rows, n_trained_rows):
+    """
+    Refresh a fitted model with the recent window
+
+    Trees / stages are added in proportion to the share of new rows
+    (at least 10 trees or 5 stages)
+    """
+    share = n_new_rows / max(1, n_trained_rows + n_new_rows)
+    if isinstance(model, RandomForestRegressor):
+        n_trees = max(10, int(round(len(model.estimators_) * share)))
+        return extend_forest(model, X_window, y_window, n_trees), {'trees_replaced': n_trees}
+    if isinstance(model, GradientBoostingRegressor):
+        n_stages = max(5, int(round(model.n_estimators_ * share)))
+        return extend_boosting(model, X_window, y_window, n_stages), {'stages_added': n_stages}
+    if isinstance(model, HistGradientBoostingRegressor):
+        n_stages = max(5, int(round(model.n_iter_ * share)))
+        return extend_hist_boosting(model, X_window, y_window, n_stages), {'stages_added': n_stages}
+    raise ValueError(f"{type(model).__name__} does not support incremental updates")
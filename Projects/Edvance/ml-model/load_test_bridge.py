@@ -0,0 +1,305 @@
+"""
+Concurrent Load Generator for the Persistent Bridge
+Drives one or more node_bridge_persistent.py processes at a target request
+rate (Poisson arrivals) with at most --concurrency requests in flight, using
+plans from data/lesson_plans.json scaled to a small / medium / large mix
+Latency is measured from each request's scheduled send time, so time spent
+waiting for a free concurrency slot counts - an overloaded bridge cannot hide
+behind a slowed-down client
+A sweep over several rates finds the saturation point: the highest rate whose
+throughput keeps up with the offered load within the p99 SLO and error budget
+
+Usage:
+    python load_test_bridge.py --rate 50 --duration 30 --concurrency 16
+    python load_test_bridge.py --rates 10 20 40 80 160 --slo-ms 250        # saturation sweep
+    python load_test_bridge.py --bridges 2 --mix small=0.5,large=0.5
+    python load_test_bridge.py --bridge-command "ssh host python ml-model/node_bridge_persistent.py"
+"""
+
+import argparse
+import json
+import shlex
+import threading
+import time
+
+import numpy as np
+
+from benchmark_baseline import latency_stats, write_report
+from benchmark_inference import DEFAULT_CORPUS, load_corpus, start_bridge
+
+# Plan size classes: list items and content text repeated this many times
+PLAN_SIZES = {'small': 1, 'medium': 4, 'large': 16}
+DEFAULT_MIX = 'small=0.7,medium=0.2,large=0.1'
+DEFAULT_REPORT = 'benchmarks/load_test_report.json'
+
+
+def scale_plan(plan, factor):
+    """Copy of a plan with every list and the content text repeated factor times"""
+    scaled = dict(plan)
+    for key, value in plan.items():
+        if isinstance(value, list):
+            scaled[key] = value * factor
+    if isinstance(plan.get('content'), str):
+        scaled['content'] = ' '.join([plan['content']] * factor)
+    return scaled
+
+
+def parse_mix(mix):
+    """'small=0.7,large=0.3' -> {'small': 0.7, 'large': 0.3} (normalized)"""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in PLAN_SIZES:
+            raise ValueError(f"Unknown plan size {name!r}, expected one of {sorted(PLAN_SIZES)}")
+        weights[name.strip()] = float(weight or 1)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def request_lines(plans, mix, n_requests, rng):
+    """Pre-serialized request bodies (id filled in at send time) and their size class"""
+    names = list(mix)
+    sizes = rng.choice(len(names), size=n_requests, p=[mix[name] for name in names])
+    picks = rng.integers(0, len(plans), size=n_requests)
+    encoded = {}
+    bodies = []
+    for size, pick in zip(sizes, picks):
+        key = (names[size], int(pick))
+        if key not in encoded:
+            encoded[key] = json.dumps(scale_plan(plans[pick], PLAN_SIZES[names[size]]))
+        bodies.append((names[size], encoded[key]))
+    return bodies
+
+
+class BridgeConnection:
+    """One bridge process: a locked writer and a reader thread that routes responses"""
+
+    def __init__(self, command=None, extra_args=()):
+        self.process, self.ready_time = start_bridge(extra_args=extra_args, command=command)
+        self._write_lock = threading.Lock()
+        self.on_response = None
+        self._reader = threading.Thread(target=self._read, name='bridge-reader', daemon=True)
+        self._reader.start()
+
+    def send(self, line):
+        with self._write_lock:
+            self.process.stdin.write(line + '\n')
+            self.process.stdin.flush()
+
+    def _read(self):
+        for line in self.process.stdout:
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            if self.on_response is not None:
+                self.on_response(response, time.perf_counter())
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=30)
+        except Exception:
+            self.process.kill()
+
+
+class LoadGenerator:
+    """Open-loop load at a fixed rate over a set of bridge connections"""
+
+    def __init__(self, connections, plans, mix, concurrency=16, timeout=5.0, seed=42):
+        self.connections = connections
+        self.plans = plans
+        self.mix = mix
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.rng = np.random.default_rng(seed)
+        self._next_id = 0
+        for connection in connections:
+            connection.on_response = self._on_response
+
+    def _on_response(self, response, received):
+        with self._lock:
+            entry = self._inflight.pop(response.get('id'), None)
+            if entry is None:
+                self._stats['late'] += 1  # Answered after its timeout (or a cancel acknowledgement)
+                return
+            scheduled, size = entry
+            if response.get('status') == 'busy':
+                self._stats['busy'] += 1
+            elif response.get('error'):
+                self._stats['errors'] += 1
+            else:
+                self._latencies.append(received - scheduled)
+                self._by_size.setdefault(size, []).append(received - scheduled)
+                self._last_completion = received
+        self._slots.release()
+
+    def _reap(self, stop):
+        """Fail requests older than the timeout, free their slots and cancel them on the bridge"""
+        while not stop.is_set():
+            now = time.perf_counter()
+            with self._lock:
+                expired = [
+                    (request_id, entry) for request_id, entry in self._inflight.items()
+                    if now - entry[0] > self.timeout
+                ]
+                for request_id, _ in expired:
+                    del self._inflight[request_id]
+                self._stats['timeouts'] += len(expired)
+            for request_id, _ in expired:
+                self._slots.release()
+                connection = self.connections[request_id % len(self.connections)]
+                connection.send(json.dumps({'cmd': 'cancel', 'id': request_id}))
+            stop.wait(0.05)
+
+    def run(self, rate, duration):
+        """
+        Offer rate requests/s for duration seconds
+
+        Returns:
+            dict: offered / achieved throughput, latency percentiles, error counts
+        """
+        n_requests = max(1, int(rate * duration))
+        schedule = np.cumsum(self.rng.exponential(1 / rate, n_requests))
+        bodies = request_lines(self.plans, self.mix, n_requests, self.rng)
+
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(self.concurrency)
+        self._inflight = {}
+        self._latencies = []
+        self._by_size = {}
+        self._stats = {'sent': 0, 'errors': 0, 'busy': 0, 'timeouts': 0, 'late': 0}
+        self._last_completion = None
+        stop = threading.Event()
+        reaper = threading.Thread(target=self._reap, args=(stop,), name='load-reaper', daemon=True)
+        reaper.start()
+
+        started = time.perf_counter()
+        for offset, (size, body) in zip(schedule, bodies):
+            scheduled = started + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._slots.acquire()  # Waiting here is client-side queueing, counted in the latency
+
+            request_id = self._next_id
+            self._next_id += 1
+            with self._lock:
+                self._inflight[request_id] = (scheduled, size)
+                self._stats['sent'] += 1
+            connection = self.connections[request_id % len(self.connections)]
+            connection.send(f'{{"id": {request_id}, "lesson_plan": {body}}}')
+
+        # Drain: everything still in flight either answers or times out
+        while True:
+            with self._lock:
+                if not self._inflight:
+                    break
+            time.sleep(0.01)
+        stop.set()
+        reaper.join()
+
+        completed = len(self._latencies)
+        window = (self._last_completion or time.perf_counter()) - started
+        return {
+            'offered_rate': rate,
+            'duration': duration,
+            'concurrency': self.concurrency,
+            'bridges': len(self.connections),
+            **self._stats,
+            'completed': completed,
+            'throughput': completed / window if window > 0 else 0.0,
+            'error_rate': (self._stats['sent'] - completed) / self._stats['sent'],
+            'latency': latency_stats(self._latencies),
+            'latency_by_size': {size: latency_stats(values) for size, values in self._by_size.items()}
+        }
+
+
+def sustains(step, slo_ms, max_error_rate=0.01, min_throughput_ratio=0.95):
+    """Whether a step kept up with its offered load"""
+    latency = step['latency']
+    return (
+        latency.get('count', 0) > 0
+        and step['throughput'] >= min_throughput_ratio * step['offered_rate']
+        and latency['p99_ms'] <= slo_ms
+        and step['error_rate'] <= max_error_rate
+    )
+
+
+def print_step(step):
+    latency = step['latency']
+    if not latency.get('count'):
+        print(f"   {step['offered_rate']:>8.1f} req/s offered | no successful responses")
+        return
+    print(
+        f"   {step['offered_rate']:>8.1f} req/s offered | {step['throughput']:8.1f} done/s | "
+        f"p50 {latency['p50_ms']:8.1f} | p99 {latency['p99_ms']:8.1f} | p999 {latency['p999_ms']:8.1f} ms | "
+        f"errors {step['errors']}, busy {step['busy']}, timeouts {step['timeouts']}"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the persistent prediction bridge")
+    rates = parser.add_mutually_exclusive_group()
+    rates.add_argument('--rate', type=float, default=20.0, help="Target requests/s")
+    rates.add_argument('--rates', type=float, nargs='+', help="Sweep these rates to find saturation")
+    parser.add_argument('--duration', type=float, default=20.0, help="Seconds per rate")
+    parser.add_argument('--concurrency', type=int, default=16, help="Max requests in flight")
+    parser.add_argument('--timeout', type=float, default=5.0, help="Seconds before a request counts as timed out")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Plan sizes {sorted(PLAN_SIZES)} with weights")
+    parser.add_argument('--bridges', type=int, default=1, help="Bridge processes, round-robin")
+    parser.add_argument('--bridge-command', default=None, help="Command that starts a bridge (default: local)")
+    parser.add_argument('--slo-ms', type=float, default=500.0, help="p99 latency a sustained rate must meet")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="Lesson plans JSON list")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=DEFAULT_REPORT, help="JSON report")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    command = shlex.split(args.bridge_command) if args.bridge_command else None
+
+    print("=" * 70)
+    print("🚦 BRIDGE LOAD TEST")
+    print("=" * 70)
+
+    connections = [BridgeConnection(command=command) for _ in range(args.bridges)]
+    print(f"   {args.bridges} bridge(s) ready in "
+          f"{max(connection.ready_time for connection in connections):.2f}s, "
+          f"concurrency {args.concurrency}, mix {args.mix}")
+
+    generator = LoadGenerator(
+        connections, load_corpus(args.corpus), parse_mix(args.mix),
+        concurrency=args.concurrency, timeout=args.timeout, seed=args.seed
+    )
+    steps = []
+    try:
+        for rate in args.rates or [args.rate]:
+            step = generator.run(rate, args.duration)
+            steps.append(step)
+            print_step(step)
+    finally:
+        for connection in connections:
+            connection.close()
+
+    # Saturation: the last rate sustained before the first one that was not
+    saturation = None
+    for step in steps:
+        if not sustains(step, args.slo_ms):
+            break
+        saturation = step['offered_rate']
+
+    if saturation is None:
+        print(f"\n⚠️  No tested rate was sustained within p99 {args.slo_ms:.0f} ms")
+    elif saturation == steps[-1]['offered_rate'] and len(steps) > 1:
+        print(f"\n📈 All rates sustained - saturation is above {saturation:.1f} req/s")
+    else:
+        print(f"\n📈 Saturation point: {saturation:.1f} req/s "
+              f"({args.bridges} bridge(s), concurrency {args.concurrency}, p99 <= {args.slo_ms:.0f} ms)")
+
+    write_report(
+        args.output, 'bridge_load', steps, mix=parse_mix(args.mix), slo_ms=args.slo_ms,
+        saturation_rate=saturation
+    )
+    print(f"✅ Report saved to {args.output}")
@@ -0,0 +1,149 @@
+"""
+Vectorized Model Evaluation
+Point metrics for every candidate come from one (n_samples, n_models)
+predictions matrix. Bootstrap resamples are drawn as index matrices and turned
+into per-resample row counts, so each metric over thousands of resamples is a
+single matrix product instead of a Python loop
+All models are scored on the same resamples (paired bootstrap), so the spread
+of an R² difference reflects the models, not which rows each one happened to draw
+"""
+
+import numpy as np
+
+METRICS = ('r2', 'rmse', 'mae', 'mape')
+_EPSILON = np.finfo(np.float64).eps  # sklearn's MAPE guard against y == 0
+
+
+def predictions_matrix(predictions):
+    """name -> predictions dict -> (names, (n_samples, n_models) array)"""
+    names = list(predictions)
+    return names, np.column_stack([np.asarray(predictions[name], dtype=float) for name in names])
+
+
+def _weighted_metrics(counts, y, P):
+    """
+    Metrics under row counts (one row of counts per resample)
+
+    Args:
+        counts: (n_resamples, n_samples) times each row is drawn
+        y: (n_samples,)
+        P: (n_samples, n_models)
+
+    Returns:
+        dict metric -> (n_resamples, n_models)
+    """
+    n = counts.sum(axis=1, keepdims=True)
+    errors = P - y[:, np.newaxis]
+    sse = counts @ errors ** 2
+    # Total sum of squares of the resampled targets: Σc·y² - (Σc·y)² / n
+    sst = counts @ y ** 2 - (counts @ y) ** 2 / n[:, 0]
+    sst = np.where(sst > 0, sst, np.nan)[:, np.newaxis]
+    return {
+        'r2': 1 - sse / sst,
+        'rmse': np.sqrt(sse / n),
+        'mae': counts @ np.abs(errors) / n,
+        'mape': counts @ (np.abs(errors) / np.maximum(np.abs(y), _EPSILON)[:, np.newaxis]) / n
+    }
+
+
+def point_metrics(y, P):
+    """R² / RMSE / MAE / MAPE of every column of P; dict metric -> (n_models,)"""
+    y = np.asarray(y, dtype=float)
+    P = np.asarray(P, dtype=float).reshape(len(y), -1)
+    return {name: values[0] for name, values in _weighted_metrics(np.ones((1, len(y))), y, P).items()}
+
+
+def bootstrap_indices(n_samples, n_resamples, rng):
+    """(n_resamples, n_samples) matrix of row indices drawn with replacement"""
+    return rng.integers(0, n_samples, size=(n_resamples, n_samples))
+
+
+def _index_counts(indices, n_samples):
+    """Index matrix -> (n_resamples, n_samples) count matrix, with one bincount"""
+    offsets = np.arange(len(indices))[:, np.newaxis] * n_samples
+    return np.bincount((indices + offsets).ravel(), minlength=len(indices) * n_samples).reshape(
+        len(indices), n_samples
+    ).astype(float)
+
+
+def bootstrap_metrics(y, P, n_resamples=10000, random_state=42, chunk_elements=4_000_000):
+    """
+    Metric distributions over paired bootstrap resamples
+
+    Resamples are processed in chunks of about chunk_elements indices, so
+    memory stays flat for large test sets
+
+    Returns:
+        dict metric -> (n_resamples, n_models)
+    """
+    y = np.asarray(y, dtype=float)
+    P = np.asarray(P, dtype=float).reshape(len(y), -1)
+    rng = np.random.default_rng(random_state)
+    chunk = max(1, chunk_elements // max(len(y), 1))
+
+    parts = []
+    for start in range(0, n_resamples, chunk):
+        indices = bootstrap_indices(len(y), min(chunk, n_resamples - start), rng)
+        parts.append(_weighted_metrics(_index_counts(indices, len(y)), y, P))
+    return {name: np.concatenate([part[name] for part in parts]) for name in METRICS}
+
+
+def _interval(samples, confidence):
+    tail = (1 - confidence) / 2 * 100
+    return np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+
+
+def evaluate_predictions(y, predictions, n_resamples=10000, confidence=0.95, random_state=42):
+    """
+    Point metrics, bootstrap confidence intervals and paired R² comparisons
+
+    Args:
+        y: true targets
+        predictions: model name -> predictions on the same rows
+        n_resamples: bootstrap resamples (0 = point metrics only)
+
+    Returns:
+        dict with
+            metrics: name -> {r2, rmse, mae, mape, and <metric>_ci [low, high]}
+            reference: the model with the best point R²
+            comparisons: name -> R² difference to the reference, its interval and
+                the share of resamples where the model beats the reference
+    """
+    y = np.asarray(y, dtype=float)
+    names, P = predictions_matrix(predictions)
+    point = point_metrics(y, P)
+
+    metrics = {
+        name: {metric: float(point[metric][i]) for metric in METRICS}
+        for i, name in enumerate(names)
+    }
+    reference_index = int(np.nanargmax(point['r2']))
+    result = {
+        'n_samples': len(y),
+        'n_resamples': n_resamples,
+        'confidence': confidence,
+        'reference': names[reference_index],
+        'metrics': metrics,
+        'comparisons': {}
+    }
+    if n_resamples <= 0:
+        return result
+
+    samples = bootstrap_metrics(y, P, n_resamples, random_state)
+    for metric in METRICS:
+        low, high = _interval(samples[metric], confidence)
+        for i, name in enumerate(names):
+            metrics[name][f'{metric}_ci'] = [float(low[i]), float(high[i])]
+
+    # Paired: both columns of each resample come from the same drawn rows
+    deltas = samples['r2'] - samples['r2'][:, [reference_index]]
+    low, high = _interval(deltas, confidence)
+    for i, name in enumerate(names):
+        if i == reference_index:
+            continue
+        result['comparisons'][name] = {
+            'r2_delta': float(point['r2'][i] - point['r2'][reference_index]),
+            'r2_delta_ci': [float(low[i]), float(high[i])],
+            'p_better': float(np.mean(deltas[:, i] > 0))
+        }
+    return result
@@ -0,0 +1,107 @@
+"""
+Latency-aware Model Selection
+Every candidate is timed on the same fixed benchmark rows - single-row calls
+(as the bridge makes them) and one batch call - and its serialized size is
+measured. The deployed model is the best R² within the configured p99
+latency / size budgets; among models within r2_tolerance of that R², the
+fastest wins, so a slightly more accurate but much slower model loses
+"""
+
+import io
+import time
+
+import joblib
+import numpy as np
+
+
+def benchmark_rows(X, n_rows=256):
+    """Fixed benchmark: the first n_rows rows, as float64 like predict.py sends them"""
+    return np.asarray(X, dtype=float)[:n_rows]
+
+
+def serialized_size(model):
+    """Bytes of the model as joblib.dump writes it"""
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return buffer.getbuffer().nbytes
+
+
+def measure_inference(model, X_benchmark, single_calls=200, batch_repeats=5, warmup=5):
+    """
+    Time single-row and batch predictions
+
+    Returns:
+        dict: single-row p50/p99 ms, batch ms per call and rows/s, serialized size
+    """
+    X_benchmark = np.asarray(X_benchmark, dtype=float)
+
+    for i in range(min(warmup, len(X_benchmark))):
+        model.predict(X_benchmark[i:i + 1])
+
+    single = []
+    for i in range(single_calls):
+        row = X_benchmark[i % len(X_benchmark)][np.newaxis, :]
+        started = time.perf_counter()
+        model.predict(row)
+        single.append(time.perf_counter() - started)
+
+    batch = []
+    for _ in range(batch_repeats):
+        started = time.perf_counter()
+        model.predict(X_benchmark)
+        batch.append(time.perf_counter() - started)
+
+    single_ms = np.array(single) * 1000
+    batch_ms = float(np.median(batch) * 1000)
+    return {
+        'single_p50_ms': float(np.percentile(single_ms, 50)),
+        'single_p99_ms': float(np.percentile(single_ms, 99)),
+        'batch_rows': len(X_benchmark),
+        'batch_ms': batch_ms,
+        'batch_rows_per_s': len(X_benchmark) / (batch_ms / 1000) if batch_ms > 0 else float('inf'),
+        'size_bytes': serialized_size(model)
+    }
+
+
+def select_model(model_metrics, inference, max_p99_ms=None, max_size_mb=None, r2_tolerance=0.0):
+    """
+    Pick the model to deploy
+
+    Args:
+        model_metrics: name -> evaluation metrics (needs 'r2')
+        inference: name -> measure_inference() result
+        max_p99_ms: single-row p99 latency budget (None = unlimited)
+        max_size_mb: serialized size budget (None = unlimited)
+        r2_tolerance: models this close to the best eligible R² count as tied;
+            the tie goes to the lowest p99 latency
+
+    Returns:
+        tuple: (chosen name, selection record for the metadata)
+    """
+    def within_budget(name):
+        cost = inference[name]
+        if max_p99_ms is not None and cost['single_p99_ms'] > max_p99_ms:
+            return False
+        if max_size_mb is not None and cost['size_bytes'] > max_size_mb * 1024 * 1024:
+            return False
+        return True
+
+    eligible = [name for name in model_metrics if within_budget(name)]
+    fallback = not eligible
+    if fallback:
+        # Nothing fits the budget - deploy the fastest model rather than nothing
+        eligible = [min(model_metrics, key=lambda name: inference[name]['single_p99_ms'])]
+
+    best_r2 = max(model_metrics[name]['r2'] for name in eligible)
+    tied = [name for name in eligible if model_metrics[name]['r2'] >= best_r2 - r2_tolerance]
+    chosen = min(tied, key=lambda name: (inference[name]['single_p99_ms'], -model_metrics[name]['r2']))
+
+    return chosen, {
+        'objective': 'best_r2_within_budget',
+        'max_p99_ms': max_p99_ms,
+        'max_size_mb': max_size_mb,
+        'r2_tolerance': r2_tolerance,
+        'eligible': eligible,
+        'over_budget_fallback': fallback,
+        'chosen': chosen
+    }
@@ -1,52 +1,145 @@
 """
 Persistent Python Bridge for Health Score Prediction
 Keeps process alive and handles multiple requests efficiently
-Startup: ~1-2 seconds (model loads once)
+Startup: instant - READY is printed before the model loads and early requests
+are scored by the rubric scorer (source: "rubric") until the model takes over
 Per-prediction: ~50-100ms
 Enhanced error handling and graceful degradation
+Session mode: open a plan once, then re-score from JSON patches
+Priority classes and deadlines: interactive requests jump ahead of bulk ones,
+expired or cancelled requests are dropped, overload is rejected as "busy"
+Batch mode: score many plans in vectorized chunks, streaming one frame per chunk
+Traffic capture (--capture): anonymized requests and responses to a rotating file
+On-demand profiling: {"cmd": "profile"} / {"cmd": "heap_snapshot"} open a
+cProfile / tracemalloc window and answer with a summary when it closes
 """
 
 import sys
+import os
 import json
 import io
+import time
+import argparse
+import threading
 import traceback
 from contextlib import redirect_stdout, redirect_stderr
 
-# Global predictor instance - created once on startup
+from bridge_scheduler import RequestScheduler, QueueFullError
+from bridge_profiling import PROFILING_COMMANDS
+
+# Global predictor instance - rubric scorer at startup, swapped for the
+# trained model once it has loaded. Handlers read it once per request.
 predictor = None
 
-def initialize():
-    """Initialize predictor on startup"""
-    global predictor
+# Session-held plans for incremental re-scoring
+sessions = None
+
+# Optional TrafficCapture; None means capture is off and costs nothing
+capture = None
+
+# Open profiling windows by command; the worker only looks up 'profile'
+profiling = {}
+profile_dir = 'profiles'
+
+SESSION_COMMANDS = ('session_open', 'session_patch', 'session_close')
+
+# Plans scored per vectorized model call in batch mode
+DEFAULT_BATCH_CHUNK_SIZE = 64
+MAX_BATCH_CHUNK_SIZE = 512
+
+# Real stdout/stderr, captured before any redirect_stdout() in the worker thread
+_stdout = sys.stdout
+_stderr = sys.stderr
+_stdout_lock = threading.Lock()
+
+def log(message):
+    """Diagnostic line on the real stderr (never swallowed by output redirects)"""
+    _stderr.write(message + "\n")
+    _stderr.flush()
+
+def emit(message):
+    """Write one JSON response line; safe to call from reader and worker threads"""
+    line = json.dumps(message, ensure_ascii=True)
+    with _stdout_lock:
+        _stdout.write(line + "\n")
+        _stdout.flush()
+    if capture is not None:
+        capture.record_response(message)
+
+def initialize(wait_for_model=False, cache_path=None):
+    """
+    Start serving immediately from the rubric scorer and load the model in the background
+    
+    Returns:
+        threading.Thread: the model loader
+    """
+    global predictor, sessions
     
-    # Pre-load model
     try:
         import warnings
         warnings.filterwarnings('ignore')
-        print("[INIT] Importing HealthScorePredictor...", file=sys.stderr, flush=True)
-        from predict import HealthScorePredictor
         
-        print("[INIT] Creating predictor instance...", file=sys.stderr, flush=True)
-        predictor = HealthScorePredictor()
-        
-        print("[INIT] Predictor ready!", file=sys.stderr, flush=True)
-        # Signal Node.js that we're ready AFTER model loads
-        print("READY", flush=True)
+        log("[INIT] Creating rubric scorer...")
+        from rubric_scorer import RubricPredictor
+        from plan_sessions import PlanSessionStore
+        predictor = RubricPredictor()
+        sessions = PlanSessionStore(predictor)
     except Exception as e:
         error_response = {
             "error": f"Failed to initialize predictor: {str(e)}",
             "traceback": traceback.format_exc()
         }
-        print(json.dumps(error_response), flush=True)
+        emit(error_response)
         sys.exit(1)
+    
+    loader = threading.Thread(target=load_model, args=(cache_path,), name='model-loader', daemon=True)
+    loader.start()
+    
+    if wait_for_model:
+        loader.join()
+    
+    # Signal Node.js that we're ready - model may still be loading
+    with _stdout_lock:
+        _stdout.write("READY\n")
+        _stdout.flush()
+    
+    return loader
+
+def load_model(cache_path=None):
+    """Load and warm up the trained model, then atomically replace the rubric scorer"""
+    global predictor
+    
+    try:
+        started = time.perf_counter()
+        log("[INIT] Importing HealthScorePredictor...")
+        from predict import HealthScorePredictor
+        
+        log("[INIT] Loading model...")
+        model_predictor = HealthScorePredictor(cache_path=cache_path)
+        if model_predictor.cache is not None:
+            log(f"[INIT] Prediction cache: {cache_path} ({len(model_predictor.cache)} entries)")
+        
+        log("[INIT] Warming up model...")
+        model_predictor.warm_up()
+        
+        # Single reference swap - in-flight requests finish on the scorer they started with
+        predictor = model_predictor
+        sessions.predictor = model_predictor
+        
+        log(f"[INIT] Predictor ready! Model took over after {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        log(f"[INIT] Model failed to load, continuing with rubric scores: {e}")
+        log(traceback.format_exc())
 
 def handle_request(request_data):
     """Handle a single prediction request with error handling"""
     request_id = request_data.get('id')
     lesson_plan = request_data.get('lesson_plan', {})
     
+    active = predictor
+    
     try:
-        if not predictor:
+        if not active:
             raise RuntimeError("Predictor not initialized")
         
         if not isinstance(lesson_plan, dict):
@@ -55,7 +148,7 @@ def handle_request(request_data):
         # Suppress stdout/stderr during prediction
         f = io.StringIO()
         with redirect_stdout(f), redirect_stderr(f):
-            result = predictor.predict_with_reasoning(lesson_plan)
+            result = active.predict_with_reasoning(lesson_plan)
         
         # Validate result
         if not isinstance(result, dict):
@@ -71,6 +164,8 @@ def handle_request(request_data):
             score = max(1.0, min(10.0, float(score)))
             result['score'] = score
         
+        result['source'] = active.source
+        
         response = {
             'id': request_id,
             'result': result,
@@ -94,9 +189,337 @@ def handle_request(request_data):
     
     return response
 
+def handle_session_request(request_data):
+    """Handle session_open / session_patch / session_close messages"""
+    from plan_sessions import PatchError, SessionNotFoundError
+    
+    request_id = request_data.get('id')
+    command = request_data.get('cmd')
+    session_id = request_data.get('session')
+    
+    try:
+        if sessions is None:
+            raise RuntimeError("Predictor not initialized")
+        
+        if session_id is None:
+            raise ValueError("session is required")
+        
+        # Suppress stdout/stderr during prediction
+        f = io.StringIO()
+        with redirect_stdout(f), redirect_stderr(f):
+            if command == 'session_open':
+                result = sessions.open(session_id, request_data.get('lesson_plan'))
+            elif command == 'session_patch':
+                result = sessions.patch(session_id, request_data.get('patch'))
+            else:
+                result = {'session': session_id, 'closed': sessions.close(session_id)}
+        
+        response = {
+            'id': request_id,
+            'result': result,
+            'error': None
+        }
+    
+    except SessionNotFoundError:
+        response = {
+            'id': request_id,
+            'result': None,
+            'error': f"Unknown or expired session: {session_id}"
+        }
+    
+    except PatchError as e:
+        response = {
+            'id': request_id,
+            'result': None,
+            'error': f"Invalid patch: {str(e)}"
+        }
+    
+    except Exception as e:
+        response = {
+            'id': request_id,
+            'result': None,
+            'error': f"{type(e).__name__}: {str(e)}",
+            'traceback': traceback.format_exc()
+        }
+    
+    return response
+
+def handle_batch_request(request_data, entry=None):
+    """
+    Score a list of plans in vectorized chunks
+    
+    Emits one {"type": "chunk"} frame per chunk as soon as it is scored, then
+    returns the final {"type": "summary"} frame. Only one chunk of features and
+    results is alive at a time. Stops between chunks if the request is
+    cancelled or its deadline passes.
+    """
+    request_id = request_data.get('id')
+    started = time.perf_counter()
+    
+    try:
+        if not predictor:
+            raise RuntimeError("Predictor not initialized")
+        
+        lesson_plans = request_data.get('lesson_plans')
+        if not isinstance(lesson_plans, list):
+            raise ValueError("lesson_plans must be a list")
+        
+        chunk_size = int(request_data.get('chunk_size', DEFAULT_BATCH_CHUNK_SIZE))
+        chunk_size = max(1, min(MAX_BATCH_CHUNK_SIZE, chunk_size))
+        include_reasoning = bool(request_data.get('reasoning', True))
+    
+    except Exception as e:
+        return {
+            'id': request_id,
+            'type': 'summary',
+            'result': None,
+            'error': f"{type(e).__name__}: {str(e)}"
+        }
+    
+    status = 'ok'
+    scored = 0
+    failed = 0
+    chunks = 0
+    score_total = 0.0
+    
+    for offset in range(0, len(lesson_plans), chunk_size):
+        if entry is not None and entry.cancelled:
+            status = 'cancelled'
+            break
+        if entry is not None and entry.expired():
+            status = 'expired'
+            break
+        
+        # Re-read per chunk so a long batch picks up the model once it has loaded
+        active = predictor
+        chunk = lesson_plans[offset:offset + chunk_size]
+        valid = [i for i, plan in enumerate(chunk) if isinstance(plan, dict)]
+        results = [
+            {'index': offset + i, 'result': None, 'error': 'lesson_plan must be a dictionary'}
+            for i in range(len(chunk))
+        ]
+        
+        try:
+            # Suppress stdout/stderr during prediction
+            f = io.StringIO()
+            with redirect_stdout(f), redirect_stderr(f):
+                predictions = active.predict_batch_with_reasoning(
+                    [chunk[i] for i in valid], include_reasoning=include_reasoning
+                )
+            for i, prediction in zip(valid, predictions):
+                prediction['source'] = active.source
+                results[i] = {'index': offset + i, 'result': prediction, 'error': None}
+                score_total += prediction['score']
+        except Exception as e:
+            for i in valid:
+                results[i]['error'] = f"{type(e).__name__}: {str(e)}"
+        
+        chunk_failed = sum(1 for r in results if r['error'])
+        failed += chunk_failed
+        scored += len(results) - chunk_failed
+        chunks += 1
+        
+        emit({
+            'id': request_id,
+            'type': 'chunk',
+            'offset': offset,
+            'results': results,
+            'error': None
+        })
+    
+    return {
+        'id': request_id,
+        'type': 'summary',
+        'status': status,
+        'result': {
+            'total': len(lesson_plans),
+            'scored': scored,
+            'failed': failed,
+            'chunks': chunks,
+            'chunk_size': chunk_size,
+            'mean_score': round(score_total / scored, 2) if scored else None,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        },
+        'error': None if status == 'ok' else f"Batch stopped early: {status}"
+    }
+
+def dispatch(request_data, entry=None):
+    """Route a request message to its handler"""
+    if request_data.get('cmd') == 'batch':
+        return handle_batch_request(request_data, entry)
+    if request_data.get('cmd') in SESSION_COMMANDS:
+        return handle_session_request(request_data)
+    return handle_request(request_data)
+
+def rejection(request_id, status, error):
+    """Fast-fail response for requests that were never run"""
+    return {
+        'id': request_id,
+        'result': None,
+        'error': error,
+        'status': status
+    }
+
+def worker_loop(scheduler):
+    """Serve queued requests in priority order until the scheduler is closed"""
+    while True:
+        entry = scheduler.next()
+        if entry is None:
+            return
+        
+        if entry.expired():
+            emit(rejection(entry.request_id, 'expired', 'Deadline exceeded before request was processed'))
+            scheduler.finish(entry)
+            continue
+        
+        try:
+            window = profiling.get('profile')
+            if window is None:
+                emit(dispatch(entry.request, entry))
+            else:
+                emit(window.run(dispatch, entry.request, entry))
+        except Exception as e:
+            emit({
+                'id': entry.request_id,
+                'result': None,
+                'error': f'Unexpected error: {str(e)}',
+                'traceback': traceback.format_exc()
+            })
+        finally:
+            scheduler.finish(entry)
+
+def profiling_done(window, response):
+    """Called from the window's timer thread once its output is written"""
+    for command, open_window in list(profiling.items()):
+        if open_window is window:
+            del profiling[command]
+    if response['error']:
+        log(f"[PROFILE] {response['error']}")
+    else:
+        log(f"[PROFILE] {response['result']['cmd']} written to {response['result']['file']}")
+    emit(response)
+
+def start_profiling(request_data):
+    """Open a profile / heap_snapshot window; its response is sent when the window closes"""
+    from bridge_profiling import start_window, window_seconds
+    
+    request_id = request_data.get('id')
+    command = request_data.get('cmd')
+    try:
+        seconds = window_seconds(request_data)
+    except (TypeError, ValueError) as e:
+        emit(rejection(request_id, 'invalid', f"Invalid {command} request: {str(e)}"))
+        return
+    if command in profiling:
+        emit(rejection(request_id, 'busy', f"A {command} window is already open"))
+        return
+    profiling[command] = start_window(request_data, seconds, profile_dir, profiling_done)
+    log(f"[PROFILE] {command} window open for {profiling[command].seconds:g}s")
+
+def handle_line(line, scheduler):
+    """Parse one stdin line; control messages are handled inline, the rest is queued"""
+    try:
+        request_data = json.loads(line)
+    except json.JSONDecodeError as e:
+        emit({
+            'id': None,
+            'result': None,
+            'error': f'Invalid JSON request: {str(e)}'
+        })
+        return
+    
+    if not isinstance(request_data, dict):
+        emit({
+            'id': None,
+            'result': None,
+            'error': 'Request must be a JSON object'
+        })
+        return
+    
+    if capture is not None:
+        capture.record_request(request_data)
+    
+    request_id = request_data.get('id')
+    
+    if request_data.get('cmd') == 'cancel':
+        # Already-running requests cannot be interrupted; their result is still sent
+        if scheduler.cancel(request_id) is not None:
+            emit(rejection(request_id, 'cancelled', 'Request cancelled by client'))
+        return
+    
+    if request_data.get('cmd') in PROFILING_COMMANDS:
+        start_profiling(request_data)
+        return
+    
+    try:
+        scheduler.submit(request_data)
+    except QueueFullError as e:
+        emit(rejection(request_id, 'busy', str(e)))
+    except (TypeError, ValueError) as e:
+        emit(rejection(request_id, 'invalid', str(e)))
+
+def shutdown():
+    """Flush anything that must outlive the process"""
+    for window in list(profiling.values()):
+        window.finish()  # Close open windows early so their results are still sent
+    active = predictor
+    if getattr(active, 'cache', None) is not None:
+        active.cache.close()
+    if capture is not None:
+        capture.close()
+        log(f"[CAPTURE] {capture.stats['requests']} requests, {capture.stats['responses']} responses, "
+            f"{capture.stats['dropped']} dropped")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Persistent health score prediction bridge")
+    parser.add_argument(
+        '--wait-for-model', action='store_true',
+        help="Print READY only after the trained model has loaded (no rubric scores)"
+    )
+    parser.add_argument(
+        '--cache-path', default=os.environ.get('BRIDGE_CACHE_PATH'),
+        help="SQLite file for a prediction cache that survives restarts (off by default)"
+    )
+    parser.add_argument(
+        '--max-queue-depth', type=int,
+        default=int(os.environ.get('BRIDGE_MAX_QUEUE_DEPTH', 64)),
+        help="Reject requests with status 'busy' beyond this many queued requests"
+    )
+    parser.add_argument(
+        '--capture', default=os.environ.get('BRIDGE_CAPTURE_PATH'),
+        help="Append anonymized requests/responses to this JSONL file (see replay_traffic.py)"
+    )
+    parser.add_argument(
+        '--capture-max-mb', type=float, default=50,
+        help="Rotate the capture file at this size"
+    )
+    parser.add_argument(
+        '--capture-backups', type=int, default=5,
+        help="Rotated capture files to keep"
+    )
+    parser.add_argument(
+        '--profile-dir', default=os.environ.get('BRIDGE_PROFILE_DIR', 'profiles'),
+        help="Where profile / heap_snapshot windows write their output"
+    )
+    return parser.parse_args(argv)
+
 def main():
     """Main event loop for persistent predictions"""
-    initialize()
+    global capture, profile_dir
+    
+    args = parse_args()
+    profile_dir = args.profile_dir
+    if args.capture:
+        from traffic_capture import TrafficCapture
+        capture = TrafficCapture(
+            args.capture, max_bytes=int(args.capture_max_mb * 1024 * 1024), backups=args.capture_backups
+        )
+        log(f"[CAPTURE] Recording traffic to {args.capture}")
+    initialize(wait_for_model=args.wait_for_model, cache_path=args.cache_path)
+    
+    scheduler = RequestScheduler(max_depth=args.max_queue_depth)
+    worker = threading.Thread(target=worker_loop, args=(scheduler,), name='bridge-worker', daemon=True)
+    worker.start()
     
     try:
         for line in sys.stdin:
@@ -105,26 +528,19 @@ def main():
                 continue
             
             try:
-                request_data = json.loads(line)
-                response = handle_request(request_data)
-                print(json.dumps(response, ensure_ascii=True), flush=True)
-                
-            except json.JSONDecodeError as e:
-                error_response = {
-                    'id': None,
-                    'result': None,
-                    'error': f'Invalid JSON request: {str(e)}'
-                }
-                print(json.dumps(error_response, ensure_ascii=True), flush=True)
-                
+                handle_line(line, scheduler)
             except Exception as e:
-                error_response = {
+                emit({
                     'id': None,
                     'result': None,
                     'error': f'Unexpected error: {str(e)}',
                     'traceback': traceback.format_exc()
-                }
-                print(json.dumps(error_response, ensure_ascii=True), flush=True)
+                })
+        
+        # stdin closed: finish queued work before exiting
+        scheduler.close()
+        worker.join()
+        shutdown()
                 
     except KeyboardInterrupt:
         print("Shutting down gracefully...", file=sys.stderr, flush=True)
@@ -0,0 +1,112 @@
+"""
+Batched Permutation Importance
+A feature's importance is the drop in validation R² when its column is
+shuffled. All n_repeats shuffled copies of the validation matrix for one
+feature are stacked into a single batch and scored with one predict call, and
+features are spread over worker processes. Every feature draws its shuffles
+from its own seed, so results do not depend on the number of workers
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model_evaluation import point_metrics
+
+# Model and validation data, set once per worker process by the pool initializer
+_WORKER_DATA = {}
+
+
+def _limit_jobs(model):
+    """Predict single-threaded, so the process pool is the only parallelism"""
+    for member in getattr(model, 'models', {}).values():  # StackedRegressor members
+        _limit_jobs(member)
+    if hasattr(model, 'n_jobs'):
+        model.n_jobs = 1
+
+
+def _init_worker(model, X, y):
+    """Pool initializer: keep the model and validation data and cap native thread pools at 1"""
+    _limit_jobs(model)
+    _WORKER_DATA.update(model=model, X=X, y=y)
+    for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[variable] = '1'
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+
+def permuted_batch(X, feature, n_repeats, rng):
+    """
+    n_repeats copies of X stacked row-wise, each with column `feature` shuffled
+
+    Returns:
+        array (n_repeats * n_samples, n_features)
+    """
+    X = np.asarray(X, dtype=float)
+    batch = np.tile(X, (n_repeats, 1))
+    # One permutation per repeat: argsort of uniform noise, row by row
+    order = np.argsort(rng.random((n_repeats, len(X))), axis=1)
+    batch[:, feature] = X[order, feature].ravel()
+    return batch
+
+
+def _feature_scores(model, X, y, features, n_repeats, random_state):
+    """feature -> validation R² of each shuffled copy (n_repeats,)"""
+    scores = {}
+    for feature in features:
+        rng = np.random.default_rng([random_state, feature])
+        predictions = model.predict(permuted_batch(X, feature, n_repeats, rng))
+        # (n_repeats * n_samples,) -> one column per repeat
+        scores[feature] = point_metrics(y, predictions.reshape(n_repeats, len(X)).T)['r2']
+    return scores
+
+
+def _worker_scores(features, n_repeats, random_state):
+    return _feature_scores(
+        _WORKER_DATA['model'], _WORKER_DATA['X'], _WORKER_DATA['y'], features, n_repeats, random_state
+    )
+
+
+def permutation_importance(model, X, y, n_repeats=10, n_workers=None, random_state=42):
+    """
+    Mean and spread of the R² drop when each feature is shuffled
+
+    Args:
+        model: fitted regressor
+        X, y: validation data (never the rows the model was fitted on)
+        n_repeats: shuffles per feature, scored together in one predict call
+        n_workers: processes to spread features over (None = all cores)
+
+    Returns:
+        dict with baseline_r2, importances_mean, importances_std (per feature) and n_repeats
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_features = X.shape[1]
+    baseline = float(point_metrics(y, model.predict(X))['r2'][0])
+
+    n_workers = min(max(1, n_workers or os.cpu_count() or 1), n_features)
+    if n_workers == 1:
+        scores = _feature_scores(model, X, y, range(n_features), n_repeats, random_state)
+    else:
+        groups = [list(range(n_features))[i::n_workers] for i in range(n_workers)]
+        scores = {}
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(model, X, y)
+        ) as pool:
+            for group_scores in pool.map(
+                _worker_scores, groups, [n_repeats] * n_workers, [random_state] * n_workers
+            ):
+                scores.update(group_scores)
+
+    drops = baseline - np.vstack([scores[feature] for feature in range(n_features)])
+    return {
+        'baseline_r2': baseline,
+        'importances_mean': drops.mean(axis=1),
+        'importances_std': drops.std(axis=1),
+        'n_repeats': n_repeats
+    }
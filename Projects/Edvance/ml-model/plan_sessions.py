@@ -0,0 +1,309 @@
+"""
+Session-held Lesson Plans for Incremental Re-scoring
+Clients open a session with a full lesson plan, then send RFC 6902 JSON patches
+Only the features whose source fields were touched by a patch are re-extracted
+Idle sessions are evicted under a session count / memory cap
+"""
+
+import copy
+import json
+import time
+from collections import OrderedDict
+
+from predict import FEATURE_SOURCE_FIELDS
+
+
+class PatchError(ValueError):
+    """Raised when a JSON patch cannot be applied to a session plan"""
+
+
+class SessionNotFoundError(KeyError):
+    """Raised when a patch or close targets an unknown (or evicted) session"""
+
+
+def _parse_pointer(path):
+    """Split a JSON pointer ("/a/b/0") into unescaped reference tokens"""
+    if path == '':
+        return []
+    if not path.startswith('/'):
+        raise PatchError(f"Invalid JSON pointer: {path!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in path[1:].split('/')]
+
+
+def _list_index(container, token, allow_end=False):
+    """Resolve a JSON pointer token to a list index"""
+    if allow_end and token == '-':
+        return len(container)
+    if not token.isdigit():
+        raise PatchError(f"Invalid list index: {token!r}")
+    index = int(token)
+    limit = len(container) + (1 if allow_end else 0)
+    if index >= limit:
+        raise PatchError(f"List index out of range: {index}")
+    return index
+
+
+def _resolve_parent(document, tokens):
+    """Walk to the container holding the last token of a pointer"""
+    node = document
+    for token in tokens[:-1]:
+        if isinstance(node, list):
+            node = node[_list_index(node, token)]
+        elif isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f"Path segment not found: {token!r}")
+            node = node[token]
+        else:
+            raise PatchError(f"Cannot descend into {type(node).__name__} at {token!r}")
+    return node
+
+
+def _get_value(document, tokens):
+    if not tokens:
+        return document
+    parent = _resolve_parent(document, tokens)
+    last = tokens[-1]
+    if isinstance(parent, list):
+        return parent[_list_index(parent, last)]
+    if isinstance(parent, dict) and last in parent:
+        return parent[last]
+    raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def _add_value(document, tokens, value):
+    parent = _resolve_parent(document, tokens)
+    last = tokens[-1]
+    if isinstance(parent, list):
+        parent.insert(_list_index(parent, last, allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[last] = value
+    else:
+        raise PatchError(f"Cannot add into {type(parent).__name__}")
+
+
+def _remove_value(document, tokens):
+    parent = _resolve_parent(document, tokens)
+    last = tokens[-1]
+    if isinstance(parent, list):
+        return parent.pop(_list_index(parent, last))
+    if isinstance(parent, dict) and last in parent:
+        return parent.pop(last)
+    raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def apply_patch(plan, patch):
+    """
+    Apply an RFC 6902 JSON patch to a lesson plan without mutating it
+
+    Only the top-level fields a patch touches are deep-copied, so patching one
+    material does not copy the (possibly large) content of the plan.
+
+    Args:
+        plan: dict lesson plan
+        patch: list of operations ({"op", "path", "value"/"from"})
+
+    Returns:
+        tuple: (patched plan, set of touched top-level field names)
+    """
+    if not isinstance(patch, list):
+        raise PatchError("patch must be a list of operations")
+
+    document = dict(plan)
+    copied = set()
+    touched = set()
+
+    def own(tokens):
+        # Copy-on-write for the top-level field a pointer lands in
+        field = tokens[0]
+        if len(tokens) > 1 and field not in copied and field in document:
+            document[field] = copy.deepcopy(document[field])
+            copied.add(field)
+        touched.add(field)
+
+    for operation in patch:
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            raise PatchError(f"Malformed patch operation: {operation!r}")
+
+        op = operation['op']
+        tokens = _parse_pointer(operation['path'])
+
+        if not tokens:
+            # Whole-document operations replace every field
+            if op in ('add', 'replace'):
+                if not isinstance(operation.get('value'), dict):
+                    raise PatchError("Root value must be a lesson plan object")
+                touched.update(document.keys())
+                document = copy.deepcopy(operation['value'])
+                copied = set(document.keys())
+                touched.update(document.keys())
+                continue
+            if op == 'test':
+                if document != operation.get('value'):
+                    raise PatchError("Test operation failed at root")
+                continue
+            raise PatchError(f"Unsupported root operation: {op!r}")
+
+        if op == 'add':
+            own(tokens)
+            _add_value(document, tokens, copy.deepcopy(operation.get('value')))
+        elif op == 'remove':
+            own(tokens)
+            _remove_value(document, tokens)
+        elif op == 'replace':
+            own(tokens)
+            _get_value(document, tokens)  # Target must exist
+            _remove_value(document, tokens)
+            _add_value(document, tokens, copy.deepcopy(operation.get('value')))
+        elif op in ('move', 'copy'):
+            from_tokens = _parse_pointer(operation.get('from', ''))
+            if not from_tokens:
+                raise PatchError(f"{op} requires a non-root 'from' pointer")
+            if op == 'move':
+                own(from_tokens)
+                value = _remove_value(document, from_tokens)
+            else:
+                value = copy.deepcopy(_get_value(document, from_tokens))
+            own(tokens)
+            _add_value(document, tokens, value)
+        elif op == 'test':
+            if _get_value(document, tokens) != operation.get('value'):
+                raise PatchError(f"Test operation failed at {operation['path']}")
+        else:
+            raise PatchError(f"Unknown patch operation: {op!r}")
+
+    return document, touched
+
+
+def _field_size(value):
+    """Approximate in-memory footprint of a plan field (serialized length)"""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+class PlanSessionStore:
+    """Keep lesson plans and their extracted features between re-score requests"""
+
+    def __init__(self, predictor, max_sessions=256, max_bytes=64 * 1024 * 1024,
+                 idle_timeout=900):
+        self.predictor = predictor
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+        self.total_bytes = 0
+        # session_id -> session state, least recently used first
+        self._sessions = OrderedDict()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def open(self, session_id, lesson_plan):
+        """Start (or restart) a session from a full lesson plan and score it"""
+        if not isinstance(lesson_plan, dict):
+            raise ValueError("lesson_plan must be a dictionary")
+
+        self.close(session_id)
+
+        features = self.predictor.extract_features(lesson_plan)
+        field_sizes = {field: _field_size(value) for field, value in lesson_plan.items()}
+
+        session = {
+            'plan': lesson_plan,
+            'features': features,
+            'field_sizes': field_sizes,
+            'bytes': sum(field_sizes.values()),
+            'last_used': time.monotonic()
+        }
+        self._sessions[session_id] = session
+        self.total_bytes += session['bytes']
+        self.evict(keep=session_id)
+
+        return self._score(session_id, session, list(self.predictor.feature_names))
+
+    def patch(self, session_id, patch):
+        """Apply a JSON patch to a session plan and re-score from touched features only"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(session_id)
+
+        plan, touched = apply_patch(session['plan'], patch)
+
+        recomputed = [
+            name for name in self.predictor.feature_names
+            if FEATURE_SOURCE_FIELDS[name] in touched
+        ]
+        features = dict(session['features'])
+        try:
+            for name in recomputed:
+                features[name] = self.predictor.extract_feature(plan, name)
+        except Exception as e:
+            raise PatchError(f"Patched plan is invalid for {name}: {e}") from e
+
+        # Only touched fields change size
+        for field in touched:
+            old_size = session['field_sizes'].pop(field, 0)
+            session['bytes'] -= old_size
+            self.total_bytes -= old_size
+            if field in plan:
+                new_size = _field_size(plan[field])
+                session['field_sizes'][field] = new_size
+                session['bytes'] += new_size
+                self.total_bytes += new_size
+
+        session['plan'] = plan
+        session['features'] = features
+        session['last_used'] = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        self.evict(keep=session_id)
+
+        return self._score(session_id, session, recomputed)
+
+    def close(self, session_id):
+        """Drop a session; returns True if it existed"""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self.total_bytes -= session['bytes']
+        return True
+
+    def evict(self, keep=None):
+        """Evict idle sessions, then least recently used ones while over the caps"""
+        now = time.monotonic()
+        evicted = []
+
+        for session_id in list(self._sessions):
+            if session_id == keep:
+                continue
+            if now - self._sessions[session_id]['last_used'] > self.idle_timeout:
+                self.close(session_id)
+                evicted.append(session_id)
+
+        for session_id in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions and self.total_bytes <= self.max_bytes:
+                break
+            if session_id == keep:
+                continue
+            self.close(session_id)
+            evicted.append(session_id)
+
+        return evicted
+
+    def stats(self):
+        return {
+            'sessions': len(self._sessions),
+            'bytes': self.total_bytes,
+            'max_sessions': self.max_sessions,
+            'max_bytes': self.max_bytes
+        }
+
+    def _score(self, session_id, session, recomputed):
+        predictor = self.predictor
+        result = predictor.predict_features_with_reasoning(dict(session['features']))
+        result['source'] = predictor.source
+        result['session'] = session_id
+        result['recomputed'] = recomputed
+        return result
@@ -6,8 +6,6 @@ Enhanced with better feature extraction and score normalization
 """
 
 import numpy as np
-import pandas as pd
-import joblib
 import os
 import json
 
@@ -15,26 +13,61 @@ import json
 _GLOBAL_MODEL_INSTANCE = None
 _GLOBAL_SCALER_INSTANCE = None
 
+# Lesson plan field each model feature is extracted from
+FEATURE_SOURCE_FIELDS = {
+    'num_objectives': 'objectives',
+    'num_materials': 'materials',
+    'num_activities': 'activities',
+    'num_assessments': 'assessments',
+    'has_differentiation': 'differentiation',
+    'duration': 'duration',
+    'content_words': 'content'
+}
+
+# Upper clamp for the list-count features
+COUNT_FEATURE_LIMITS = {
+    'num_objectives': 6,
+    'num_materials': 6,
+    'num_activities': 5,
+    'num_assessments': 4
+}
+
 class HealthScorePredictor:
     """Load trained model and make predictions on new lesson plans"""
     
-    def __init__(self, model_path='models/health_score_model.pkl', scaler_path='models/scaler.pkl'):
+    # Model input order
+    FEATURE_NAMES = (
+        'num_objectives',
+        'num_materials',
+        'num_activities',
+        'num_assessments',
+        'has_differentiation',
+        'duration',
+        'content_words'
+    )
+    
+    # Reported to clients so they can tell model scores from fallbacks
+    source = 'ml_model'
+    
+    def __init__(self, model_path='models/health_score_model.pkl', scaler_path='models/scaler.pkl',
+                 cache_path=None, cache_max_entries=100000):
         self.model_path = model_path
         self.scaler_path = scaler_path
         self.model = None
         self.scaler = None
-        self.feature_names = [
-            'num_objectives',
-            'num_materials', 
-            'num_activities',
-            'num_assessments',
-            'has_differentiation',
-            'duration',
-            'content_words'
-        ]
+        self.cache = None
+        self.feature_names = list(self.FEATURE_NAMES)
         
         self._load_model()
         self._load_scaler()
+        
+        # Optional on-disk cache that survives restarts
+        if cache_path:
+            from prediction_cache import PredictionCache, file_fingerprint
+            model_version = file_fingerprint(
+                self.model_path, self.scaler_path if self.scaler is not None else None
+            )
+            self.cache = PredictionCache(cache_path, model_version, max_entries=cache_max_entries)
     
     def _load_model(self):
         """Load trained model from disk (cached in memory)"""
@@ -51,7 +84,8 @@ class HealthScorePredictor:
                 f"Please run train_model.py first."
             )
         
-        # Load from disk only once
+        # Load from disk only once (joblib imported here: rubric scoring never needs it)
+        import joblib
         self.model = joblib.load(self.model_path)
         
         # Cache globally for reuse
@@ -66,9 +100,78 @@ class HealthScorePredictor:
             return
         
         if os.path.exists(self.scaler_path):
+            import joblib
             self.scaler = joblib.load(self.scaler_path)
             _GLOBAL_SCALER_INSTANCE = self.scaler
     
+    def warm_up(self, batch_size=64, seed=0):
+        """
+        Score a synthetic batch plus a single row so one-time costs (lazy
+        imports, allocator and thread-pool start-up) are not paid by the
+        first real prediction
+        """
+        rng = np.random.default_rng(seed)
+        features_list = [
+            {
+                'num_objectives': int(rng.integers(1, 7)),
+                'num_materials': int(rng.integers(1, 7)),
+                'num_activities': int(rng.integers(1, 6)),
+                'num_assessments': int(rng.integers(1, 5)),
+                'has_differentiation': int(rng.integers(0, 2)),
+                'duration': int(rng.integers(30, 121)),
+                'content_words': int(rng.integers(100, 3001))
+            }
+            for _ in range(batch_size)
+        ]
+        # Bypass the prediction cache so synthetic rows are never stored
+        self._predict_uncached(features_list)
+        self._predict_uncached(features_list[:1])
+    
+    def extract_feature(self, lesson_plan, feature_name):
+        """
+        Extract a single feature from the lesson plan field it depends on
+        
+        Args:
+            lesson_plan: dict with lesson plan data
+            feature_name: one of self.feature_names
+        
+        Returns:
+            int: clamped feature value
+        """
+        field = FEATURE_SOURCE_FIELDS[feature_name]
+        
+        if feature_name == 'has_differentiation':
+            differentiation = lesson_plan.get(field, [])
+            if isinstance(differentiation, (list, tuple)):
+                return 1 if len([d for d in differentiation if d]) > 0 else 0
+            return int(bool(differentiation))
+        
+        if feature_name == 'duration':
+            # Duration with validation
+            duration = int(lesson_plan.get(field, 45))
+            return max(30, min(120, duration))  # Clamp between 30-120
+        
+        if feature_name == 'content_words':
+            # Calculate content words with better handling
+            content = lesson_plan.get(field, '')
+            if isinstance(content, dict):
+                content = json.dumps(content)
+            elif not isinstance(content, str):
+                content = str(content)
+            
+            content_words = len(content.split())
+            return max(100, min(3000, content_words))  # Clamp between 100-3000
+        
+        # Count list fields - handle both lists and single items
+        items = lesson_plan.get(field, [])
+        if isinstance(items, (list, tuple)):
+            count = len([item for item in items if item])
+        else:
+            count = 1 if items else 0
+        
+        # Clamp feature values to reasonable ranges
+        return min(max(1, count), COUNT_FEATURE_LIMITS[feature_name])
+    
     def extract_features(self, lesson_plan):
         """
         Extract and normalize features from lesson plan
@@ -87,69 +190,10 @@ class HealthScorePredictor:
             dict: extracted features ready for prediction
         """
         try:
-            # Get feature values with safe defaults
-            objectives = lesson_plan.get('objectives', [])
-            materials = lesson_plan.get('materials', [])
-            activities = lesson_plan.get('activities', [])
-            assessments = lesson_plan.get('assessments', [])
-            
-            # Count objectives - handle both lists and single items
-            if isinstance(objectives, (list, tuple)):
-                num_objectives = len([o for o in objectives if o])
-            else:
-                num_objectives = 1 if objectives else 0
-            
-            # Count materials
-            if isinstance(materials, (list, tuple)):
-                num_materials = len([m for m in materials if m])
-            else:
-                num_materials = 1 if materials else 0
-            
-            # Count activities
-            if isinstance(activities, (list, tuple)):
-                num_activities = len([a for a in activities if a])
-            else:
-                num_activities = 1 if activities else 0
-            
-            # Count assessments
-            if isinstance(assessments, (list, tuple)):
-                num_assessments = len([a for a in assessments if a])
-            else:
-                num_assessments = 1 if assessments else 0
-            
-            # Check for differentiation
-            differentiation = lesson_plan.get('differentiation', [])
-            if isinstance(differentiation, (list, tuple)):
-                has_differentiation = 1 if len([d for d in differentiation if d]) > 0 else 0
-            else:
-                has_differentiation = int(bool(differentiation))
-            
-            # Duration with validation
-            duration = int(lesson_plan.get('duration', 45))
-            duration = max(30, min(120, duration))  # Clamp between 30-120
-            
-            # Calculate content words with better handling
-            content = lesson_plan.get('content', '')
-            if isinstance(content, dict):
-                content = json.dumps(content)
-            elif not isinstance(content, str):
-                content = str(content)
-            
-            content_words = len(content.split())
-            content_words = max(100, min(3000, content_words))  # Clamp between 100-3000
-            
-            # Clamp feature values to reasonable ranges
-            features = {
-                'num_objectives': min(max(1, num_objectives), 6),
-                'num_materials': min(max(1, num_materials), 6),
-                'num_activities': min(max(1, num_activities), 5),
-                'num_assessments': min(max(1, num_assessments), 4),
-                'has_differentiation': has_differentiation,
-                'duration': duration,
-                'content_words': content_words
+            return {
+                name: self.extract_feature(lesson_plan, name)
+                for name in self.feature_names
             }
-            
-            return features
         
         except Exception as e:
             print(f"⚠️  Error extracting features: {str(e)}")
@@ -193,6 +237,95 @@ class HealthScorePredictor:
         
         return round(normalized, 1)
     
+    def predict_from_features(self, features):
+        """
+        Predict health score from already-extracted features
+        
+        Args:
+            features: dict as returned by extract_features
+        
+        Returns:
+            float: predicted health score (1-10)
+        """
+        return self.predict_features_batch([features])[0]
+    
+    def predict_features_batch(self, features_list):
+        """
+        Predict health scores for many feature dicts with a single model call
+        
+        Args:
+            features_list: list of dicts as returned by extract_features
+        
+        Returns:
+            list: predicted health scores (1-10)
+        """
+        if self.cache is not None and features_list:
+            return [score for score, _ in self._predict_cached(features_list, include_reasoning=False)]
+        
+        return self._predict_uncached(features_list)
+    
+    def _predict_features_with_reasoning(self, features_list):
+        """
+        Score feature dicts and explain each score
+        Reasoning already in the prediction cache is reused instead of rebuilt
+        
+        Returns:
+            list: (score, reasoning) per feature dict
+        """
+        if self.cache is not None and features_list:
+            return self._predict_cached(features_list, include_reasoning=True)
+        
+        scores = self.predict_features_batch(features_list)
+        return [(score, self._generate_reasoning(score, features))
+                for score, features in zip(scores, features_list)]
+    
+    def _predict_cached(self, features_list, include_reasoning):
+        """
+        Serve (score, reasoning) pairs from the prediction cache, scoring misses in one model call
+        Reasoning is only generated when asked for; score-only entries are stored with
+        reasoning None and filled in the first time a caller needs it
+        """
+        cached = self.cache.get_many(features_list)
+        results = [(entry['score'], entry['reasoning']) if entry is not None else None for entry in cached]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        if missing:
+            scores = self._predict_uncached([features_list[i] for i in missing])
+            for i, score in zip(missing, scores):
+                results[i] = (score, None)
+        
+        missing = set(missing)
+        for i, (score, reasoning) in enumerate(results):
+            if include_reasoning and reasoning is None:
+                reasoning = self._generate_reasoning(score, features_list[i])
+                results[i] = (score, reasoning)
+                self.cache.put(features_list[i], score, reasoning)
+            elif i in missing:
+                self.cache.put(features_list[i], score, reasoning)
+        
+        return results
+    
+    def _predict_uncached(self, features_list):
+        """Run the model on a list of feature dicts"""
+        # Create feature matrix in correct order
+        feature_array = np.array(
+            [[features[name] for name in self.feature_names] for features in features_list],
+            dtype=float
+        )
+        
+        # Apply scaler if available
+        if self.scaler:
+            try:
+                feature_array = self.scaler.transform(feature_array)
+            except Exception as e:
+                print(f"⚠️  Scaler error: {str(e)}")
+                # Continue without scaling
+        
+        raw_predictions = self.model.predict(feature_array)
+        
+        # Normalize to 1-10 scale
+        return [self.normalize_score(raw) for raw in raw_predictions]
+    
     def predict(self, lesson_plan, return_features=False):
         """
         Predict health score for lesson plan
@@ -213,30 +346,8 @@ class HealthScorePredictor:
             import sys
             print(f"[PREDICT] Features extracted: {features}", file=sys.stderr, flush=True)
             
-            # Create feature array in correct order
-            feature_array = np.array([[
-                features['num_objectives'],
-                features['num_materials'],
-                features['num_activities'],
-                features['num_assessments'],
-                features['has_differentiation'],
-                features['duration'],
-                features['content_words']
-            ]])
-            
-            # Apply scaler if available
-            if self.scaler:
-                try:
-                    feature_array = self.scaler.transform(feature_array)
-                except Exception as e:
-                    print(f"⚠️  Scaler error: {str(e)}")
-                    # Continue without scaling
-            
             # Make prediction
-            raw_prediction = self.model.predict(feature_array)[0]
-            
-            # Normalize to 1-10 scale
-            score = self.normalize_score(raw_prediction)
+            score = self.predict_from_features(features)
             
             if return_features:
                 return score, features
@@ -252,6 +363,7 @@ class HealthScorePredictor:
     def predict_batch(self, lesson_plans):
         """
         Predict health scores for multiple lesson plans
+        Features are extracted per plan, then scored in one vectorized model call
         
         Args:
             lesson_plans: list of lesson plan dicts
@@ -259,6 +371,15 @@ class HealthScorePredictor:
         Returns:
             list: predicted scores
         """
+        if not lesson_plans:
+            return []
+        
+        try:
+            features_list = [self.extract_features(plan) for plan in lesson_plans]
+            return self.predict_features_batch(features_list)
+        except Exception as e:
+            print(f"⚠️  Vectorized batch failed, scoring one by one: {str(e)}")
+        
         scores = []
         for plan in lesson_plans:
             try:
@@ -270,6 +391,27 @@ class HealthScorePredictor:
         
         return scores
     
+    def predict_batch_with_reasoning(self, lesson_plans, include_reasoning=True):
+        """
+        Vectorized predict_with_reasoning for a list of lesson plans
+        
+        Returns:
+            list of dicts with score, features and (optionally) reasoning
+        """
+        features_list = [self.extract_features(plan) for plan in lesson_plans]
+        if not features_list:
+            return []
+        
+        if not include_reasoning:
+            scores = self.predict_features_batch(features_list)
+            return [{'score': score, 'features': features} for score, features in zip(scores, features_list)]
+        
+        return [
+            {'score': score, 'features': features, 'reasoning': reasoning}
+            for (score, reasoning), features in zip(self._predict_features_with_reasoning(features_list),
+                                                    features_list)
+        ]
+    
     def predict_with_reasoning(self, lesson_plan):
         """
         Predict score and provide explanation
@@ -281,10 +423,10 @@ class HealthScorePredictor:
                 - reasoning: explanation of score
         """
         try:
-            score, features = self.predict(lesson_plan, return_features=True)
+            features = self.extract_features(lesson_plan)
             
-            # Generate reasoning
-            reasoning = self._generate_reasoning(score, features)
+            # Reasoning comes from the prediction cache when it was stored with the score
+            score, reasoning = self._predict_features_with_reasoning([features])[0]
             
             return {
                 'score': score,
@@ -300,6 +442,19 @@ class HealthScorePredictor:
                 'reasoning': ['Unable to generate reasoning - using default score']
             }
     
+    def predict_features_with_reasoning(self, features):
+        """
+        Predict score and provide explanation from already-extracted features
+        Used when the caller keeps features around (e.g. bridge sessions)
+        """
+        score, reasoning = self._predict_features_with_reasoning([features])[0]
+        
+        return {
+            'score': score,
+            'features': features,
+            'reasoning': reasoning
+        }
+    
     def _generate_reasoning(self, score, features):
         """Generate human-readable explanation for score"""
         reasons = []
@@ -0,0 +1,253 @@
+"""
+Persistent Prediction Cache for HealthScorePredictor
+SQLite-backed (stdlib) so scores survive bridge restarts, deploys and crashes
+Keyed by model version + canonical feature hash; stores score, features and
+reasoning (null until a caller asks for it)
+Writes are batched on a background thread; size is bounded by evicting the
+least recently used entries - hits refresh last_used through the same writer
+"""
+
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    model_version TEXT NOT NULL,
+    score REAL NOT NULL,
+    features TEXT NOT NULL,
+    reasoning TEXT NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+_STOP = object()
+
+
+def feature_key(model_version, features):
+    """Cache key: model version + canonical (sorted-key) JSON of the features"""
+    canonical = json.dumps(features, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f"{model_version}|{canonical}".encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(*paths):
+    """Short content hash of model artifacts, used as the model version"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+class PredictionCache:
+    """Disk-backed prediction cache with an in-memory LRU front"""
+
+    def __init__(self, path, model_version, max_entries=100000, memory_entries=4096,
+                 flush_interval=0.5, flush_batch=256):
+        self.path = path
+        self.model_version = model_version
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evicted': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = queue.Queue()
+
+        connection = self._connection()
+        connection.execute(_SCHEMA)
+        # Entries from other model versions can never hit again
+        connection.execute("DELETE FROM predictions WHERE model_version != ?", (model_version,))
+        connection.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, name='prediction-cache-writer', daemon=True)
+        self._writer.start()
+
+    def _connection(self):
+        # sqlite connections are per-thread
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _remember(self, key, entry):
+        with self._memory_lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get_many(self, features_list):
+        """
+        Look up cached results
+
+        Returns:
+            list: {'score', 'features', 'reasoning'} or None per input, in order
+        """
+        keys = [feature_key(self.model_version, features) for features in features_list]
+        results = [None] * len(keys)
+        missing = []
+
+        with self._memory_lock:
+            for i, key in enumerate(keys):
+                entry = self._memory.get(key)
+                if entry is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = entry
+                else:
+                    missing.append(i)
+
+        if missing:
+            try:
+                found = {}
+                unique_keys = list({keys[i] for i in missing})
+                connection = self._connection()
+                # Stay under sqlite's bound-parameter limit
+                for start in range(0, len(unique_keys), 500):
+                    chunk = unique_keys[start:start + 500]
+                    rows = connection.execute(
+                        f"SELECT key, score, features, reasoning FROM predictions "
+                        f"WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, score, features, reasoning in rows:
+                        found[key] = {
+                            'score': score,
+                            'features': json.loads(features),
+                            'reasoning': json.loads(reasoning)
+                        }
+                for i in missing:
+                    entry = found.get(keys[i])
+                    if entry is not None:
+                        results[i] = entry
+                        self._remember(keys[i], entry)
+            except sqlite3.Error as e:
+                print(f"⚠️  Prediction cache read error: {str(e)}", file=sys.stderr)
+
+        hit_keys = [key for key, result in zip(keys, results) if result is not None]
+        if hit_keys:
+            self._writes.put((None, hit_keys))  # Refresh last_used (batched by the writer)
+        hits = len(hit_keys)
+        self.stats['hits'] += hits
+        self.stats['misses'] += len(results) - hits
+        return results
+
+    def get(self, features):
+        return self.get_many([features])[0]
+
+    def put(self, features, score, reasoning):
+        """
+        Cache a result; visible immediately, persisted by the background writer
+        reasoning may be None for score-only results (stored as JSON null)
+        """
+        key = feature_key(self.model_version, features)
+        entry = {
+            'score': score,
+            'features': dict(features),
+            'reasoning': list(reasoning) if reasoning is not None else None
+        }
+        self._remember(key, entry)
+        self._writes.put((key, entry))
+
+    def _write_loop(self):
+        pending = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._writes.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP or isinstance(item, threading.Event)
+            if item is not None and not stop:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if pending and (stop or len(pending) >= self.flush_batch or time.monotonic() >= deadline):
+                self._flush(pending)
+                pending = []
+                deadline = None
+
+            if isinstance(item, threading.Event):
+                item.set()  # flush() barrier
+            elif item is _STOP:
+                return
+
+    def _flush(self, pending):
+        """Write (key, entry) inserts and (None, keys) last_used touches from reads"""
+        now = time.time()
+        inserts = [(key, entry) for key, entry in pending if key is not None]
+        inserted = {key for key, _ in inserts}
+        touched = set()
+        for key, keys in pending:
+            if key is None:
+                touched.update(keys)
+        touched -= inserted
+        try:
+            connection = self._connection()
+            connection.executemany(
+                "UPDATE predictions SET last_used = ? WHERE key = ?",
+                [(now, key) for key in touched]
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO predictions "
+                "(key, model_version, score, features, reasoning, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (key, self.model_version, entry['score'], json.dumps(entry['features']),
+                     json.dumps(entry['reasoning']), now)
+                    for key, entry in inserts
+                ]
+            )
+            self.stats['writes'] += len(inserts)
+
+            # Bound the table size - drop the least recently used entries
+            (count,) = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                connection.execute(
+                    "DELETE FROM predictions WHERE key IN "
+                    "(SELECT key FROM predictions ORDER BY last_used ASC LIMIT ?)",
+                    (excess,)
+                )
+                self.stats['evicted'] += excess
+            connection.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  Prediction cache write error: {str(e)}", file=sys.stderr)
+
+    def flush(self, timeout=10):
+        """Block until everything queued so far is written to disk"""
+        done = threading.Event()
+        self._writes.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        if self._writer.is_alive():
+            self._writes.put(_STOP)
+            self._writer.join(timeout=10)
+
+    def __len__(self):
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM predictions").fetchone()
+        return count
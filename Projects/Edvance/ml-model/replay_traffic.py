@@ -0,0 +1,239 @@
+"""
+Replay Captured Bridge Traffic
+Re-drives a capture written by node_bridge_persistent.py --capture against any
+bridge build, keeping the captured arrival pattern at 1x, Nx or as fast as
+possible, then compares latencies and scores with the capture: the same
+traffic shape validates a performance change, the same requests validate a
+model upgrade
+Plans are rebuilt from their recorded shape (list lengths, word / character
+counts, numbers), so they extract the same features as the originals
+Captured profile / heap_snapshot messages are not replayed: they would open
+profiling windows on the bridge under test and skew the latencies compared
+
+Usage:
+    python node_bridge_persistent.py --capture captures/bridge.jsonl    # record (or BRIDGE_CAPTURE_PATH)
+    python replay_traffic.py captures/bridge.jsonl                       # real time
+    python replay_traffic.py captures/bridge.jsonl --speed 10            # 10x faster
+    python replay_traffic.py captures/bridge.jsonl --speed 0             # as fast as possible
+    python replay_traffic.py captures/bridge.jsonl --bridge-command "python ../other/node_bridge_persistent.py --wait-for-model"
+"""
+
+import argparse
+import json
+import shlex
+import threading
+import time
+
+import numpy as np
+
+from benchmark_baseline import latency_stats, write_report
+from bridge_profiling import PROFILING_COMMANDS
+from load_test_bridge import BridgeConnection
+from traffic_capture import read_capture
+
+DEFAULT_REPORT = 'benchmarks/replay_report.json'
+
+
+class Replayer:
+    """Send captured requests on their (scaled) schedule and collect the final responses"""
+
+    def __init__(self, connection, concurrency=64, timeout=30.0):
+        self.connection = connection
+        self.concurrency = concurrency
+        self.timeout = timeout
+        connection.on_response = self._on_response
+
+    def _on_response(self, response, received):
+        if response.get('type') == 'chunk':
+            return  # Batch progress; the summary frame completes the request
+        with self._lock:
+            sent = self._inflight.pop(response.get('id'), None)
+            if sent is None:
+                return
+            self._responses[response['id']] = (response, received - sent)
+        self._slots.release()
+
+    def run(self, entries, speed=1.0):
+        """
+        Returns:
+            list: per entry, (response, latency seconds, send lag seconds) or None
+        """
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(self.concurrency)
+        self._inflight = {}
+        self._responses = {}
+        lags = [None] * len(entries)
+        replay_ids = {}  # captured id -> replay id of its latest request, for cancels
+
+        t0 = entries[0]['t'] if entries else 0.0
+        started = time.perf_counter()
+        for index, entry in enumerate(entries):
+            scheduled = started + (entry['t'] - t0) / speed if speed > 0 else time.perf_counter()
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            request = dict(entry['request'])
+            if request.get('cmd') in PROFILING_COMMANDS:
+                continue
+            if request.get('cmd') == 'cancel':
+                target = replay_ids.get(json.dumps(request.get('id')))
+                if target is not None:
+                    self.connection.send(json.dumps({**request, 'id': target}))
+                continue
+
+            self._slots.acquire()
+            replay_ids[json.dumps(request.get('id'))] = index
+            request['id'] = index
+            sent = time.perf_counter()
+            lags[index] = sent - scheduled
+            with self._lock:
+                self._inflight[index] = sent
+            self.connection.send(json.dumps(request))
+
+        deadline = time.perf_counter() + self.timeout
+        while time.perf_counter() < deadline:
+            with self._lock:
+                if not self._inflight:
+                    break
+            time.sleep(0.01)
+
+        results = []
+        for index in range(len(entries)):
+            if index in self._responses:
+                response, latency = self._responses[index]
+                results.append((response, latency, lags[index]))
+            else:
+                results.append(None)
+        return results, time.perf_counter() - started
+
+
+def _score(response):
+    result = response.get('result') if isinstance(response.get('result'), dict) else {}
+    return result.get('score', result.get('mean_score'))
+
+
+def compare(entries, replayed, score_tolerance=0.05):
+    """Captured vs replayed latency (per command) and score agreement"""
+    by_command = {}
+    score_diffs = []
+    outcome_changes = 0
+    unanswered = 0
+    profiling_skipped = 0
+    lags = []
+
+    for entry, replay in zip(entries, replayed):
+        command = entry['request'].get('cmd') or 'predict'
+        if command == 'cancel':
+            continue
+        if command in PROFILING_COMMANDS:
+            profiling_skipped += 1
+            continue
+        if replay is None:
+            unanswered += 1
+            continue
+        response, latency, lag = replay
+        lags.append(lag)
+        latencies = by_command.setdefault(command, {'captured': [], 'replayed': []})
+        latencies['replayed'].append(latency)
+        captured = entry['response']
+        if captured is None:
+            continue
+        latencies['captured'].append(entry['latency'])
+
+        if captured['error'] != bool(response.get('error')) or captured.get('status') != response.get('status'):
+            outcome_changes += 1
+        before, after = captured.get('score'), _score(response)
+        if before is not None and after is not None:
+            score_diffs.append(after - before)
+
+    score_diffs = np.abs(np.asarray(score_diffs, dtype=float))
+    return {
+        'latency': {
+            command: {'captured': latency_stats(values['captured']), 'replayed': latency_stats(values['replayed'])}
+            for command, values in by_command.items()
+        },
+        'scores': {
+            'compared': len(score_diffs),
+            'mean_abs_diff': float(score_diffs.mean()) if len(score_diffs) else None,
+            'max_abs_diff': float(score_diffs.max()) if len(score_diffs) else None,
+            'changed': int((score_diffs > score_tolerance).sum()),
+            'tolerance': score_tolerance
+        },
+        'outcome_changes': outcome_changes,
+        'unanswered': unanswered,
+        'profiling_skipped': profiling_skipped,
+        'send_lag': latency_stats(lags)
+    }
+
+
+def print_comparison(comparison):
+    print(f"\n{'':<16}{'captured p50/p99 ms':>24}{'replayed p50/p99 ms':>24}")
+    for command, stats in comparison['latency'].items():
+        captured, replayed = stats['captured'], stats['replayed']
+
+        def cell(latency):
+            if not latency.get('count'):
+                return f"{'-':>24}"
+            return f"{latency['p50_ms']:>12.1f} /{latency['p99_ms']:>9.1f}"
+
+        print(f"   {command:<13}{cell(captured)}{cell(replayed)}")
+
+    scores = comparison['scores']
+    if scores['compared']:
+        print(
+            f"\n   Scores: {scores['compared']} compared, mean |Δ| {scores['mean_abs_diff']:.4f}, "
+            f"max |Δ| {scores['max_abs_diff']:.4f}, {scores['changed']} changed by > {scores['tolerance']}"
+        )
+    print(f"   Outcome changes (error / status): {comparison['outcome_changes']}, "
+          f"unanswered: {comparison['unanswered']}")
+    if comparison['profiling_skipped']:
+        print(f"   Profiling control messages not replayed: {comparison['profiling_skipped']}")
+    lag = comparison['send_lag']
+    if lag.get('count') and lag['p99_ms'] > 50:
+        print(f"   ⚠️  Replayer fell behind the schedule (send lag p99 {lag['p99_ms']:.0f} ms) - "
+              f"raise --concurrency or lower --speed")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a captured bridge trace")
+    parser.add_argument('capture', help="Capture file written by node_bridge_persistent.py --capture")
+    parser.add_argument('--speed', type=float, default=1.0, help="Time scale: 1 = real time, 0 = as fast as possible")
+    parser.add_argument('--concurrency', type=int, default=64, help="Max requests in flight")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Seconds to wait for the last responses")
+    parser.add_argument('--limit', type=int, default=None, help="Replay only the first N requests")
+    parser.add_argument('--bridge-command', default=None, help="Command that starts the bridge under test")
+    parser.add_argument('--score-tolerance', type=float, default=0.05, help="Score change counted as different")
+    parser.add_argument('--output', default=DEFAULT_REPORT, help="JSON report")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    entries = read_capture(args.capture)[:args.limit]
+    if not entries:
+        raise SystemExit(f"No requests in {args.capture}")
+    span = entries[-1]['t'] - entries[0]['t']
+
+    print("=" * 70)
+    print("⏪ BRIDGE TRAFFIC REPLAY")
+    print("=" * 70)
+    print(f"   {len(entries)} requests over {span:.1f}s captured, speed "
+          f"{'max' if args.speed <= 0 else f'{args.speed:g}x'}")
+
+    connection = BridgeConnection(command=shlex.split(args.bridge_command) if args.bridge_command else None)
+    try:
+        replayed, elapsed = Replayer(connection, args.concurrency, args.timeout).run(entries, speed=args.speed)
+    finally:
+        connection.close()
+    print(f"   Replayed in {elapsed:.1f}s")
+
+    comparison = compare(entries, replayed, score_tolerance=args.score_tolerance)
+    print_comparison(comparison)
+
+    write_report(
+        args.output, 'replay', [comparison], capture=args.capture, speed=args.speed,
+        requests=len(entries), captured_span=span, replay_time=elapsed
+    )
+    print(f"\n✅ Report saved to {args.output}")
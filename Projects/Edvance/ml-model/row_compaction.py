@@ -0,0 +1,78 @@
+"""
+Training Row Compaction
+load_kaggle_datasets.process_datasets derives every row of a dataset from one
+feature dict with small perturbations, so the training CSV repeats the same
+feature vectors many times (1230 rows, 336 unique vectors)
+Identical vectors are collapsed into one row carrying the row count and the
+mean / variance of health_score, and fit time then scales with the unique vectors
+Squared-error split gains and leaf values are weighted sums, so with the counts
+as sample_weight a deterministic tree fit (no bootstrap / subsample, leaf and
+split minimums of 1 or given as min_weight_fraction_leaf) matches the raw-row
+fit. Settings that count rows instead of weight do not: bootstrap, subsample,
+min_samples_leaf / min_samples_split and HistGradientBoosting's early-stopping
+split all see 336 rows instead of 1230, so predictions drift (up to ~0.2 on
+this data with the trainer's grids). Compaction is therefore opt-in (--dedup)
+"""
+
+import numpy as np
+
+
+def compact_rows(X, y):
+    """
+    Group identical feature vectors
+
+    Args:
+        X: array (n_rows, n_features)
+        y: targets (n_rows,)
+
+    Returns:
+        dict with
+            X: unique feature vectors (n_unique, n_features)
+            y: mean target per vector
+            sample_weight: rows per vector
+            y_var: target variance within each vector's rows
+            inverse: raw row -> unique row index
+    """
+    X = np.asarray(X)
+    y = np.asarray(y, dtype=float)
+
+    X_unique, first, inverse, counts = np.unique(
+        X, axis=0, return_index=True, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.reshape(-1)
+
+    # np.unique sorts lexicographically; keep first-appearance order instead so
+    # contiguous CV folds over the compacted rows stay as mixed as the raw rows
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    X_unique, counts, inverse = X_unique[order], counts[order], rank[inverse]
+
+    y_sum = np.bincount(inverse, weights=y, minlength=len(X_unique))
+    y_sq_sum = np.bincount(inverse, weights=y ** 2, minlength=len(X_unique))
+    y_mean = y_sum / counts
+    y_var = np.maximum(y_sq_sum / counts - y_mean ** 2, 0.0)
+
+    return {
+        'X': X_unique,
+        'y': y_mean,
+        'sample_weight': counts.astype(float),
+        'y_var': y_var,
+        'inverse': inverse
+    }
+
+
+def raw_r2(y_mean, predictions, sample_weight, y_var, y_raw_mean=None):
+    """
+    R² over the raw rows, from compacted rows only
+
+    Within-group variance is error no model on these features can explain, so it is
+    added to both the residual and the total sum of squares.
+    """
+    sample_weight = np.asarray(sample_weight, dtype=float)
+    if y_raw_mean is None:
+        y_raw_mean = np.average(y_mean, weights=sample_weight)
+    within = np.sum(sample_weight * y_var)
+    residual = np.sum(sample_weight * (y_mean - predictions) ** 2) + within
+    total = np.sum(sample_weight * (y_mean - y_raw_mean) ** 2) + within
+    return 1 - residual / total if total > 0 else 0.0
@@ -0,0 +1,95 @@
+"""
+Rubric-based Health Score (pure NumPy)
+Mirrors LessonPlanDataGenerator.calculate_health_score, which produced the labels
+the model is trained on, so it is a close stand-in while the model loads
+Vectorized over a feature matrix; deterministic (no label noise)
+"""
+
+import numpy as np
+
+from predict import HealthScorePredictor
+
+# (minimum count, points) tiers, highest first - see data_generator.calculate_health_score
+OBJECTIVE_TIERS = ((4, 1.5), (3, 1.2), (2, 0.8))
+MATERIAL_TIERS = ((3, 1.0), (2, 0.6))
+ACTIVITY_TIERS = ((4, 1.5), (3, 1.2), (2, 0.7))
+ASSESSMENT_TIERS = ((3, 1.5), (2, 1.0))
+
+BASE_SCORE = 5.0
+DIFFERENTIATION_POINTS = 1.0
+ENGAGEMENT_POINTS = 0.5
+COVERAGE_IN_RANGE_POINTS = 0.5
+COVERAGE_OUT_OF_RANGE_POINTS = 0.2
+
+
+def _tier_points(values, tiers):
+    """Points for the first tier whose threshold the value reaches"""
+    return np.select(
+        [values >= threshold for threshold, _ in tiers],
+        [points for _, points in tiers],
+        default=0.0
+    )
+
+
+def rubric_scores(feature_matrix, engaged=None):
+    """
+    Score lesson plans with the training-data rubric
+
+    Args:
+        feature_matrix: array (n_samples, 7) in HealthScorePredictor.feature_names order
+        engaged: optional bool array - plan has an engaging activity type
+            (group discussion, hands-on experiment, role play, project work).
+            The features do not carry activity types, so when unknown the
+            engagement bonus is credited at half its value.
+
+    Returns:
+        ndarray: scores clamped to 1-10, rounded to one decimal
+    """
+    X = np.asarray(feature_matrix, dtype=float)
+    if X.ndim == 1:
+        X = X[np.newaxis, :]
+
+    objectives, materials, activities, assessments, differentiation, duration, content_words = X.T
+
+    score = np.full(X.shape[0], BASE_SCORE)
+    score += _tier_points(objectives, OBJECTIVE_TIERS)
+    score += _tier_points(materials, MATERIAL_TIERS)
+    score += _tier_points(activities, ACTIVITY_TIERS)
+    score += _tier_points(assessments, ASSESSMENT_TIERS)
+    score += np.where(differentiation > 0, DIFFERENTIATION_POINTS, 0.0)
+
+    if engaged is None:
+        score += ENGAGEMENT_POINTS / 2
+    else:
+        score += np.where(np.asarray(engaged, dtype=bool), ENGAGEMENT_POINTS, 0.0)
+
+    # Content coverage - words per minute of lesson
+    complexity = content_words / np.maximum(1, duration)
+    in_range = (complexity >= 10) & (complexity <= 30)
+    score += np.where(in_range, COVERAGE_IN_RANGE_POINTS, COVERAGE_OUT_OF_RANGE_POINTS)
+
+    return np.clip(np.round(score, 1), 1, 10)
+
+
+class RubricPredictor(HealthScorePredictor):
+    """
+    Drop-in HealthScorePredictor that scores with the rubric instead of the model
+    Loads nothing from disk, so it is usable immediately at bridge startup
+    """
+
+    source = 'rubric'
+
+    def __init__(self):
+        self.model_path = None
+        self.scaler_path = None
+        self.model = None
+        self.scaler = None
+        self.cache = None
+        self.feature_names = list(HealthScorePredictor.FEATURE_NAMES)
+
+    def predict_features_batch(self, features_list):
+        feature_matrix = np.array(
+            [[features[name] for name in self.feature_names] for features in features_list],
+            dtype=float
+        ).reshape(-1, len(self.feature_names))
+        return [float(score) for score in rubric_scores(feature_matrix)]
@@ -0,0 +1,135 @@
+"""
+Checkpointed Hyperparameter Searches
+Every completed (candidate, fold) fit is appended to a JSONL checkpoint as
+soon as it finishes. A resumed run replays those results instead of fitting
+again; searches are deterministic given their fit results, so rungs, pruning
+and the best candidate are rebuilt exactly where the interrupted run left off
+"""
+
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+from artifact_cache import task_key
+
+
+class SearchCheckpoint:
+    """Append-only JSONL log of completed fit results, keyed by task fingerprint"""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = {}
+        self.resumed = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume and os.path.exists(path):
+            self.completed = self._load(path)
+            self._drop_torn_line(path)
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    @staticmethod
+    def _drop_torn_line(path):
+        """Cut a last line left without its newline, so new entries are not appended to it"""
+        with open(path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - (1 << 16))
+                f.seek(start)
+                block = f.read(position - start)
+                if position == end and block.endswith(b'\n'):
+                    return
+                newline = block.rfind(b'\n')
+                if newline >= 0:
+                    f.truncate(start + newline + 1)
+                    return
+                position = start
+            f.truncate(0)
+
+    @staticmethod
+    def _load(path):
+        completed = {}
+        with open(path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be cut short by the interruption
+                    print(f"⚠️  Skipping unreadable checkpoint line {line_number}", file=sys.stderr)
+                    continue
+                entry['predictions'] = np.asarray(entry['predictions'], dtype=float)
+                completed[entry.pop('key')] = entry
+        return completed
+
+    def get(self, key):
+        entry = self.completed.get(key)
+        if entry is not None:
+            self.resumed += 1
+        return entry
+
+    def record(self, key, label, params, result):
+        line = json.dumps({
+            'key': key,
+            'family': label,
+            'params': params,
+            'score': result['score'],
+            'fit_time': result['fit_time'],
+            'cpu_time': result['cpu_time'],
+            'worker': result.get('worker'),
+            'predictions': np.asarray(result['predictions'], dtype=float).tolist()
+        }, default=str)
+        with self._lock:
+            self.completed[key] = result
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class CheckpointRunner:
+    """Wrap a search runner so completed fits are logged and replayed on resume"""
+
+    def __init__(self, runner, checkpoint, data_key):
+        self.runner = runner
+        self.checkpoint = checkpoint
+        self.data_key = data_key
+
+    def run_tasks(self, estimator, tasks, deadline=None, label=None, on_result=None):
+        keys = [task_key(self.data_key, estimator, *task) for task in tasks]
+        results = [self.checkpoint.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        if on_result is not None:
+            for i, result in enumerate(results):
+                if result is not None:
+                    on_result(i, result)
+
+        def record(position, result):
+            i = missing[position]
+            if not result.get('error'):
+                self.checkpoint.record(keys[i], label, tasks[i][0], result)
+            if on_result is not None:
+                on_result(i, result)
+
+        if missing:
+            fitted = self.runner.run_tasks(
+                estimator, [tasks[i] for i in missing], deadline=deadline, label=label,
+                on_result=record
+            )
+            for i, result in zip(missing, fitted):
+                results[i] = result
+
+        return results
+
+    def refit(self, estimator, params, label=None):
+        return self.runner.refit(estimator, params, label=label)
@@ -0,0 +1,189 @@
+"""
+Out-of-core Training from Chunked CSV Streams
+The training CSV is read in fixed-size chunks, so peak memory depends on the
+chunk size, not on the dataset size:
+- Pass 1 estimates robust scaling statistics (median / IQR) from a fixed-size
+  reservoir sample, plus column means for missing values
+- Later passes fit an MLPRegressor with mini-batch partial_fit, one chunk at a time
+- Every holdout_every-th row is held out; metrics are accumulated per chunk
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.neural_network import MLPRegressor
+from sklearn.preprocessing import RobustScaler
+
+
+def iter_csv_chunks(path, feature_columns, target_column='health_score', chunk_rows=100_000):
+    """
+    Yield (row offset, raw feature frame, target array) chunks of a training CSV
+    Non-numeric values become NaN; nothing beyond one chunk is held in memory
+    """
+    offset = 0
+    for chunk in pd.read_csv(path, usecols=list(feature_columns) + [target_column],
+                             chunksize=chunk_rows):
+        X = chunk[list(feature_columns)].apply(pd.to_numeric, errors='coerce')
+        y = pd.to_numeric(chunk[target_column], errors='coerce').to_numpy(dtype=float)
+        yield offset, X, y
+        offset += len(chunk)
+
+
+class StreamingRobustStats:
+    """One-pass column means and approximate median / IQR from a reservoir sample"""
+
+    def __init__(self, n_features, reservoir_size=100_000, seed=42):
+        self.reservoir = np.empty((reservoir_size, n_features))
+        self.reservoir_size = reservoir_size
+        self.n_seen = 0
+        self.sums = np.zeros(n_features)
+        self.counts = np.zeros(n_features)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, X):
+        X = np.asarray(X, dtype=float)
+        present = ~np.isnan(X)
+        self.sums += np.where(present, X, 0.0).sum(axis=0)
+        self.counts += present.sum(axis=0)
+
+        # Fill the reservoir first, then replace slots with probability size / rows seen
+        fill = min(len(X), max(0, self.reservoir_size - self.n_seen))
+        self.reservoir[self.n_seen:self.n_seen + fill] = X[:fill]
+        rest = X[fill:]
+        if len(rest):
+            seen = self.n_seen + fill + np.arange(len(rest))
+            slots = (self._rng.random(len(rest)) * (seen + 1)).astype(np.int64)
+            keep = slots < self.reservoir_size
+            self.reservoir[slots[keep]] = rest[keep]
+        self.n_seen += len(X)
+
+    @property
+    def means(self):
+        return np.divide(self.sums, self.counts, out=np.zeros_like(self.sums), where=self.counts > 0)
+
+    def sample(self):
+        """Reservoir rows with missing values filled by the column means"""
+        sample = self.reservoir[:min(self.n_seen, self.reservoir_size)]
+        return np.where(np.isnan(sample), self.means, sample)
+
+    def scaler(self):
+        """A fitted RobustScaler using the approximate median and IQR"""
+        sample = self.sample()
+        q25, median, q75 = np.percentile(sample, [25, 50, 75], axis=0)
+        iqr = q75 - q25
+        scaler = RobustScaler()
+        scaler.center_ = median
+        scaler.scale_ = np.where(iqr > 0, iqr, 1.0)  # Same zero-IQR handling as RobustScaler
+        scaler.n_features_in_ = sample.shape[1]
+        return scaler
+
+
+class StreamingMetrics:
+    """Regression metrics accumulated chunk by chunk"""
+
+    def __init__(self):
+        self.n = 0
+        self.sum_sq_error = 0.0
+        self.sum_abs_error = 0.0
+        self.sum_abs_pct_error = 0.0
+        self.sum_y = 0.0
+        self.sum_y_sq = 0.0
+
+    def update(self, y_true, y_pred):
+        error = y_true - y_pred
+        self.n += len(y_true)
+        self.sum_sq_error += float(np.sum(error ** 2))
+        self.sum_abs_error += float(np.sum(np.abs(error)))
+        self.sum_abs_pct_error += float(np.sum(np.abs(error) / np.maximum(np.abs(y_true), 1e-12)))
+        self.sum_y += float(np.sum(y_true))
+        self.sum_y_sq += float(np.sum(y_true ** 2))
+
+    def result(self):
+        if self.n == 0:
+            return {}
+        mse = self.sum_sq_error / self.n
+        total = self.sum_y_sq - self.sum_y ** 2 / self.n
+        return {
+            'mse': mse,
+            'rmse': float(np.sqrt(mse)),
+            'mae': self.sum_abs_error / self.n,
+            'r2': 1 - self.sum_sq_error / total if total > 0 else 0.0,
+            'mape': self.sum_abs_pct_error / self.n,
+            'holdout_rows': self.n
+        }
+
+
+class StreamingTrainer:
+    """Fit scaler + MLPRegressor on a CSV of any size in constant memory"""
+
+    def __init__(self, data_path, feature_columns, chunk_rows=100_000, epochs=3,
+                 reservoir_size=100_000, hidden_layer_sizes=(64, 32), holdout_every=5,
+                 random_state=42, verbose=1):
+        self.data_path = data_path
+        self.feature_columns = list(feature_columns)
+        self.chunk_rows = chunk_rows
+        self.epochs = epochs
+        self.reservoir_size = reservoir_size
+        self.hidden_layer_sizes = hidden_layer_sizes
+        self.holdout_every = holdout_every
+        self.random_state = random_state
+        self.verbose = verbose
+
+        self.scaler = None
+        self.model = None
+        self.metrics = {}
+        self.n_rows = 0
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    def _chunks(self):
+        return iter_csv_chunks(self.data_path, self.feature_columns, chunk_rows=self.chunk_rows)
+
+    def _prepare(self, offset, X, y, means):
+        """Fill, scale and split one chunk into (train X, train y, holdout X, holdout y)"""
+        X = X.to_numpy(dtype=float)
+        X = np.where(np.isnan(X), means, X)
+        labeled = ~np.isnan(y)
+        X_scaled = self.scaler.transform(X)
+
+        holdout = np.zeros(len(y), dtype=bool)
+        if self.holdout_every:
+            holdout = (offset + np.arange(len(y))) % self.holdout_every == 0
+        train = labeled & ~holdout
+        test = labeled & holdout
+        return X_scaled[train], y[train], X_scaled[test], y[test]
+
+    def fit(self):
+        # Pass 1: scaling statistics
+        stats = StreamingRobustStats(len(self.feature_columns), self.reservoir_size, self.random_state)
+        for _, X, _ in self._chunks():
+            stats.update(X.to_numpy(dtype=float))
+        if stats.n_seen == 0:
+            raise ValueError(f"No rows in {self.data_path}")
+        self.n_rows = stats.n_seen
+        self.scaler = stats.scaler()
+        means = stats.means
+        self._log(f"✅ Pass 1: {self.n_rows} rows, robust scaling from a {len(stats.sample())}-row reservoir")
+
+        # Passes 2..: mini-batch partial fits
+        self.model = MLPRegressor(
+            hidden_layer_sizes=self.hidden_layer_sizes, random_state=self.random_state
+        )
+        rng = np.random.default_rng(self.random_state)
+        for epoch in range(self.epochs):
+            for offset, X, y in self._chunks():
+                X_train, y_train, _, _ = self._prepare(offset, X, y, means)
+                if len(y_train):
+                    order = rng.permutation(len(y_train))  # Shuffle within the chunk
+                    self.model.partial_fit(X_train[order], y_train[order])
+            self._log(f"   epoch {epoch + 1}/{self.epochs}: loss {self.model.loss_:.4f}")
+
+        # Final pass: holdout metrics
+        metrics = StreamingMetrics()
+        for offset, X, y in self._chunks():
+            _, _, X_test, y_test = self._prepare(offset, X, y, means)
+            if len(y_test):
+                metrics.update(y_test, np.clip(self.model.predict(X_test), 1, 10))
+        self.metrics = metrics.result()
+        return self
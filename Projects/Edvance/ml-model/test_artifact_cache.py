@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""Test content-addressed artifact cache keys, cache hits on an unchanged retrain and LRU eviction"""
+
+import os
+import tempfile
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from artifact_cache import ArtifactCache, CachingRunner, data_key, task_key
+from hyperparameter_search import GridSearch, SequentialRunner, cv_folds
+
+print("=" * 70)
+print("Testing Training Artifact Cache")
+print("=" * 70)
+
+rng = np.random.default_rng(0)
+X = rng.uniform(0, 10, size=(240, 3))
+y = X[:, 0] + rng.normal(0, 0.5, len(X))
+features = ['a', 'b', 'c']
+folds = cv_folds(len(X), 3)
+param_grid = {'max_depth': [2, 4, 6]}
+
+
+class CountingRunner(SequentialRunner):
+    """SequentialRunner that counts the fits that actually reach it"""
+
+    def __init__(self, X, y):
+        super().__init__(X, y)
+        self.fits = 0
+        self.refits = 0
+
+    def run_tasks(self, estimator, tasks, deadline=None, label=None, on_result=None):
+        self.fits += len(tasks)
+        return super().run_tasks(estimator, tasks, deadline, label, on_result)
+
+    def refit(self, estimator, params, label=None):
+        self.refits += 1
+        return super().refit(estimator, params, label)
+
+
+print("\nTest 1: Keys change with exactly the inputs that change a fit")
+try:
+    key = data_key(X, y, features)
+    estimator = DecisionTreeRegressor(random_state=42)
+    base = task_key(key, estimator, {'max_depth': 3}, *folds[0])
+    assert base == task_key(data_key(X.copy(), y.copy(), list(features)), estimator, {'max_depth': 3}, *folds[0])
+    y_changed = y.copy()
+    y_changed[0] += 1
+    changed = {
+        'data': task_key(data_key(X, y_changed, features), estimator, {'max_depth': 3}, *folds[0]),
+        'features': task_key(data_key(X, y, ['a', 'b', 'd']), estimator, {'max_depth': 3}, *folds[0]),
+        'weights': task_key(data_key(X, y, features, np.ones(len(y))), estimator, {'max_depth': 3}, *folds[0]),
+        'params': task_key(key, estimator, {'max_depth': 4}, *folds[0]),
+        'fold': task_key(key, estimator, {'max_depth': 3}, *folds[1]),
+        'estimator': task_key(key, DecisionTreeRegressor(random_state=7), {'max_depth': 3}, *folds[0])
+    }
+    same = [name for name, value in changed.items() if value == base]
+    assert not same, f'Key unchanged when {same} changed'
+    forest = RandomForestRegressor(n_estimators=5, random_state=42)
+    assert task_key(key, forest, {'n_jobs': 1}, *folds[0]) == task_key(key, forest, {'n_jobs': 4}, *folds[0])
+    print(f"  PASS - {len(changed)} input changes give new keys, n_jobs does not")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: An unchanged retrain loads every fit and the refit from the cache")
+try:
+    cache_root = tempfile.mkdtemp(prefix='artifact_cache_test_')
+    key = data_key(X, y, features)
+
+    first = CountingRunner(X, y)
+    search = GridSearch(DecisionTreeRegressor(random_state=42), param_grid, folds=folds, verbose=0)
+    search.fit(X, y, runner=CachingRunner(first, ArtifactCache(cache_root), key))
+    assert first.fits == 9 and first.refits == 1
+
+    second = CountingRunner(X, y)
+    cache = ArtifactCache(cache_root)
+    again = GridSearch(DecisionTreeRegressor(random_state=42), param_grid, folds=folds, verbose=0)
+    again.fit(X, y, runner=CachingRunner(second, cache, key))
+    assert second.fits == 0 and second.refits == 0, f'{second.fits} fits, {second.refits} refits re-run'
+    assert cache.stats['hits'] == 10, cache.stats
+    assert again.best_params_ == search.best_params_ and again.best_score_ == search.best_score_
+    assert np.array_equal(again.best_estimator_.predict(X), search.best_estimator_.predict(X))
+    print(f"  PASS - Second run: 0 fits, {cache.stats['hits']} cache hits, same best {again.best_params_}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: Only the new candidate is fitted when the grid grows")
+try:
+    third = CountingRunner(X, y)
+    grown = GridSearch(
+        DecisionTreeRegressor(random_state=42), {'max_depth': [2, 4, 6, 8]}, folds=folds, verbose=0
+    )
+    grown.fit(X, y, runner=CachingRunner(third, ArtifactCache(cache_root), key))
+    assert third.fits == 3, f'{third.fits} fits'
+    print("  PASS - 3 fits for the one new candidate, 9 reused")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 4: Past max_bytes the least recently used artifacts are evicted")
+try:
+    root = tempfile.mkdtemp(prefix='artifact_cache_lru_')
+    payload = np.zeros(10_000)  # ~80 KB per artifact
+    cache = ArtifactCache(root, max_bytes=None)
+    keys = [f"{i:02d}" + 'f' * 62 for i in range(8)]
+    for i, key in enumerate(keys):
+        cache.put(key, payload)
+        os.utime(cache._path(key), (1_000_000 + i, 1_000_000 + i))  # Written in key order
+    artifact_size = os.path.getsize(cache._path(keys[0]))
+
+    cache = ArtifactCache(root, max_bytes=8 * artifact_size)
+    assert cache.get(keys[0]) is not None  # Oldest write, but used just now
+    cache.put('new' + 'f' * 61, payload)
+    kept = [os.path.exists(cache._path(key)) for key in keys]
+    assert kept[0], 'Recently read artifact was evicted'
+    assert kept[1:3] == [False, False] and all(kept[3:]), f'Kept {kept}'
+    assert cache.stats['evicted'] == 2 and cache._size <= 0.9 * cache.max_bytes
+    assert ArtifactCache(root, max_bytes=None).prune(max_bytes=0) == 7
+    print(f"  PASS - Evicted the 2 oldest unread artifacts, kept the one read just now")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL ARTIFACT CACHE TESTS PASSED!")
+print("=" * 70)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Test columnar cache dtypes across chunks and exact round trips of the CSV values"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from columnar_cache import build_columnar_cache, load_columnar_cache
+
+print("=" * 70)
+print("Testing Compact Columnar Cache")
+print("=" * 70)
+
+csv_path = os.path.join(tempfile.mkdtemp(prefix='columnar_cache_test_'), 'training_data.csv')
+n = 3000
+rng = np.random.default_rng(0)
+df = pd.DataFrame({
+    'num_objectives': rng.integers(1, 8, n),
+    'late_text': [str(i % 5) for i in range(n - 10)] + ['other'] * 10,  # Numeric until the last chunk
+    'many_categories': [f"c{i}" for i in range(n)],
+    'big_with_gaps': [2 ** 40 + i if i % 7 else np.nan for i in range(n)],
+    'precise': rng.normal(0, 1, n),
+    'health_score': np.round(rng.uniform(1, 10, n), 1)
+})
+df.to_csv(csv_path, index=False)
+expected = pd.read_csv(csv_path, dtype=str)
+
+
+def same_values(cached, column):
+    text = expected[column]
+    if isinstance(cached.dtype, pd.CategoricalDtype):
+        return cached.astype(object).where(cached.notna(), None).tolist() == text.where(text.notna(), None).tolist()
+    values = np.asarray(cached, dtype=float)
+    if cached.dtype == np.float32:
+        values = np.asarray(cached).astype(str).astype(float)  # float32 reads back at the CSV's decimals
+    reference = pd.to_numeric(text).to_numpy(dtype=float)
+    return bool(np.all((values == reference) | (np.isnan(values) & np.isnan(reference))))
+
+
+print("\nTest 1: Dtypes are chosen from every chunk, not the first")
+try:
+    manifest = build_columnar_cache(csv_path, chunk_rows=500)
+    dtypes = {column['name']: np.dtype(column['dtype']) for column in manifest['columns']}
+    assert dtypes['num_objectives'] == np.uint8
+    assert dtypes['late_text'] == np.uint8
+    late = next(column for column in manifest['columns'] if column['name'] == 'late_text')
+    assert sorted(late['categories']) == ['0', '1', '2', '3', '4', 'other'], late['categories']
+    assert dtypes['many_categories'] == np.uint16
+    assert dtypes['big_with_gaps'] == np.float64, 'Integers above 2**24 would lose digits in float32'
+    assert dtypes['precise'] == np.float64
+    assert dtypes['health_score'] == np.float32
+    print(f"  PASS - {', '.join(f'{name}: {dtype}' for name, dtype in dtypes.items())}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: Every column loads back to the values in the CSV")
+try:
+    cached = load_columnar_cache(csv_path)
+    assert cached is not None and len(cached) == n
+    wrong = [column for column in expected.columns if not same_values(cached[column], column)]
+    assert not wrong, f'Values changed in {wrong}'
+    print(f"  PASS - {len(expected.columns)} columns x {n} rows identical")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: The cache is ignored once the CSV changes")
+try:
+    time_ns = os.stat(csv_path).st_mtime_ns + 10 ** 9
+    with open(csv_path, 'a') as f:
+        f.write('1,1,c,1,0.5,5.0\n')
+    os.utime(csv_path, ns=(time_ns, time_ns))
+    assert load_columnar_cache(csv_path) is None
+    print("  PASS - Stale cache not used")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL COLUMNAR CACHE TESTS PASSED!")
+print("=" * 70)
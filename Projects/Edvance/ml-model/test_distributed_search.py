@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Test the file-queue coordinator: queue workers, requeue of dead workers, failures and no-worker timeout"""
+
+import math
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+
+from distributed_search import QueueCoordinator, WorkQueue, run_worker
+from hyperparameter_search import GridSearch, cv_folds
+
+print("=" * 70)
+print("Testing Distributed Search Work Queue")
+print("=" * 70)
+
+rng = np.random.default_rng(0)
+X = rng.uniform(0, 10, size=(300, 3))
+y = X[:, 0] * 2 + rng.normal(0, 0.5, len(X))
+folds = cv_folds(len(X), 3)
+param_grid = {'max_depth': [2, 4, 6]}
+workdir = tempfile.mkdtemp(prefix='work_queue_test_')
+
+
+def start_worker(queue_dir, worker_id, before=None):
+    """In-process queue worker thread; exits once the queue has been idle for 2s"""
+    def work():
+        if before is not None:
+            before()
+        run_worker(queue_dir, worker_id=worker_id, idle_exit=2.0, poll_interval=0.02,
+                   heartbeat_interval=0.1)
+
+    thread = threading.Thread(target=work, name=worker_id, daemon=True)
+    thread.start()
+    return thread
+
+
+print("\nTest 1: A search on a spawned queue worker matches the in-process search")
+try:
+    local = GridSearch(DecisionTreeRegressor(random_state=42), param_grid, folds=folds, verbose=0).fit(X, y)
+    queued = GridSearch(DecisionTreeRegressor(random_state=42), param_grid, folds=folds, verbose=0)
+    coordinator = QueueCoordinator(os.path.join(workdir, 'spawned'), spawn_workers=1)
+    try:
+        coordinator.start(X, y)
+        queued.fit(X, y, runner=coordinator)
+    finally:
+        coordinator.shutdown()
+    assert queued.best_params_ == local.best_params_ and queued.best_score_ == local.best_score_
+    assert np.array_equal(queued.best_estimator_.predict(X), local.best_estimator_.predict(X))
+    nodes = coordinator.report()['nodes']
+    assert sum(node['tasks'] for node in nodes.values()) == 9 + 1, nodes
+    print(f"  PASS - Same best {queued.best_params_} (R² {queued.best_score_:.4f}) from {list(nodes)}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: Tasks of a worker that stops heartbeating are requeued")
+try:
+    queue_dir = os.path.join(workdir, 'requeue')
+    queue = WorkQueue(queue_dir)
+
+    def ghost_claims_one_task():
+        # Claim a task, beat once and go silent - like a crashed machine
+        while queue.claim('ghost') is None:
+            time.sleep(0.01)
+        queue.heartbeat('ghost', {'worker': 'ghost', 'beat': 1})
+
+    coordinator = QueueCoordinator(queue_dir, worker_timeout=0.5, poll_interval=0.02)
+    coordinator.start(X, y)
+    worker = start_worker(queue_dir, 'helper', before=ghost_claims_one_task)
+    tasks = [({'max_depth': 3}, *fold) for fold in folds]
+    results = coordinator.run_tasks(DecisionTreeRegressor(random_state=42), tasks, label='tree')
+    coordinator.shutdown()
+    worker.join()
+    report = coordinator.report()
+    assert all(result is not None and not result.get('error') for result in results), results
+    assert report['retries'] == 1, f"{report['retries']} retries"
+    assert report['nodes']['ghost']['failures'] == 1 and report['nodes']['helper']['tasks'] == 3
+    print("  PASS - The ghost's task was requeued once and finished by the live worker")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: A fit that keeps raising is retried, then scored NaN")
+try:
+    queue_dir = os.path.join(workdir, 'failing')
+    coordinator = QueueCoordinator(queue_dir, max_retries=1, poll_interval=0.02)
+    coordinator.start(X, y)
+    worker = start_worker(queue_dir, 'worker')
+    tasks = [({'max_depth': 3}, *folds[0]), ({'max_depth': -1}, *folds[0])]
+    results = coordinator.run_tasks(DecisionTreeRegressor(random_state=42), tasks, label='tree')
+    coordinator.shutdown()
+    worker.join()
+    assert results[0]['score'] > 0.5
+    assert math.isnan(results[1]['score']) and 'max_depth' in results[1]['error'], results[1]
+    assert coordinator.report()['nodes']['worker']['failures'] == 2
+    print(f"  PASS - Failed twice, then scored NaN ({results[1]['error'][:50]}...)")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 4: With no live worker the run fails instead of hanging")
+try:
+    queue_dir = os.path.join(workdir, 'no_workers')
+    WorkQueue(queue_dir).heartbeat('stale', {'worker': 'stale', 'beat': 7})  # Left by a stopped worker
+    coordinator = QueueCoordinator(queue_dir, no_worker_timeout=1.0, poll_interval=0.02)
+    coordinator.start(X, y)
+    started = time.perf_counter()
+    try:
+        coordinator.run_tasks(DecisionTreeRegressor(), [({'max_depth': 3}, *folds[0])], label='tree')
+        raise AssertionError('run_tasks returned without workers')
+    except RuntimeError as e:
+        assert 'No live queue workers' in str(e), str(e)
+    waited = time.perf_counter() - started
+    coordinator.shutdown()
+    assert waited < 5, f'Waited {waited:.1f}s'
+    assert not os.listdir(os.path.join(queue_dir, 'pending')), 'Unclaimed task left in the queue'
+    print(f"  PASS - Gave up after {waited:.1f}s and withdrew the unclaimed task")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL DISTRIBUTED SEARCH TESTS PASSED!")
+print("=" * 70)
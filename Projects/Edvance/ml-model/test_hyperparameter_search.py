@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""Test successive-halving pruning and its time-budget cut-off"""
+
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+
+from hyperparameter_search import GridSearch, SequentialRunner, SuccessiveHalvingSearch
+
+print("=" * 70)
+print("Testing Successive-Halving Search")
+print("=" * 70)
+
+rng = np.random.default_rng(0)
+X = rng.uniform(0, 10, size=(900, 4))
+y = np.sin(X[:, 0]) * 3 + X[:, 1] + rng.normal(0, 0.3, len(X))
+param_grid = {'max_depth': [1, 2, 3, 4, 6, 8, 10, 12, 14], 'min_samples_leaf': [1, 5, 20]}
+n_candidates = 27
+
+
+class CutShortRunner(SequentialRunner):
+    """Runs the first complete_calls rungs fully, then only keep_tasks tasks (as if the budget ran out)"""
+
+    def __init__(self, X, y, complete_calls=1, keep_tasks=3):
+        super().__init__(X, y)
+        self.complete_calls = complete_calls
+        self.keep_tasks = keep_tasks
+        self.calls = 0
+
+    def run_tasks(self, estimator, tasks, deadline=None, label=None, on_result=None):
+        self.calls += 1
+        if self.calls <= self.complete_calls:
+            return super().run_tasks(estimator, tasks, deadline, label, on_result)
+        results = super().run_tasks(estimator, tasks[:self.keep_tasks], deadline, label, on_result)
+        return results + [None] * (len(tasks) - len(results))
+
+
+print("\nTest 1: Each rung keeps 1/factor of the candidates")
+try:
+    search = SuccessiveHalvingSearch(
+        DecisionTreeRegressor(random_state=42), param_grid, cv=3, factor=3,
+        min_resources=20, time_budget=1e6, verbose=0
+    ).fit(X, y)
+    kept = [len(entry['kept']) for entry in search.pruning_log]
+    assert kept == [9, 3, 1], f'Survivors per rung: {kept}'
+    assert all(
+        len(entry['kept']) + len(entry['pruned']) == previous
+        for entry, previous in zip(search.pruning_log, [n_candidates] + kept)
+    )
+    resources = [entry['n_resources'] for entry in search.pruning_log]
+    assert resources == sorted(resources) and resources[0] < resources[-1]
+    assert search.n_fits_ == (27 + 9 + 3 + 1) * 3, f'{search.n_fits_} fits'
+    assert search.full_fit_equivalents_ < n_candidates * 3
+    print(f"  PASS - {kept} survivors, {search.n_fits_} fits, "
+          f"{search.full_fit_equivalents_:.0f} full-fit equivalents vs {n_candidates * 3} exhaustive")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: Pruning keeps a candidate close to the exhaustive grid's best")
+try:
+    grid = GridSearch(DecisionTreeRegressor(random_state=42), param_grid, cv=3, verbose=0).fit(X, y)
+    best_in_grid = {
+        tuple(sorted(entry['params'].items())): entry['mean_test_score'] for entry in grid.cv_results_
+    }
+    halving_choice = best_in_grid[tuple(sorted(search.best_params_.items()))]
+    assert halving_choice >= grid.best_score_ - 0.02, f'{halving_choice:.4f} vs {grid.best_score_:.4f}'
+    print(f"  PASS - Halving pick scores {halving_choice:.4f} on full folds, grid best {grid.best_score_:.4f}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: A budget cut mid-rung keeps the last complete rung's winner")
+try:
+    search = SuccessiveHalvingSearch(
+        DecisionTreeRegressor(random_state=42), param_grid, cv=3, factor=3,
+        min_resources=20, time_budget=1e6, verbose=0
+    )
+    search.fit(X, y, runner=CutShortRunner(X, y, complete_calls=1, keep_tasks=3))
+    assert search.budget_exhausted_
+    rung0 = [entry for entry in search.cv_results_ if entry['rung'] == 0]
+    rung0_best = max(rung0, key=lambda entry: entry['mean_test_score'])
+    assert len(rung0) == n_candidates
+    assert search.best_params_ == rung0_best['params'], \
+        f"{search.best_params_} != rung 0 winner {rung0_best['params']}"
+    assert search.best_score_ == rung0_best['mean_test_score']
+    print(f"  PASS - Winner {search.best_params_} taken from rung 0, not the 1 partial rung-1 candidate")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 4: A budget cut in rung 0 ranks its partial scores")
+try:
+    search = SuccessiveHalvingSearch(
+        DecisionTreeRegressor(random_state=42), param_grid, cv=3, factor=3,
+        min_resources=20, time_budget=1e6, verbose=0
+    )
+    search.fit(X, y, runner=CutShortRunner(X, y, complete_calls=0, keep_tasks=6))
+    scored = [entry for entry in search.cv_results_ if entry['rung'] == 0]
+    assert len(scored) == 2, f'{len(scored)} candidates scored'
+    assert search.best_params_ == max(scored, key=lambda entry: entry['mean_test_score'])['params']
+    print(f"  PASS - Winner picked among the {len(scored)} candidates rung 0 finished")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL SUCCESSIVE-HALVING TESTS PASSED!")
+print("=" * 70)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Test the PSI drift gate that decides between a warm-start update and a full retrain"""
+
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+
+from incremental_training import (
+    MAX_NEW_FRACTION, PSI_THRESHOLD, detect_drift, population_stability_index, supports_incremental,
+    update_model
+)
+
+print("=" * 70)
+print("Testing Incremental Retraining Drift Gate")
+print("=" * 70)
+
+rng = np.random.default_rng(0)
+features = ['num_objectives', 'duration', 'content_words']
+
+
+def sample(n, duration_mean=45.0):
+    X = np.column_stack([
+        rng.integers(1, 8, n),
+        rng.normal(duration_mean, 10, n),
+        rng.normal(300, 80, n)
+    ]).astype(float)
+    y = np.clip(1 + X[:, 0] + (X[:, 2] - 300) / 100 + rng.normal(0, 0.3, n), 1, 10)
+    return X, y
+
+
+X_reference, y_reference = sample(4000)
+model = RandomForestRegressor(n_estimators=30, max_depth=6, random_state=42).fit(X_reference, y_reference)
+reference_rmse = float(np.sqrt(np.mean((model.predict(X_reference) - y_reference) ** 2)))
+
+print("\nTest 1: PSI is near zero for the same distribution and large for a shifted one")
+try:
+    same = population_stability_index(X_reference[:, 1], sample(500)[0][:, 1])
+    shifted = population_stability_index(X_reference[:, 1], sample(500, duration_mean=70.0)[0][:, 1])
+    constant = population_stability_index(np.zeros(100), np.ones(100))
+    assert same < 0.1, f'PSI {same:.3f} for an unchanged distribution'
+    assert shifted > PSI_THRESHOLD, f'PSI {shifted:.3f} for a shifted distribution'
+    assert constant > PSI_THRESHOLD, f'PSI {constant:.3f} for a moved constant feature'
+    print(f"  PASS - PSI {same:.3f} unchanged, {shifted:.3f} shifted, {constant:.3f} moved constant")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: New rows from the same distribution pass the gate")
+try:
+    X_new, y_new = sample(300)
+    decision = detect_drift(model, X_reference, X_new, y_new, features, reference_rmse)
+    assert not decision['retrain'], decision['reasons']
+    assert set(decision['psi']) == set(features)
+    print(f"  PASS - Incremental update allowed (max PSI {max(decision['psi'].values()):.3f})")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: A shifted feature forces a full retrain")
+try:
+    X_new, y_new = sample(300, duration_mean=70.0)
+    decision = detect_drift(model, X_reference, X_new, y_new, features, reference_rmse)
+    assert decision['retrain']
+    assert any('duration' in reason and 'PSI' in reason for reason in decision['reasons']), decision['reasons']
+    assert 'num_objectives' not in ' '.join(decision['reasons'])
+    print(f"  PASS - {decision['reasons'][0]}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 4: Stale predictions and too many new rows force a full retrain")
+try:
+    X_new, y_new = sample(300)
+    decision = detect_drift(model, X_reference, X_new, np.clip(11 - y_new, 1, 10), features, reference_rmse)
+    assert decision['retrain'] and any('error on new rows' in reason for reason in decision['reasons'])
+    X_many, y_many = sample(int(len(X_reference) * MAX_NEW_FRACTION) + 1)
+    decision = detect_drift(model, X_reference, X_many, y_many, features, reference_rmse)
+    assert decision['retrain'] and any('new rows exceed' in reason for reason in decision['reasons'])
+    print("  PASS - Error ratio and new-row share both trigger a retrain")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 5: An allowed update keeps the forest size and fits the new rows")
+try:
+    X_new, y_new = sample(300)
+    before = np.sqrt(np.mean((model.predict(X_new) - y_new) ** 2))
+    updated, info = update_model(model, X_new, y_new, len(X_new), len(X_reference))
+    assert len(updated.estimators_) == 30, f'{len(updated.estimators_)} trees'
+    assert info['trees_replaced'] == 10
+    after = np.sqrt(np.mean((updated.predict(X_new) - y_new) ** 2))
+    assert after <= before, f'RMSE on new rows rose from {before:.3f} to {after:.3f}'
+    print(f"  PASS - Replaced {info['trees_replaced']} trees, RMSE on new rows {before:.3f} -> {after:.3f}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 6: Histogram boosting gets new stages despite early stopping")
+try:
+    hist = HistGradientBoostingRegressor(
+        max_iter=500, early_stopping=True, validation_fraction=0.1, n_iter_no_change=20, random_state=42
+    ).fit(X_reference, y_reference)
+    assert supports_incremental(hist)
+    n_iter = hist.n_iter_
+    X_new, y_new = sample(1000)
+    y_new = y_new + 0.5  # Labels shifted since training: the new stages have residuals to learn
+    before = np.sqrt(np.mean((hist.predict(X_new[800:]) - y_new[800:]) ** 2))
+    updated, info = update_model(hist, X_new[:800], y_new[:800], 800, len(X_reference))
+    assert info['stages_added'] == max(5, round(n_iter * 800 / (len(X_reference) + 800)))
+    assert updated.n_iter_ == n_iter + info['stages_added'], f'{n_iter} -> {updated.n_iter_} iterations'
+    assert updated.get_params()['early_stopping'] and not updated.get_params()['warm_start']
+    after = np.sqrt(np.mean((updated.predict(X_new[800:]) - y_new[800:]) ** 2))
+    assert after < before, f'RMSE on held-out new rows rose from {before:.3f} to {after:.3f}'
+    print(f"  PASS - {n_iter} -> {updated.n_iter_} iterations, held-out RMSE {before:.3f} -> {after:.3f}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL INCREMENTAL TRAINING TESTS PASSED!")
+print("=" * 70)
@@ -81,6 +81,17 @@ except Exception as e:
     print(f"  FAIL - {e}")
     exit(1)
 
+print("\nTest 8: Vectorized Batch Matches Single Predictions")
+try:
+    results = predictor.predict_batch_with_reasoning(lessons)
+    singles = [predictor.predict_with_reasoning(plan) for plan in lessons]
+    assert [r['score'] for r in results] == [r['score'] for r in singles], 'Batch scores differ'
+    assert [r['features'] for r in results] == [r['features'] for r in singles], 'Batch features differ'
+    print(f"  PASS - Vectorized batch matches {len(results)} single predictions")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
 print("\n" + "="*70)
 print("ALL LOCAL TESTS PASSED!")
 print("="*70)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""Test vectorized metrics and the paired bootstrap against plain per-resample sklearn metrics"""
+
+import numpy as np
+from sklearn.metrics import (
+    mean_absolute_error, mean_absolute_percentage_error, mean_squared_error, r2_score
+)
+
+from model_evaluation import (
+    bootstrap_indices, bootstrap_metrics, evaluate_predictions, point_metrics, predictions_matrix
+)
+
+print("=" * 70)
+print("Testing Vectorized Evaluation and Paired Bootstrap")
+print("=" * 70)
+
+rng = np.random.default_rng(0)
+y = rng.uniform(1, 10, 400)
+good = y + rng.normal(0, 0.5, len(y))
+predictions = {
+    'good': good,
+    'close': good + rng.normal(0, 0.2, len(y)),  # Errors correlated with 'good', like rival models
+    'poor': y + rng.normal(0, 2.0, len(y))
+}
+names, P = predictions_matrix(predictions)
+
+
+def sklearn_metrics(y_true, y_pred):
+    return {
+        'r2': r2_score(y_true, y_pred),
+        'rmse': np.sqrt(mean_squared_error(y_true, y_pred)),
+        'mae': mean_absolute_error(y_true, y_pred),
+        'mape': mean_absolute_percentage_error(y_true, y_pred)
+    }
+
+
+print("\nTest 1: Point metrics match sklearn")
+try:
+    point = point_metrics(y, P)
+    for i, name in enumerate(names):
+        expected = sklearn_metrics(y, P[:, i])
+        for metric, value in expected.items():
+            assert abs(point[metric][i] - value) < 1e-9, f'{name} {metric}: {point[metric][i]} != {value}'
+    print(f"  PASS - {len(names)} models x 4 metrics agree to 1e-9")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: Bootstrap metrics equal sklearn on the same resamples, in any chunk size")
+try:
+    samples = bootstrap_metrics(y, P, n_resamples=50, random_state=7)
+    indices = bootstrap_indices(len(y), 50, np.random.default_rng(7))
+    for r in range(50):
+        for i in range(len(names)):
+            expected = sklearn_metrics(y[indices[r]], P[indices[r], i])
+            for metric, value in expected.items():
+                assert abs(samples[metric][r, i] - value) < 1e-9, f'resample {r} {metric}'
+    chunked = bootstrap_metrics(y, P, n_resamples=50, random_state=7, chunk_elements=len(y) * 3)
+    assert all(np.allclose(chunked[metric], samples[metric]) for metric in samples)
+    print("  PASS - 50 resamples x 3 models match sklearn, chunking does not change them")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: Paired comparisons share resamples")
+try:
+    result = evaluate_predictions(y, {**predictions, 'copy': predictions['good']}, n_resamples=2000)
+    assert result['reference'] == 'good'
+    copy = result['comparisons']['copy']
+    assert copy['r2_delta'] == 0 and copy['r2_delta_ci'] == [0.0, 0.0], copy
+    poor = result['comparisons']['poor']
+    assert poor['r2_delta_ci'][1] < 0 and poor['p_better'] == 0.0, poor
+    close = result['comparisons']['close']
+    # Drawing each model's resamples independently leaves row-to-row noise in the delta
+    unpaired = (
+        bootstrap_metrics(y, predictions['close'], 2000, random_state=1)['r2'][:, 0]
+        - bootstrap_metrics(y, predictions['good'], 2000, random_state=2)['r2'][:, 0]
+    )
+    unpaired_width = float(np.diff(np.percentile(unpaired, [2.5, 97.5]))[0])
+    paired_width = close['r2_delta_ci'][1] - close['r2_delta_ci'][0]
+    assert paired_width < unpaired_width / 2, f'{paired_width:.4f} vs {unpaired_width:.4f}'
+    for metric in ('r2', 'rmse', 'mae', 'mape'):
+        low, high = result['metrics']['good'][f'{metric}_ci']
+        assert low <= result['metrics']['good'][metric] <= high, metric
+    print(f"  PASS - Identical model delta CI [0, 0], poor model p_better 0, "
+          f"paired CI width {paired_width:.4f} vs unpaired {unpaired_width:.4f}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL MODEL EVALUATION TESTS PASSED!")
+print("=" * 70)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Test the persistent SQLite prediction cache across restarts and model versions, and its reasoning reuse"""
+
+import os
+import tempfile
+
+from prediction_cache import PredictionCache
+
+print("=" * 70)
+print("Testing Persistent Prediction Cache")
+print("=" * 70)
+
+workdir = tempfile.mkdtemp(prefix='prediction_cache_test_')
+path = os.path.join(workdir, 'predictions.sqlite')
+features = {'num_objectives': 3, 'num_activities': 4, 'content_words': 250}
+
+print("\nTest 1: Cached scores hit after a restart")
+try:
+    cache = PredictionCache(path, model_version='v1')
+    assert cache.get(features) is None
+    cache.put(features, 7.5, ['Clear objectives'])
+    cache.close()
+
+    cache = PredictionCache(path, model_version='v1')
+    entry = cache.get(features)
+    assert entry is not None, 'Entry was lost on restart'
+    assert entry['score'] == 7.5 and entry['reasoning'] == ['Clear objectives']
+    assert cache.stats['hits'] == 1
+    # Key order does not matter - the key is built from canonical JSON
+    assert cache.get(dict(reversed(list(features.items())))) is not None
+    cache.close()
+    print("  PASS - Reopened cache returned the stored score and reasoning")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: A new model version invalidates old entries")
+try:
+    cache = PredictionCache(path, model_version='v2')
+    assert cache.get(features) is None, 'Served a score from another model version'
+    assert len(cache) == 0, f'{len(cache)} stale rows left on disk'
+    cache.close()
+    print("  PASS - v1 entries were dropped when v2 opened the cache")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: Eviction drops the least recently used entries")
+try:
+    cache = PredictionCache(path, model_version='v3', max_entries=3, memory_entries=1)
+    rows = [{'num_objectives': i} for i in range(4)]
+    for i, row in enumerate(rows[:3]):
+        cache.put(row, float(i), [])
+        cache.flush()
+    cache._memory.clear()  # Force reads to go to disk
+    assert cache.get(rows[0]) is not None
+    cache.flush()  # last_used of rows[0] refreshed
+    cache.put(rows[3], 3.0, [])
+    cache.flush()
+    cache._memory.clear()
+    kept = [cache.get(row) is not None for row in rows]
+    assert kept == [True, False, True, True], f'Kept {kept}'
+    assert cache.stats['evicted'] == 1
+    cache.close()
+    print("  PASS - The entry read most recently survived, the oldest untouched one was evicted")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 4: Reasoning is built only when asked for, then served from the cache")
+try:
+    from predict import HealthScorePredictor
+
+    predictor = HealthScorePredictor(cache_path=os.path.join(workdir, 'predictor.sqlite'))
+    built = []
+    generate_reasoning = predictor._generate_reasoning
+    predictor._generate_reasoning = lambda score, row: built.append(row) or generate_reasoning(score, row)
+    rows = [dict(predictor.extract_features({}), num_objectives=i) for i in range(1, 4)]
+
+    scores = predictor.predict_features_batch(rows)
+    assert not built, f'Reasoning built for {len(built)} score-only predictions'
+    assert all(predictor.cache.get(row)['reasoning'] is None for row in rows)
+    first = predictor.predict_features_with_reasoning(rows[0])
+    assert len(built) == 1 and first['score'] == scores[0] and first['reasoning']
+    again = predictor.predict_features_with_reasoning(rows[0])
+    assert len(built) == 1 and again['reasoning'] == first['reasoning'], 'Cached reasoning was rebuilt'
+    predictor.cache.close()
+    print("  PASS - Scoring built no reasoning; it was built once and then read from the cache")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL PREDICTION CACHE TESTS PASSED!")
+print("=" * 70)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Test training row compaction (--dedup) against fitting on the raw rows"""
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import r2_score
+from sklearn.tree import DecisionTreeRegressor
+
+from row_compaction import compact_rows, raw_r2
+from train_model import FEATURE_COLUMNS
+
+print("=" * 70)
+print("Testing Training Row Compaction")
+print("=" * 70)
+
+df = pd.read_csv('data/training_data.csv')
+X = df[FEATURE_COLUMNS].to_numpy(dtype=float)
+y = df['health_score'].to_numpy(dtype=float)
+compacted = compact_rows(X, y)
+print(f"   {len(y)} rows -> {len(compacted['y'])} unique vectors")
+
+print("\nTest 1: Compacted rows reconstruct the raw rows")
+try:
+    assert np.array_equal(compacted['X'][compacted['inverse']], X)
+    assert compacted['sample_weight'].sum() == len(y)
+    group_means = pd.Series(y).groupby(compacted['inverse']).mean().to_numpy()
+    assert np.allclose(compacted['y'], group_means)
+    print("  PASS - Every raw row maps to its vector, weights sum to the row count")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: raw_r2 equals R² computed on the raw rows")
+try:
+    rng = np.random.default_rng(0)
+    unique_predictions = compacted['y'] + rng.normal(0, 0.3, len(compacted['y']))
+    expected = r2_score(y, unique_predictions[compacted['inverse']])
+    actual = raw_r2(compacted['y'], unique_predictions, compacted['sample_weight'], compacted['y_var'])
+    assert abs(expected - actual) < 1e-9, f'{actual} != {expected}'
+    print(f"  PASS - R² {actual:.6f} from {len(compacted['y'])} rows")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: Weight-aware fits predict the same as raw-row fits")
+try:
+    models = {
+        'DecisionTree': lambda: DecisionTreeRegressor(max_depth=8, random_state=42),
+        'GradientBoosting': lambda: GradientBoostingRegressor(
+            n_estimators=50, max_depth=3, subsample=1.0, random_state=42
+        )
+    }
+    for name, make in models.items():
+        raw = make().fit(X, y).predict(X)
+        weighted = make().fit(
+            compacted['X'], compacted['y'], sample_weight=compacted['sample_weight']
+        ).predict(X)
+        diff = np.max(np.abs(raw - weighted))
+        assert diff < 1e-6, f'{name} predictions differ by {diff}'
+        print(f"  PASS - {name}: max difference {diff:.2e}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL ROW COMPACTION TESTS PASSED!")
+print("=" * 70)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""Test deadline-aware priority scheduling for the persistent bridge"""
+
+from bridge_scheduler import RequestScheduler, QueueFullError
+
+print("=" * 70)
+print("Testing Bridge Request Scheduler")
+print("=" * 70)
+
+print("\nTest 1: Interactive requests jump ahead of bulk ones")
+try:
+    scheduler = RequestScheduler(max_depth=10)
+    scheduler.submit({'id': 1, 'priority': 'bulk'})
+    scheduler.submit({'id': 2, 'priority': 'bulk'})
+    scheduler.submit({'id': 3, 'priority': 'interactive'})
+    scheduler.submit({'id': 4})
+    scheduler.close()
+    order = []
+    while True:
+        entry = scheduler.next()
+        if entry is None:
+            break
+        order.append(entry.request_id)
+    assert order == [3, 4, 1, 2], f'Unexpected order: {order}'
+    print(f"  PASS - Served in order {order}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: Queue depth limit rejects with busy")
+try:
+    scheduler = RequestScheduler(max_depth=2)
+    scheduler.submit({'id': 1})
+    scheduler.submit({'id': 2})
+    try:
+        scheduler.submit({'id': 3})
+        raise AssertionError('Third request was accepted')
+    except QueueFullError:
+        pass
+    assert scheduler.stats['rejected_busy'] == 1
+    print("  PASS - Overflow rejected")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: Cancelled requests are skipped and free queue space")
+try:
+    scheduler = RequestScheduler(max_depth=2)
+    scheduler.submit({'id': 1})
+    scheduler.submit({'id': 2})
+    assert scheduler.cancel(1) is not None
+    assert scheduler.cancel(99) is None
+    scheduler.submit({'id': 3})
+    scheduler.close()
+    served = [scheduler.next().request_id, scheduler.next().request_id]
+    assert served == [2, 3], f'Unexpected requests served: {served}'
+    assert scheduler.next() is None
+    print("  PASS - Cancelled request never served")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 4: Expired deadlines are flagged")
+try:
+    scheduler = RequestScheduler()
+    scheduler.submit({'id': 1, 'deadline_ms': 0})
+    scheduler.submit({'id': 2, 'deadline_ms': 60000})
+    first, second = scheduler.next(), scheduler.next()
+    assert first.expired() and not second.expired()
+    assert scheduler.stats['expired'] == 1
+    print("  PASS - Expired request detected before processing")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 5: Malformed deadlines and ids are rejected as invalid")
+try:
+    scheduler = RequestScheduler()
+    for bad in ({'id': 1, 'deadline': [1]}, {'id': 2, 'deadline_ms': {'ms': 5}},
+                {'id': 3, 'deadline_ms': 'soon'}, {'id': 4, 'priority': ['bulk']}, {'id': [5]}):
+        try:
+            scheduler.submit(bad)
+            raise AssertionError(f'Accepted {bad}')
+        except ValueError:
+            pass
+    assert len(scheduler) == 0
+    print("  PASS - ValueError for every malformed request")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 6: Duplicate ids of pending or running requests are rejected")
+try:
+    scheduler = RequestScheduler()
+    scheduler.submit({'id': 1})
+    try:
+        scheduler.submit({'id': 1})
+        raise AssertionError('Duplicate queued id accepted')
+    except ValueError:
+        pass
+    running = scheduler.next()
+    try:
+        scheduler.submit({'id': 1})
+        raise AssertionError('Duplicate running id accepted')
+    except ValueError:
+        pass
+    scheduler.finish(running)
+    scheduler.submit({'id': 1})
+    print("  PASS - Id reusable only once the first request finished")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 7: Expired requests stop counting toward the queue depth")
+try:
+    scheduler = RequestScheduler(max_depth=2)
+    scheduler.submit({'id': 1, 'deadline_ms': 0})
+    scheduler.submit({'id': 2, 'deadline_ms': 0})
+    scheduler.submit({'id': 3})
+    scheduler.submit({'id': 4})
+    assert len(scheduler) == 2
+    served = []
+    scheduler.close()
+    while True:
+        entry = scheduler.next()
+        if entry is None:
+            break
+        served.append((entry.request_id, entry.expired()))
+    assert served == [(1, True), (2, True), (3, False), (4, False)], f'Unexpected: {served}'
+    print("  PASS - Expired requests purged at capacity and still fast-failed")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL SCHEDULER TESTS PASSED!")
+print("=" * 70)
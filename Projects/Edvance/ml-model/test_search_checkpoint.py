@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""Test that a resumed search skips the fits its interrupted run already finished"""
+
+import os
+import tempfile
+
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+
+from artifact_cache import data_key
+from hyperparameter_search import SequentialRunner, SuccessiveHalvingSearch, cv_folds
+from search_checkpoint import CheckpointRunner, SearchCheckpoint
+
+print("=" * 70)
+print("Testing Checkpointed Search Resume")
+print("=" * 70)
+
+rng = np.random.default_rng(0)
+X = rng.uniform(0, 10, size=(600, 3))
+y = np.sin(X[:, 0]) * 3 + X[:, 1] + rng.normal(0, 0.3, len(X))
+key = data_key(X, y, ['a', 'b', 'c'])
+folds = cv_folds(len(X), 3)
+param_grid = {'max_depth': [1, 2, 3, 4, 6, 8, 10, 12, 14]}
+checkpoint_path = os.path.join(tempfile.mkdtemp(prefix='checkpoint_test_'), 'search.jsonl')
+
+
+class InterruptingRunner(SequentialRunner):
+    """Counts fits and raises KeyboardInterrupt after interrupt_after of them"""
+
+    def __init__(self, X, y, interrupt_after=None):
+        super().__init__(X, y)
+        self.interrupt_after = interrupt_after
+        self.fits = 0
+
+    def run_tasks(self, estimator, tasks, deadline=None, label=None, on_result=None):
+        def counted(position, result):
+            self.fits += 1
+            on_result(position, result)
+            if self.interrupt_after is not None and self.fits >= self.interrupt_after:
+                raise KeyboardInterrupt
+
+        return super().run_tasks(estimator, tasks, deadline, label, counted)
+
+
+def make_search():
+    return SuccessiveHalvingSearch(
+        DecisionTreeRegressor(random_state=42), param_grid, folds=folds, factor=3,
+        min_resources=20, time_budget=1e6, verbose=0
+    )
+
+
+reference = make_search().fit(X, y)
+total_fits = reference.n_fits_
+
+print("\nTest 1: Every finished fit is on disk when the run is interrupted")
+try:
+    runner = InterruptingRunner(X, y, interrupt_after=20)
+    checkpoint = SearchCheckpoint(checkpoint_path)
+    try:
+        make_search().fit(X, y, runner=CheckpointRunner(runner, checkpoint, key))
+        raise AssertionError('Search was not interrupted')
+    except KeyboardInterrupt:
+        pass
+    finally:
+        checkpoint.close()
+    with open(checkpoint_path) as f:
+        lines = f.readlines()
+    assert len(lines) == 20, f'{len(lines)} fits checkpointed'
+    print(f"  PASS - Interrupted after 20 of {total_fits} fits, 20 checkpointed")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: Resume fits only what is left and picks the same winner")
+try:
+    with open(checkpoint_path, 'a') as f:
+        f.write('{"key": "cut sho')  # A line torn by the interruption
+    runner = InterruptingRunner(X, y)
+    checkpoint = SearchCheckpoint(checkpoint_path, resume=True)
+    resumed = make_search().fit(X, y, runner=CheckpointRunner(runner, checkpoint, key))
+    checkpoint.close()
+    assert checkpoint.resumed == 20, f'{checkpoint.resumed} fits replayed'
+    assert runner.fits == total_fits - 20, f'{runner.fits} fits re-run, expected {total_fits - 20}'
+    assert resumed.best_params_ == reference.best_params_
+    assert resumed.best_score_ == reference.best_score_
+    assert [entry['kept'] for entry in resumed.pruning_log] == [entry['kept'] for entry in reference.pruning_log]
+    print(f"  PASS - {checkpoint.resumed} fits replayed, {runner.fits} fitted, "
+          f"same winner {resumed.best_params_}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: Resuming a finished search fits nothing")
+try:
+    runner = InterruptingRunner(X, y)
+    checkpoint = SearchCheckpoint(checkpoint_path, resume=True)
+    make_search().fit(X, y, runner=CheckpointRunner(runner, checkpoint, key))
+    checkpoint.close()
+    assert runner.fits == 0, f'{runner.fits} fits re-run'
+    print(f"  PASS - All {checkpoint.resumed} fits replayed from the checkpoint")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL SEARCH CHECKPOINT TESTS PASSED!")
+print("=" * 70)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""Test session-held plans and incremental re-scoring from JSON patches"""
+
+from predict import HealthScorePredictor
+from plan_sessions import PlanSessionStore, PatchError, SessionNotFoundError, apply_patch
+
+print("=" * 70)
+print("Testing Incremental Re-scoring Sessions")
+print("=" * 70)
+
+predictor = HealthScorePredictor()
+
+lesson = {
+    'duration': 60,
+    'objectives': ['Obj1', 'Obj2'],
+    'materials': ['Mat1'],
+    'activities': ['Act1', 'Act2'],
+    'assessments': ['Test1'],
+    'differentiation': [],
+    'content': {'sections': ['Intro paragraph']}
+}
+
+print("\nTest 1: Patch application")
+try:
+    patched, touched = apply_patch(lesson, [
+        {'op': 'add', 'path': '/materials/-', 'value': 'Projector'},
+        {'op': 'replace', 'path': '/duration', 'value': 90}
+    ])
+    assert patched['materials'] == ['Mat1', 'Projector'], patched['materials']
+    assert lesson['materials'] == ['Mat1'], 'Original plan was mutated'
+    assert touched == {'materials', 'duration'}, touched
+    print(f"  PASS - Touched fields: {sorted(touched)}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 2: Invalid patches are rejected atomically")
+try:
+    try:
+        apply_patch(lesson, [
+            {'op': 'add', 'path': '/materials/-', 'value': 'Projector'},
+            {'op': 'test', 'path': '/duration', 'value': 45}
+        ])
+        raise AssertionError('Failed test op did not raise')
+    except PatchError:
+        pass
+    assert lesson['materials'] == ['Mat1'], 'Failed patch leaked into plan'
+    print("  PASS - Failed test op rejected the whole patch")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 3: Session scores match full re-scoring")
+try:
+    store = PlanSessionStore(predictor)
+    opened = store.open('s1', lesson)
+    assert opened['score'] == predictor.predict(lesson)
+
+    result = store.patch('s1', [
+        {'op': 'add', 'path': '/materials/-', 'value': 'Projector'},
+        {'op': 'add', 'path': '/materials/-', 'value': 'Lab kit'},
+        {'op': 'add', 'path': '/content/sections/-', 'value': 'Appended paragraph ' * 150}
+    ])
+    assert result['recomputed'] == ['num_materials', 'content_words'], result['recomputed']
+
+    full_plan, _ = apply_patch(lesson, [
+        {'op': 'add', 'path': '/materials/-', 'value': 'Projector'},
+        {'op': 'add', 'path': '/materials/-', 'value': 'Lab kit'},
+        {'op': 'add', 'path': '/content/sections/-', 'value': 'Appended paragraph ' * 150}
+    ])
+    assert result['features'] == predictor.extract_features(full_plan)
+    assert result['score'] == predictor.predict(full_plan)
+    print(f"  PASS - Patched score {result['score']}/10 matches full re-score")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\nTest 4: Eviction under caps")
+try:
+    store = PlanSessionStore(predictor, max_sessions=2)
+    for session_id in ('a', 'b', 'c'):
+        store.open(session_id, lesson)
+    assert len(store) == 2 and 'a' not in store, 'Oldest session not evicted'
+
+    try:
+        store.patch('a', [])
+        raise AssertionError('Evicted session still patchable')
+    except SessionNotFoundError:
+        pass
+
+    store = PlanSessionStore(predictor, idle_timeout=0)
+    store.open('a', lesson)
+    store.open('b', lesson)
+    assert 'a' not in store and 'b' in store, 'Idle session not evicted'
+    print(f"  PASS - Session stats: {store.stats()}")
+except Exception as e:
+    print(f"  FAIL - {e}")
+    exit(1)
+
+print("\n" + "=" * 70)
+print("ALL SESSION TESTS PASSED!")
+print("=" * 70)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Test that fits raising in scheduler workers are scored NaN instead of aborting the search"""
+
+import math
+
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+
+from hyperparameter_search import GridSearch, cv_folds
+from training_scheduler import TrainingScheduler
+
+
+def main():
+    print("=" * 70)
+    print("Testing Training Scheduler Failure Handling")
+    print("=" * 70)
+
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 10, size=(300, 3))
+    y = X[:, 0] * 2 + rng.normal(0, 0.5, len(X))
+    folds = cv_folds(len(X), 3)
+
+    print("\nTest 1: A raising fit comes back as a NaN-scored result")
+    try:
+        with TrainingScheduler(n_workers=2) as scheduler:
+            scheduler.start(X, y)
+            tasks = [({'max_depth': 3}, *folds[0]), ({'max_depth': -1}, *folds[0])]
+            results = scheduler.run_tasks(DecisionTreeRegressor(), tasks, label='tree')
+        assert results[0]['score'] > 0.5 and not results[0].get('error')
+        assert math.isnan(results[1]['score']), f"Score {results[1]['score']}"
+        assert 'max_depth' in results[1]['error']
+        print(f"  PASS - Failed fit reported as NaN ({results[1]['error'][:60]}...)")
+    except Exception as e:
+        print(f"  FAIL - {e}")
+        exit(1)
+
+    print("\nTest 2: Failed candidates are excluded from the ranking")
+    try:
+        search = GridSearch(
+            DecisionTreeRegressor(random_state=42), {'max_depth': [-1, 2, 4, -5]},
+            folds=folds, verbose=0
+        )
+        with TrainingScheduler(n_workers=2) as scheduler:
+            scheduler.start(X, y)
+            scheduler.run_families({'tree': search})
+        failed = [entry['params']['max_depth'] for entry in search.failed_candidates_]
+        assert sorted(failed) == [-5, -1], f'Failed candidates: {failed}'
+        assert search.best_params_['max_depth'] in (2, 4)
+        assert not math.isnan(search.best_score_)
+        nan_rows = [entry for entry in search.cv_results_ if math.isnan(entry['mean_test_score'])]
+        assert len(nan_rows) == 2 and all('error' in entry for entry in nan_rows)
+        assert search.n_fits_ == 2 * len(folds), f'{search.n_fits_} fits counted'
+        print(f"  PASS - Best {search.best_params_} (R² {search.best_score_:.4f}), "
+              f"{len(failed)} failed candidates recorded as NaN")
+    except Exception as e:
+        print(f"  FAIL - {e}")
+        exit(1)
+
+    print("\nTest 3: A family whose candidates all fail does not abort the others")
+    try:
+        good = GridSearch(DecisionTreeRegressor(random_state=42), {'max_depth': [3]}, folds=folds, verbose=0)
+        bad = GridSearch(DecisionTreeRegressor(random_state=42), {'max_depth': [-1]}, folds=folds, verbose=0)
+        with TrainingScheduler(n_workers=2) as scheduler:
+            scheduler.start(X, y)
+            try:
+                scheduler.run_families({'good': good, 'bad': bad})
+                raise AssertionError('All-failed family was not reported')
+            except RuntimeError as e:
+                assert 'bad' in str(e) and 'All 1 candidates failed' in str(e), str(e)
+        assert good.best_estimator_ is not None, 'The healthy family was not fitted'
+        print("  PASS - 'bad' reported as all-failed, 'good' still fitted")
+    except Exception as e:
+        print(f"  FAIL - {e}")
+        exit(1)
+
+    print("\n" + "=" * 70)
+    print("ALL TRAINING SCHEDULER TESTS PASSED!")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Bridge Traffic Capture
+Appends every bridge request (with its arrival time) and every final response
+(score / error / status, with its send time) to a rotating JSONL file
+Lesson plan text never reaches the file: each string is stored as its
+character and word counts, which is all the features and the request sizes
+depend on, so a replay rebuilds plans that score and weigh the same
+Non-string content is stored as the shape of the text predict.extract_feature
+counts (json.dumps of a dict, str() of anything else) and replays as one
+string, since JSON escaping changes the word count of the individual values
+The bridge threads only enqueue a reference; anonymizing, encoding and
+writing happen on a background writer thread. When the writer falls behind,
+records are dropped and counted rather than slowing the bridge down
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+# Request fields copied verbatim; every other string becomes {"$s": [chars, words]}
+PROTOCOL_FIELDS = frozenset({
+    'cmd', 'id', 'session', 'priority', 'deadline_ms', 'deadline', 'chunk_size', 'reasoning'
+})
+# JSON patch operation fields (the values being patched in are still anonymized)
+PATCH_FIELDS = frozenset({'op', 'path', 'from'})
+_FILLER = 'lorem'
+
+
+def _shape(text):
+    return {'$s': [len(text), len(text.split())]}
+
+
+def _content_shape(content):
+    """Shape of the text content_words is computed from (see predict.extract_feature)"""
+    return _shape(json.dumps(content) if isinstance(content, dict) else str(content))
+
+
+def anonymize(value, keep=PROTOCOL_FIELDS):
+    """
+    Replace strings with their shape; lists, dicts and numbers keep their structure
+
+    Args:
+        keep: keys of this dict level copied verbatim (nested plan fields never are)
+    """
+    if isinstance(value, str):
+        if value.strip().replace('.', '', 1).isdigit():
+            return value  # Numbers sent as text (e.g. "45" minutes) are not content
+        return _shape(value)
+    if isinstance(value, dict):
+        anonymized = {}
+        for key, item in value.items():
+            if key in keep:
+                anonymized[key] = item
+            elif key == 'content' and not isinstance(item, str):
+                anonymized[key] = _content_shape(item)
+            elif key == 'value' and value.get('path') == '/content' and not isinstance(item, str):
+                anonymized[key] = _content_shape(item)  # Patch replacing a plan's content
+            else:
+                anonymized[key] = anonymize(item, PATCH_FIELDS if key == 'patch' else frozenset())
+        return anonymized
+    if isinstance(value, (list, tuple)):
+        return [anonymize(item, keep) for item in value]
+    return value
+
+
+def _filler_text(chars, words):
+    """A string with the given number of words and about the given length"""
+    if words <= 0:
+        return ' ' * chars if chars else ''
+    word_length = max(1, (chars - (words - 1)) // words)
+    word = (_FILLER * (word_length // len(_FILLER) + 1))[:word_length]
+    return ' '.join([word] * words)
+
+
+def restore(value):
+    """Inverse of anonymize: same structure, filler text of the recorded shape"""
+    if isinstance(value, dict):
+        if set(value) == {'$s'}:
+            return _filler_text(*value['$s'])
+        return {k: restore(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [restore(item) for item in value]
+    return value
+
+
+def _response_record(message):
+    result = message.get('result') if isinstance(message.get('result'), dict) else {}
+    return {
+        'id': message.get('id'),
+        'type': message.get('type'),
+        'status': message.get('status'),
+        'error': bool(message.get('error')),
+        'score': result.get('score', result.get('mean_score')),
+        'source': result.get('source')
+    }
+
+
+class TrafficCapture:
+    """
+    Background writer for request / response records
+
+    Files: path, then path.1 ... path.<backups> (oldest last), rotated at max_bytes
+    """
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024, backups=5, max_pending=10000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.stats = {'requests': 0, 'responses': 0, 'dropped': 0}
+        self._queue = queue.Queue(maxsize=max_pending)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._writer = threading.Thread(target=self._write_loop, name='traffic-capture', daemon=True)
+        self._writer.start()
+
+    def _enqueue(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def record_request(self, request):
+        """Called on the reader thread as each request line is parsed"""
+        self._enqueue(('request', time.time(), request))
+
+    def record_response(self, message):
+        """Called as each response line is written; chunk frames of a batch are skipped"""
+        if message.get('type') != 'chunk':
+            self._enqueue(('response', time.time(), message))
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            kind, timestamp, payload = item
+            try:
+                if kind == 'request':
+                    record = {'kind': 'request', 't': timestamp, 'request': anonymize(payload)}
+                    self.stats['requests'] += 1
+                else:
+                    record = {'kind': 'response', 't': timestamp, **_response_record(payload)}
+                    self.stats['responses'] += 1
+                self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+                if self._queue.empty():
+                    self._file.flush()
+                if self._file.tell() >= self.max_bytes:
+                    self._rotate()
+            except Exception as e:
+                print(f"⚠️  Traffic capture write error: {str(e)}", file=sys.stderr)
+
+    def close(self):
+        """Write everything queued so far, then close the file"""
+        self._queue.put(None)
+        self._writer.join(timeout=10)
+        self._file.close()
+
+
+def capture_files(path):
+    """Capture files of one capture, oldest first"""
+    rotated = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        rotated.append(f"{path}.{index}")
+        index += 1
+    return rotated[::-1] + ([path] if os.path.exists(path) else [])
+
+
+def read_capture(path):
+    """
+    Requests of a capture in arrival order, each paired with its recorded response
+
+    Returns:
+        list of dicts: t (arrival, epoch seconds), request (restored), response
+        (record or None) and latency (seconds, None if unanswered)
+    """
+    entries = []
+    waiting = {}  # request id -> indices of entries still waiting for a response
+    for file_path in capture_files(path):
+        with open(file_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Truncated last line of a live capture
+                if record['kind'] == 'request':
+                    request = restore(record['request'])
+                    entries.append({'t': record['t'], 'request': request, 'response': None, 'latency': None})
+                    if request.get('cmd') != 'cancel':
+                        waiting.setdefault(json.dumps(request.get('id')), []).append(len(entries) - 1)
+                else:
+                    pending = waiting.get(json.dumps(record.get('id')))
+                    if pending:
+                        entry = entries[pending.pop(0)]
+                        entry['response'] = record
+                        entry['latency'] = record['t'] - entry['t']
+    return entries
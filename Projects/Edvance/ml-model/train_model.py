@@ -6,25 +6,147 @@ Includes hyperparameter tuning, ensemble methods, and comprehensive error handli
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV, KFold
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, VotingRegressor, AdaBoostRegressor
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, VotingRegressor, AdaBoostRegressor, HistGradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler, RobustScaler
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error, mean_absolute_percentage_error
+from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.pipeline import Pipeline
 import joblib
+import copy
 import os
 import json
+import time
+import argparse
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from artifact_cache import ArtifactCache, CachingRunner, data_key, importance_key, model_key
+from columnar_cache import load_columnar_cache, write_columnar_cache
+from ensembles import StackedRegressor
+from model_evaluation import evaluate_predictions, point_metrics
+from model_selection import benchmark_rows, measure_inference, select_model
+from permutation_importance import permutation_importance
+from row_compaction import compact_rows, raw_r2
+import training_report as reports
+from training_report import importance_frame
+from incremental_training import detect_drift, supports_incremental, update_model
+from hyperparameter_search import GridSearch, SuccessiveHalvingSearch, cv_folds
+from streaming_training import StreamingTrainer
+from search_checkpoint import CheckpointRunner, SearchCheckpoint
+from training_scheduler import TrainingScheduler
+from distributed_search import QueueCoordinator
+
+# Hyperparameter grids searched for each model family
+PARAM_GRIDS = {
+    'RandomForest': {
+        'n_estimators': [100, 200, 300],
+        'max_depth': [10, 15, 20],
+        'min_samples_split': [2, 5, 10],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': ['sqrt', 'log2']
+    },
+    'GradientBoosting': {
+        'n_estimators': [100, 200],
+        'max_depth': [3, 5, 7],
+        'learning_rate': [0.01, 0.1, 0.2],
+        'min_samples_split': [2, 5],
+    },
+    'AdaBoost': {
+        'n_estimators': [100, 200],
+        'learning_rate': [0.5, 1.0, 1.5],
+    },
+    'HistGradientBoosting': {
+        'learning_rate': [0.05, 0.1, 0.2],
+        'max_leaf_nodes': [15, 31, 63],
+        'min_samples_leaf': [20, 40],
+        'l2_regularization': [0.0, 1.0],
+    }
+}
+
+SEARCH_MODES = ('grid', 'halving')
+
+FEATURE_COLUMNS = ['num_objectives', 'num_materials', 'num_activities',
+                   'num_assessments', 'has_differentiation', 'duration', 'content_words']
+
+
+def make_hist_gradient_boosting(**params):
+    """
+    Histogram-binned gradient boosting for large training sets
+    Inputs are binned once into uint8 codes (max_bins=255), so each split scans
+    255 bins instead of every row; boosting stops early when the loss on a 10%
+    validation split stops improving. Fits use OpenMP threads - one per worker
+    inside the TrainingScheduler, all cores when fitted on its own.
+    """
+    defaults = {
+        'max_iter': 500,
+        'max_bins': 255,
+        'early_stopping': True,
+        'validation_fraction': 0.1,
+        'n_iter_no_change': 20,
+        'random_state': 42
+    }
+    return HistGradientBoostingRegressor(**{**defaults, **params})
+
+
 class HealthScoreModelTrainer:
     """Train and evaluate health score prediction model with advanced techniques"""
     
-    def __init__(self, data_path='data/training_data.csv'):
+    def __init__(self, data_path='data/training_data.csv', search_mode='grid',
+                 time_budget=None, halving_factor=3, n_workers=None,
+                 cache_dir='models/.artifact_cache', cache_max_mb=2048,
+                 checkpoint_path='models/.checkpoints/search.jsonl', resume=False,
+                 deduplicate=False, max_p99_ms=None, max_size_mb=None, r2_tolerance=0.0,
+                 report_mode='background', bootstrap_resamples=10000, permutation_repeats=10,
+                 queue_dir=None, local_workers=0):
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"search_mode must be one of {SEARCH_MODES}, got {search_mode!r}")
+        
+        if time_budget is not None and search_mode == 'grid':
+            print("⚠️  time_budget only applies to the 'halving' search mode - ignoring it")
+            time_budget = None
+        
         self.data_path = data_path
+        self.search_mode = search_mode
+        self.time_budget = time_budget  # Seconds for all hyperparameter searches
+        self.halving_factor = halving_factor
+        self.n_workers = n_workers  # Global worker budget shared by all searches (None = all cores)
+        # Distributed search: publish fits to this shared queue directory instead of a local pool
+        self.queue_dir = queue_dir
+        self.local_workers = local_workers  # Queue workers to start on this machine
+        # Fitted candidates and refits keyed by content hash (None disables caching),
+        # least recently used artifacts evicted above cache_max_mb
+        self.artifact_cache = ArtifactCache(
+            cache_dir, max_bytes=int(cache_max_mb * 1024 ** 2) if cache_max_mb is not None else None
+        ) if cache_dir else None
+        self.checkpoint_path = checkpoint_path  # Completed (candidate, fold) fits, for --resume
+        self.resume = resume
+        self.search_logs = {}  # Per-family successive-halving pruning log
+        self.training_report = None  # Per-family wall time and core utilization
+        # Fit on unique feature vectors weighted by row count - faster, but not
+        # equivalent for row-counting settings (bootstrap, min_samples_leaf, ...)
+        self.deduplicate = deduplicate
+        # Model selection: best R² within these inference budgets (None = unlimited)
+        self.max_p99_ms = max_p99_ms
+        self.max_size_mb = max_size_mb
+        self.r2_tolerance = r2_tolerance  # R² gap treated as a tie, broken by latency
+        self.inference = {}  # Model name -> latency / size measurements
+        self.report_mode = report_mode  # Training plots: 'background', 'inline' or 'none'
+        self.selection = None
+        self.bootstrap_resamples = bootstrap_resamples  # Paired bootstrap resamples for metric CIs (0 = off)
+        self.evaluation = None  # Point metrics, CIs and paired R² comparisons of every model
+        self.permutation_repeats = permutation_repeats  # Shuffles per feature for permutation importance (0 = off)
+        self.permutation_importance = None
+        self.impurity_importance = None
+        self.folds = None  # Train/validation indices shared by every model family
+        self.X_fit = None  # Rows the searches fit on (unique vectors when deduplicating)
+        self.y_train = None
+        self.train_weights = None
+        self.train_y_var = None
+        self._raw_train_rows = None
+        self.oof_predictions = {}  # Model name -> out-of-fold predictions on the training set
+        self.n_rows = None  # Rows in the training CSV, recorded so later runs can find appended rows
+        self.use_columnar_cache = True  # Memory-map downcast .npy columns instead of re-parsing the CSV
         self.model = None
         self.models = {}  # Store multiple models
         self.scaler = RobustScaler()  # Better for outliers
@@ -39,23 +161,20 @@ class HealthScoreModelTrainer:
         if not os.path.exists(self.data_path):
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
         
-        df = pd.read_csv(self.data_path)
+        df = self._read_training_frame()
         
         # Show dataset sources
         if 'dataset' in df.columns:
             print(f"\n📊 Datasets included:")
             unique_datasets = df['dataset'].unique()
             for dataset in unique_datasets[:5]:
-                count = len(df[df['dataset'] == dataset])
+                count = int((df['dataset'] == dataset).sum())
                 print(f"   - {dataset}: {count} samples")
             if len(unique_datasets) > 5:
                 print(f"   ... and {len(unique_datasets) - 5} more datasets")
         
-        # Feature columns
-        feature_cols = ['num_objectives', 'num_materials', 'num_activities', 
-                       'num_assessments', 'has_differentiation', 'duration', 'content_words']
-        
-        X = df[feature_cols].copy()
+        self.n_rows = len(df)
+        X = df[FEATURE_COLUMNS].copy()
         y = df['health_score'].copy()
         
         # Handle missing values
@@ -76,6 +195,25 @@ class HealthScoreModelTrainer:
         
         return X, y
     
+    def _read_training_frame(self):
+        """Training rows from the columnar cache, (re)built from the CSV when stale"""
+        if not self.use_columnar_cache:
+            return pd.read_csv(self.data_path)
+        
+        df = load_columnar_cache(self.data_path)
+        if df is not None:
+            print(f"   Using columnar cache ({len(df)} rows, memory-mapped)")
+            return df
+        
+        df = pd.read_csv(self.data_path)
+        try:
+            write_columnar_cache(df, self.data_path)
+        except OSError as e:
+            print(f"⚠️  Could not write columnar cache: {str(e)}")
+            return df
+        # Read back so this run sees exactly the values later cached runs will
+        return load_columnar_cache(self.data_path)
+    
     def prepare_data(self, X, y, test_size=0.2, random_state=42):
         """Split data into train and test sets with stratification"""
         print(f"\n📊 Preparing data (test_size={test_size})...")
@@ -88,225 +226,422 @@ class HealthScoreModelTrainer:
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
+        # Compaction and cross-validation folds are computed once and reused by every search
+        self._training_set(X_train_scaled, y_train)
+        
         print(f"✅ Training set: {X_train.shape[0]} samples")
         print(f"✅ Test set: {X_test.shape[0]} samples")
         print(f"✅ Features scaled using RobustScaler")
         
         return X_train_scaled, X_test_scaled, y_train, y_test
     
-    def train_random_forest(self, X_train, y_train):
-        """Train optimized Random Forest model"""
-        print("\n🤖 Training Random Forest model...")
+    def _estimator(self, family):
+        """Untuned estimator for a model family"""
+        if family == 'RandomForest':
+            return RandomForestRegressor(random_state=42, n_jobs=-1)
+        if family == 'GradientBoosting':
+            return GradientBoostingRegressor(random_state=42, subsample=0.8)
+        if family == 'AdaBoost':
+            return AdaBoostRegressor(random_state=42)
+        if family == 'HistGradientBoosting':
+            return make_hist_gradient_boosting()
+        raise ValueError(f"Unknown model family: {family}")
+    
+    def _make_search(self, family, verbose=1):
+        """Configured hyperparameter search for one model family"""
+        estimator = self._estimator(family)
+        param_grid = PARAM_GRIDS[family]
+        
+        if self.search_mode == 'halving':
+            # Families run concurrently, so each gets the whole budget
+            return SuccessiveHalvingSearch(
+                estimator, param_grid, cv=3, factor=self.halving_factor,
+                time_budget=self.time_budget, verbose=verbose, name=family, folds=self.folds
+            )
+        return GridSearch(estimator, param_grid, verbose=verbose, name=family, folds=self.folds)
+    
+    def _training_set(self, X_train, y_train):
+        """Rows, targets and weights the searches fit on, plus their CV folds (computed once)"""
+        if self.folds is not None and self._raw_train_rows == len(y_train):
+            return self.X_fit, self.y_train, self.train_weights
+        
+        X_train = np.asarray(X_train)
+        y_train = np.asarray(y_train, dtype=float)
+        self._raw_train_rows = len(y_train)
+        
+        if self.deduplicate:
+            compacted = compact_rows(X_train, y_train)
+            self.X_fit = compacted['X']
+            self.y_train = compacted['y']
+            self.train_weights = compacted['sample_weight']
+            self.train_y_var = compacted['y_var']
+            print(f"✅ Compacted {len(y_train)} training rows into {len(self.y_train)} unique feature vectors")
+        else:
+            self.X_fit, self.y_train = X_train, y_train
+            self.train_weights = self.train_y_var = None
+        
+        self.folds = cv_folds(len(self.y_train), n_splits=3)
+        return self.X_fit, self.y_train, self.train_weights
+    
+    def _train_families(self, families, X_train, y_train):
+        """Search several model families concurrently on one shared worker pool"""
+        X_train, y_train, weights = self._training_set(X_train, y_train)
         
-        # GridSearch for best parameters
-        param_grid = {
-            'n_estimators': [100, 200, 300],
-            'max_depth': [10, 15, 20],
-            'min_samples_split': [2, 5, 10],
-            'min_samples_leaf': [1, 2, 4],
-            'max_features': ['sqrt', 'log2']
+        searches = {
+            family: self._make_search(family, verbose=0 if family == 'AdaBoost' else 1)
+            for family in families
         }
         
-        rf = RandomForestRegressor(random_state=42, n_jobs=-1)
-        
-        # Quick grid search with limited iterations
-        search = GridSearchCV(
-            rf, param_grid, cv=3, n_jobs=-1, verbose=1,
-            scoring='r2'
+        key = data_key(X_train, y_train, FEATURE_COLUMNS, weights)
+        checkpoint = None
+        if self.checkpoint_path:
+            checkpoint = SearchCheckpoint(self.checkpoint_path, resume=self.resume)
+            if self.resume:
+                print(f"♻️  Resuming: {len(checkpoint.completed)} completed fits in {self.checkpoint_path}")
+            # Later searches in this run append to the same checkpoint
+            self.resume = True
+        
+        if self.queue_dir:
+            scheduler = QueueCoordinator(self.queue_dir, spawn_workers=self.local_workers)
+            print(f"📮 Publishing fits to {self.queue_dir} "
+                  f"({self.local_workers} local workers; start more with "
+                  f"`python distributed_search.py {self.queue_dir}`)")
+        else:
+            scheduler = TrainingScheduler(n_workers=self.n_workers)
+        
+        with scheduler:
+            scheduler.start(X_train, y_train, weights)
+            runner = scheduler
+            if self.artifact_cache is not None:
+                runner = CachingRunner(runner, self.artifact_cache, key)
+            if checkpoint is not None:
+                runner = CheckpointRunner(runner, checkpoint, key)
+            try:
+                scheduler.run_families(searches, runner=runner)
+            finally:
+                if checkpoint is not None:
+                    checkpoint.close()
+            report = scheduler.report()
+        
+        for family, search in searches.items():
+            self.models[family] = search.best_estimator_
+            if search.oof_predictions_ is not None:
+                self.oof_predictions[family] = search.oof_predictions_
+            if self.search_mode == 'halving':
+                self.search_logs[family] = {
+                    'n_fits': search.n_fits_,
+                    'elapsed': search.elapsed_,
+                    'budget_exhausted': search.budget_exhausted_,
+                    'pruning': search.pruning_log
+                }
+            print(f"✅ {family} best parameters found: {search.best_params_}")
+            print(f"✅ {family} best CV score: {search.best_score_:.4f}")
+        
+        if self.artifact_cache is not None:
+            report['artifact_cache'] = dict(self.artifact_cache.stats)
+        if checkpoint is not None:
+            report['resumed_fits'] = checkpoint.resumed
+        
+        self._print_training_report(report)
+        self.training_report = report
+        return {family: search.best_estimator_ for family, search in searches.items()}
+    
+    def _print_training_report(self, report):
+        print(f"\n⏱  Training report ({report['workers']} workers):")
+        for family, stats in report['families'].items():
+            print(
+                f"   {family}: {stats['wall_time']:.1f}s wall, {stats['cpu_time']:.1f}s CPU, "
+                f"{stats['tasks']} fits, {stats.get('cores_used', 0.0):.2f} cores"
+            )
+        print(
+            f"   Total: {report['wall_time']:.1f}s wall, {report['cpu_time']:.1f}s CPU, "
+            f"core utilization {report['utilization']:.0%}"
         )
-        search.fit(X_train, y_train)
-        
-        best_model = search.best_estimator_
-        print(f"✅ Best parameters found: {search.best_params_}")
-        print(f"✅ Best CV score: {search.best_score_:.4f}")
-        
-        self.models['RandomForest'] = best_model
-        return best_model
+        for worker, stats in report.get('nodes', {}).items():
+            print(
+                f"   Worker {worker}: {stats['tasks']} fits, {stats['tasks_per_min']:.1f}/min, "
+                f"{stats['busy']:.0%} busy, {stats['failures']} failures"
+            )
+        if report.get('retries'):
+            print(f"   Retried tasks: {report['retries']}")
+        if 'artifact_cache' in report:
+            cache_stats = report['artifact_cache']
+            print(f"   Artifact cache: {cache_stats['hits']} reused, {cache_stats['misses']} trained, "
+                  f"{cache_stats['evicted']} old artifacts evicted")
+        if report.get('resumed_fits'):
+            print(f"   Resumed from checkpoint: {report['resumed_fits']} fits")
+    
+    def train_all_models(self, X_train, y_train):
+        """Train every model family concurrently under the global worker budget"""
+        print(f"\n🤖 Training {', '.join(PARAM_GRIDS)} models concurrently...")
+        return self._train_families(list(PARAM_GRIDS), X_train, y_train)
+    
+    def train_random_forest(self, X_train, y_train):
+        """Train optimized Random Forest model"""
+        print("\n🤖 Training Random Forest model...")
+        return self._train_families(['RandomForest'], X_train, y_train)['RandomForest']
     
     def train_gradient_boosting(self, X_train, y_train):
         """Train optimized Gradient Boosting model"""
         print("\n🤖 Training Gradient Boosting model...")
-        
-        param_grid = {
-            'n_estimators': [100, 200],
-            'max_depth': [3, 5, 7],
-            'learning_rate': [0.01, 0.1, 0.2],
-            'min_samples_split': [2, 5],
-        }
-        
-        gb = GradientBoostingRegressor(random_state=42, subsample=0.8)
-        
-        search = GridSearchCV(
-            gb, param_grid, cv=3, n_jobs=-1, verbose=1,
-            scoring='r2'
-        )
-        search.fit(X_train, y_train)
-        
-        best_model = search.best_estimator_
-        print(f"✅ Best parameters found: {search.best_params_}")
-        print(f"✅ Best CV score: {search.best_score_:.4f}")
-        
-        self.models['GradientBoosting'] = best_model
-        return best_model
+        return self._train_families(['GradientBoosting'], X_train, y_train)['GradientBoosting']
     
     def train_adaboost(self, X_train, y_train):
         """Train AdaBoost model"""
         print("\n🤖 Training AdaBoost model...")
-        
-        param_grid = {
-            'n_estimators': [100, 200],
-            'learning_rate': [0.5, 1.0, 1.5],
+        return self._train_families(['AdaBoost'], X_train, y_train)['AdaBoost']
+    
+    def train_stacked_ensemble(self):
+        """Blend the trained families with weights fitted on their out-of-fold predictions"""
+        members = [name for name in self.models if name in self.oof_predictions]
+        if len(members) < 2:
+            print("⚠️  Stacking needs out-of-fold predictions from at least two models - skipping")
+            return None
+        
+        print(f"\n🤖 Stacking {', '.join(members)} from out-of-fold predictions...")
+        stacked = StackedRegressor.from_oof(
+            {name: self.models[name] for name in members}, self.oof_predictions, self.y_train,
+            sample_weight=self.train_weights
+        )
+        self.models['Stacked'] = stacked
+        self.oof_predictions['Stacked'] = stacked.blend(
+            np.column_stack([self.oof_predictions[name] for name in members])
+        )
+        print(f"✅ Blend weights: " + ", ".join(
+            f"{name}={weight:.3f}" for name, weight in zip(members, stacked.weights)
+        ))
+        return stacked
+    
+    def cross_validation_scores(self, model_name):
+        """Per-fold R² from the cached out-of-fold predictions (no refits)"""
+        oof = self.oof_predictions.get(model_name)
+        if oof is None or self.folds is None:
+            return None
+        if self.train_weights is None:
+            return np.array([
+                r2_score(self.y_train[val_idx], oof[val_idx]) for _, val_idx in self.folds
+            ])
+        # Compacted rows: R² over the raw rows they stand for
+        return np.array([
+            raw_r2(self.y_train[val_idx], oof[val_idx], self.train_weights[val_idx],
+                   self.train_y_var[val_idx])
+            for _, val_idx in self.folds
+        ])
+    
+    def select_best_model(self, model_metrics, X_test):
+        """Measure every model's inference cost on a fixed benchmark and pick one to deploy"""
+        print(f"\n⏱  Measuring inference latency and size...")
+        X_benchmark = benchmark_rows(X_test)
+        self.inference = {
+            name: measure_inference(self.models[name], X_benchmark) for name in model_metrics
         }
-        
-        ada = AdaBoostRegressor(random_state=42)
-        
-        search = GridSearchCV(
-            ada, param_grid, cv=3, n_jobs=-1, verbose=0,
-            scoring='r2'
+        for name, cost in self.inference.items():
+            print(
+                f"   {name}: R² {model_metrics[name]['r2']:.4f}, single-row p50 "
+                f"{cost['single_p50_ms']:.2f}ms / p99 {cost['single_p99_ms']:.2f}ms, "
+                f"batch {cost['batch_rows_per_s']:,.0f} rows/s, {cost['size_bytes'] / 1024 / 1024:.1f} MB"
+            )
+        
+        chosen, self.selection = select_model(
+            model_metrics, self.inference, max_p99_ms=self.max_p99_ms,
+            max_size_mb=self.max_size_mb, r2_tolerance=self.r2_tolerance
         )
-        search.fit(X_train, y_train)
+        if self.selection['over_budget_fallback']:
+            print("⚠️  No model meets the latency/size budget - choosing the fastest")
         
-        best_model = search.best_estimator_
-        print(f"✅ Best parameters found: {search.best_params_}")
-        print(f"✅ Best CV score: {search.best_score_:.4f}")
-        
-        self.models['AdaBoost'] = best_model
-        return best_model
+        self.best_model_name = chosen
+        self.model = self.models[chosen]
+        self.metrics = model_metrics[chosen]
+        return chosen
     
     def evaluate_model(self, model, X_test, y_test, model_name="Model"):
         """Evaluate model performance"""
         print(f"\n📈 Evaluating {model_name}...")
         
-        # Make predictions
-        y_pred = model.predict(X_test)
-        
         # Clamp predictions to 1-10 range
-        y_pred = np.clip(y_pred, 1, 10)
-        
-        # Calculate metrics
-        mse = mean_squared_error(y_test, y_pred)
-        rmse = np.sqrt(mse)
-        mae = mean_absolute_error(y_test, y_pred)
-        r2 = r2_score(y_test, y_pred)
-        mape = mean_absolute_percentage_error(y_test, y_pred)
+        y_pred = np.clip(model.predict(X_test), 1, 10)
+        metrics = self._metrics(
+            {metric: float(values[0]) for metric, values in point_metrics(y_test, y_pred).items()},
+            model_name
+        )
+        self._print_metrics(metrics, model_name)
+        return y_pred, metrics
+    
+    def evaluate_all_models(self, X_test, y_test, n_resamples=None):
+        """
+        Evaluate every trained model from one predictions matrix, with paired
+        bootstrap confidence intervals
+        
+        Returns:
+            tuple: (name -> (y_test, y_pred), name -> metrics)
+        """
+        n_resamples = self.bootstrap_resamples if n_resamples is None else n_resamples
+        predictions = {
+            name: np.clip(model.predict(X_test), 1, 10) for name, model in self.models.items()
+        }
         
-        # Cross-validation score
-        kfold = KFold(n_splits=5, shuffle=True, random_state=42)
-        cv_scores = cross_val_score(model, X_test, y_test, cv=kfold, scoring='r2')
+        started = time.perf_counter()
+        self.evaluation = evaluate_predictions(
+            y_test, predictions, n_resamples=n_resamples, random_state=42
+        )
+        elapsed = time.perf_counter() - started
         
-        metrics = {
-            'mse': mse,
-            'rmse': rmse,
-            'mae': mae,
-            'r2': r2,
-            'mape': mape,
-            'cv_mean': cv_scores.mean(),
-            'cv_std': cv_scores.std()
+        model_metrics = {
+            name: self._metrics(metrics, name) for name, metrics in self.evaluation['metrics'].items()
         }
+        for name, metrics in model_metrics.items():
+            self._print_metrics(metrics, name)
+        
+        reference = self.evaluation['reference']
+        if self.evaluation['comparisons']:
+            level = int(self.evaluation['confidence'] * 100)
+            print(f"\n⚖️  Paired bootstrap vs {reference} ({n_resamples} resamples, {elapsed:.2f}s):")
+            for name, comparison in self.evaluation['comparisons'].items():
+                low, high = comparison['r2_delta_ci']
+                verdict = "no clear difference" if low <= 0 <= high else "significant"
+                print(f"   {name}: ΔR² {comparison['r2_delta']:+.4f} "
+                      f"[{low:+.4f}, {high:+.4f}] {level}% CI, "
+                      f"better in {comparison['p_better']:.1%} of resamples ({verdict})")
+        
+        return {name: (y_test, y_pred) for name, y_pred in predictions.items()}, model_metrics
+    
+    def _metrics(self, metrics, model_name):
+        """Test metrics plus the cross-validation score from the search's out-of-fold predictions"""
+        metrics = dict(metrics)
+        metrics['mse'] = metrics['rmse'] ** 2
+        cv_scores = self.cross_validation_scores(model_name)
+        metrics['cv_mean'] = cv_scores.mean() if cv_scores is not None else None
+        metrics['cv_std'] = cv_scores.std() if cv_scores is not None else None
+        return metrics
+    
+    def _print_metrics(self, metrics, model_name):
+        def interval(metric):
+            if f'{metric}_ci' not in metrics:
+                return ""
+            low, high = metrics[f'{metric}_ci']
+            return f" [{low:.4f}, {high:.4f}]"
         
         print(f"\n📊 Performance Metrics ({model_name}):")
-        print(f"   ✓ R² Score: {r2:.4f}")
-        print(f"   ✓ RMSE: {rmse:.4f}")
-        print(f"   ✓ MAE: {mae:.4f}")
-        print(f"   ✓ MAPE: {mape:.4f}%")
-        print(f"   ✓ CV R² (mean ± std): {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
-        
-        # Show sample predictions
-        print(f"\n🎯 Sample Predictions ({model_name}):")
-        sample_indices = np.random.choice(len(y_test), min(5, len(y_test)), replace=False)
-        for idx in sample_indices:
-            actual = y_test.iloc[idx]
-            predicted = y_pred[idx]
-            error = abs(actual - predicted)
-            print(f"   Actual: {actual:.2f}, Predicted: {predicted:.2f}, Error: {error:.2f}")
-        
-        return y_pred, metrics
+        print(f"   ✓ R² Score: {metrics['r2']:.4f}{interval('r2')}")
+        print(f"   ✓ RMSE: {metrics['rmse']:.4f}{interval('rmse')}")
+        print(f"   ✓ MAE: {metrics['mae']:.4f}{interval('mae')}")
+        print(f"   ✓ MAPE: {metrics['mape'] * 100:.2f}%")
+        if metrics['cv_mean'] is not None:
+            print(f"   ✓ CV R² (mean ± std): {metrics['cv_mean']:.4f} ± {metrics['cv_std']:.4f}")
     
-    def plot_feature_importance(self, models_to_plot, X_train, output_dir='models'):
-        """Plot and save feature importance for multiple models"""
-        print(f"\n📊 Analyzing feature importance...")
-        
-        os.makedirs(output_dir, exist_ok=True)
+    def _feature_importances(self, models):
+        """Model name -> feature_importances_ for the models that expose them"""
+        return {
+            name: np.asarray(model.feature_importances_)
+            for name, model in models.items() if hasattr(model, 'feature_importances_')
+        }
+    
+    def compute_feature_importance(self, X_val=None, y_val=None):
+        """
+        Record and print the deployed model's top features (no plotting)
         
-        fig, axes = plt.subplots(1, len(models_to_plot), figsize=(6 * len(models_to_plot), 5))
-        if len(models_to_plot) == 1:
-            axes = [axes]
+        With validation data, importances are permutation-based (R² drop when a
+        feature is shuffled); impurity importances are kept alongside for comparison
+        """
+        print(f"\n📊 Analyzing feature importance...")
         
-        for idx, (model_name, model) in enumerate(models_to_plot.items()):
-            if hasattr(model, 'feature_importances_'):
-                importances = model.feature_importances_
-                
-                feature_importance = pd.DataFrame({
-                    'feature': ['num_objectives', 'num_materials', 'num_activities',
-                               'num_assessments', 'has_differentiation', 'duration', 'content_words'],
-                    'importance': importances
-                }).sort_values('importance', ascending=False)
-                
-                sns.barplot(data=feature_importance, x='importance', y='feature', 
-                           palette='viridis', ax=axes[idx])
-                axes[idx].set_title(f'{model_name} Feature Importance')
-                axes[idx].set_xlabel('Importance Score')
-        
-        plt.tight_layout()
-        
-        plot_path = os.path.join(output_dir, 'feature_importance_comparison.png')
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-        print(f"✅ Feature importance plot saved to {plot_path}")
-        plt.close()
-        
-        # Save top features
         if self.best_model_name and self.best_model_name in self.models:
             model = self.models[self.best_model_name]
             if hasattr(model, 'feature_importances_'):
-                feature_importance = pd.DataFrame({
-                    'feature': ['num_objectives', 'num_materials', 'num_activities',
-                               'num_assessments', 'has_differentiation', 'duration', 'content_words'],
-                    'importance': model.feature_importances_
-                }).sort_values('importance', ascending=False)
-                
+                self.impurity_importance = importance_frame(model.feature_importances_, FEATURE_COLUMNS)
+                self.feature_importance = self.impurity_importance
+            
+            if X_val is not None and self.permutation_repeats > 0:
+                result = self.compute_permutation_importance(model, X_val, y_val)
+                self.feature_importance = importance_frame(
+                    [result['importances'][name]['mean'] for name in FEATURE_COLUMNS], FEATURE_COLUMNS
+                )
+            
+            if self.feature_importance is not None:
                 print(f"\n🔝 Top Features ({self.best_model_name}):")
-                for idx, row in feature_importance.head(10).iterrows():
+                for idx, row in self.feature_importance.head(10).iterrows():
                     print(f"   {row['feature']}: {row['importance']:.4f}")
-                
-                self.feature_importance = feature_importance
+    
+    def compute_permutation_importance(self, model, X_val, y_val):
+        """
+        Batched permutation importance of one model, cached per model version
+        
+        Returns:
+            dict with per-feature mean / std R² drop, baseline R² and the model version
+        """
+        X_val = np.asarray(X_val, dtype=float)
+        y_val = np.asarray(y_val, dtype=float)
+        version = model_key(model)
+        key = importance_key(
+            model, data_key(X_val, y_val, FEATURE_COLUMNS), self.permutation_repeats, 42
+        )
+        
+        result = self.artifact_cache.get(key) if self.artifact_cache else None
+        cached = result is not None
+        started = time.perf_counter()
+        if not cached:
+            raw = permutation_importance(
+                model, X_val, y_val, n_repeats=self.permutation_repeats,
+                n_workers=self.n_workers, random_state=42
+            )
+            result = {
+                'model_version': version,
+                'baseline_r2': raw['baseline_r2'],
+                'n_repeats': raw['n_repeats'],
+                'validation_rows': len(y_val),
+                'importances': {
+                    name: {'mean': float(mean), 'std': float(std)}
+                    for name, mean, std in zip(FEATURE_COLUMNS, raw['importances_mean'], raw['importances_std'])
+                }
+            }
+            if self.artifact_cache:
+                self.artifact_cache.put(key, result)
+        
+        source = "cache" if cached else f"{time.perf_counter() - started:.2f}s"
+        print(f"   Permutation importance: {self.permutation_repeats} shuffles x "
+              f"{len(FEATURE_COLUMNS)} features on {len(y_val)} rows ({source})")
+        self.permutation_importance = result
+        return result
+    
+    def plot_feature_importance(self, models_to_plot, X_train, output_dir='models'):
+        """Plot and save feature importance for multiple models"""
+        self.compute_feature_importance()
+        reports.plot_feature_importance(
+            self._feature_importances(models_to_plot), FEATURE_COLUMNS, output_dir
+        )
     
     def plot_predictions(self, models_results, output_dir='models'):
         """Plot actual vs predicted values for best model"""
         print(f"\n📊 Creating prediction visualization...")
         
-        os.makedirs(output_dir, exist_ok=True)
-        
         # Get best model results
         if self.best_model_name in models_results:
             y_test, y_pred = models_results[self.best_model_name]
-            
-            fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-            
-            # Actual vs Predicted scatter plot
-            axes[0].scatter(y_test, y_pred, alpha=0.6, edgecolors='k')
-            axes[0].plot([1, 10], [1, 10], 'r--', lw=2)
-            axes[0].set_xlabel('Actual Health Score')
-            axes[0].set_ylabel('Predicted Health Score')
-            axes[0].set_title(f'{self.best_model_name}: Actual vs Predicted')
-            axes[0].set_xlim(1, 10)
-            axes[0].set_ylim(1, 10)
-            axes[0].grid(True, alpha=0.3)
-            
-            # Residuals plot
-            residuals = y_test.values - y_pred
-            axes[1].scatter(y_pred, residuals, alpha=0.6, edgecolors='k')
-            axes[1].axhline(y=0, color='r', linestyle='--', lw=2)
-            axes[1].set_xlabel('Predicted Health Score')
-            axes[1].set_ylabel('Residuals')
-            axes[1].set_title(f'{self.best_model_name}: Residual Plot')
-            axes[1].grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            
-            plot_path = os.path.join(output_dir, 'predictions_plot.png')
-            plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-            print(f"✅ Prediction plot saved to {plot_path}")
-            plt.close()
+            reports.plot_predictions(self.best_model_name, y_test, y_pred, output_dir)
+    
+    def generate_report(self, model_results, mode='background', output_dir='models'):
+        """
+        Render the training plots
+        
+        Args:
+            mode: 'background' (detached process, don't wait), 'inline' or 'none'
+        """
+        if mode == 'none':
+            print("\n⏭  Skipping training report plots (--no-plots)")
+            return None
+        
+        y_test, y_pred = model_results.get(self.best_model_name, (None, None))
+        payload = {
+            'importances': self._feature_importances(self.models),
+            'feature_names': FEATURE_COLUMNS,
+            'best_model_name': self.best_model_name,
+            'y_test': None if y_test is None else np.asarray(y_test),
+            'y_pred': y_pred,
+            'output_dir': output_dir
+        }
+        if mode == 'inline':
+            return reports.render_report(payload)
+        return reports.start_background_report(payload)
     
     def save_model(self, output_dir='models'):
         """Save trained model and metadata"""
@@ -333,8 +668,20 @@ class HealthScoreModelTrainer:
             'training_date': datetime.now().isoformat(),
             'metrics': self.metrics,
             'feature_importance': self.feature_importance.to_dict() if self.feature_importance is not None else None,
+            'permutation_importance': self.permutation_importance,
+            'impurity_importance': self.impurity_importance.to_dict() if self.impurity_importance is not None else None,
             'hyperparameters': self.model.get_params(),
-            'all_models': list(self.models.keys())
+            'all_models': list(self.models.keys()),
+            'training_rows': self.n_rows,
+            'search': {
+                'mode': self.search_mode,
+                'time_budget': self.time_budget,
+                'families': self.search_logs
+            },
+            'training_report': self.training_report,
+            'evaluation': self.evaluation,
+            'inference': self.inference,
+            'selection': self.selection
         }
         
         metadata_path = os.path.join(output_dir, 'model_metadata.json')
@@ -361,56 +708,359 @@ class HealthScoreModelTrainer:
         print("🤖 TRAINING MULTIPLE MODELS")
         print("="*70)
         
-        self.train_random_forest(X_train, y_train)
-        self.train_gradient_boosting(X_train, y_train)
-        self.train_adaboost(X_train, y_train)
+        self.train_all_models(X_train, y_train)
+        self.train_stacked_ensemble()
         
         # Evaluate all models
         print("\n" + "="*70)
         print("📊 EVALUATING ALL MODELS")
         print("="*70)
         
-        model_results = {}
-        model_metrics = {}
+        model_results, model_metrics = self.evaluate_all_models(X_test, y_test)
         
-        for model_name, model in self.models.items():
-            y_pred, metrics = self.evaluate_model(model, X_test, y_test, model_name)
-            model_results[model_name] = (y_test, y_pred)
-            model_metrics[model_name] = metrics
-        
-        # Select best model based on R² score
-        best_r2 = -1
-        for model_name, metrics in model_metrics.items():
-            if metrics['r2'] > best_r2:
-                best_r2 = metrics['r2']
-                self.best_model_name = model_name
-                self.model = self.models[model_name]
-                self.metrics = metrics
+        # Select best model by R² within the inference latency / size budgets
+        self.select_best_model(model_metrics, X_test)
+        best_r2 = self.metrics['r2']
         
         print("\n" + "="*70)
         print(f"🏆 BEST MODEL: {self.best_model_name} (R² = {best_r2:.4f})")
         print("="*70)
         
-        # Feature importance
-        self.plot_feature_importance(self.models, X_train)
-        
-        # Visualizations
-        self.plot_predictions(model_results)
+        # Feature importance (permutation-based, on the held-out test rows)
+        self.compute_feature_importance(X_test, y_test)
         
         # Save model
         self.save_model()
         
+        # Visualizations - after the model is saved, off the critical path
+        self.generate_report(model_results, mode=self.report_mode)
+        
         print("\n" + "="*70)
         print("✅ TRAINING COMPLETE!")
         print("="*70)
         
         return self.model, self.metrics
+    
+    def run_incremental(self, output_dir='models', window_rows=1000, holdout_fraction=0.2):
+        """
+        Refresh the saved model with rows appended to the training CSV since it was trained
+        Falls back to run_full_pipeline when the model can't be extended or the data drifted
+        
+        The update is scored on held-out rows it never trains on: the original test
+        split plus holdout_fraction of the new rows. It replaces the saved model only
+        if its RMSE there is no worse than the saved model's, and the saved metrics
+        are then recomputed on those rows.
+        """
+        print("=" * 70)
+        print("🔁 INCREMENTAL HEALTH SCORE MODEL UPDATE")
+        print("=" * 70)
+        
+        model_path = os.path.join(output_dir, 'health_score_model.pkl')
+        scaler_path = os.path.join(output_dir, 'scaler.pkl')
+        metadata_path = os.path.join(output_dir, 'model_metadata.json')
+        
+        metadata = {}
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+        
+        trained_rows = metadata.get('training_rows')
+        missing = [path for path in (model_path, scaler_path) if not os.path.exists(path)]
+        if missing or trained_rows is None:
+            print("⚠️  No incremental baseline (model, scaler and training_rows needed) - full retrain")
+            return self.run_full_pipeline()
+        
+        model = joblib.load(model_path)
+        if not supports_incremental(model):
+            print(f"⚠️  {type(model).__name__} can't be extended incrementally - full retrain")
+            return self.run_full_pipeline()
+        
+        X, y = self.load_data()
+        if len(X) < trained_rows:
+            print(f"⚠️  Training data shrank ({len(X)} < {trained_rows} rows) - full retrain")
+            return self.run_full_pipeline()
+        if len(X) == trained_rows:
+            print("✅ No new rows since the last training run - nothing to do")
+            return model, metadata.get('metrics', {})
+        
+        self.scaler = joblib.load(scaler_path)
+        X_scaled = self.scaler.transform(X)
+        y = np.asarray(y)
+        n_new = len(X) - trained_rows
+        print(f"\n📥 {n_new} new rows since the last training run ({trained_rows} trained)")
+        
+        reference_rmse = metadata.get('metrics', {}).get('rmse')
+        drift = detect_drift(
+            model, X_scaled[:trained_rows], X_scaled[trained_rows:], y[trained_rows:],
+            FEATURE_COLUMNS, reference_rmse=reference_rmse
+        )
+        print(f"   RMSE on new rows before update: {drift['new_rmse']:.4f}")
+        if drift['retrain']:
+            print("⚠️  Drift detected - full retrain:")
+            for reason in drift['reasons']:
+                print(f"   - {reason}")
+            return self.run_full_pipeline()
+        
+        # Held out: the test split prepare_data made of the trained rows, plus a share of the new rows
+        _, old_test = train_test_split(np.arange(trained_rows), test_size=0.2, random_state=42)
+        new_test = np.random.RandomState(42).choice(
+            np.arange(trained_rows, len(X)), int(round(n_new * holdout_fraction)), replace=False
+        )
+        holdout = np.concatenate([old_test, new_test])
+        
+        # Sliding window: new trees / stages learn from the most recent rows
+        window = np.arange(max(0, len(X) - max(window_rows, n_new)), len(X))
+        window = window[~np.isin(window, holdout)]
+        started = time.perf_counter()
+        updated, change = update_model(
+            copy.deepcopy(model), X_scaled[window], y[window], n_new - len(new_test), trained_rows
+        )
+        elapsed = time.perf_counter() - started
+        
+        predictions = {
+            'before': np.clip(model.predict(X_scaled[holdout]), 1, 10),
+            'after': np.clip(updated.predict(X_scaled[holdout]), 1, 10)
+        }
+        rmse = {
+            name: float(np.sqrt(mean_squared_error(y[holdout], values)))
+            for name, values in predictions.items()
+        }
+        print(f"✅ Updated {type(updated).__name__} in {elapsed:.1f}s: {change}")
+        print(f"   Held-out RMSE ({len(old_test)} test + {len(new_test)} new rows): "
+              f"{rmse['before']:.4f} before, {rmse['after']:.4f} after")
+        
+        if rmse['after'] > rmse['before']:
+            print(f"⚠️  The update is worse on held-out rows - keeping the saved model in {model_path}")
+            return model, metadata.get('metrics', {})
+        
+        self.model = updated
+        self.n_rows = len(X)
+        joblib.dump(updated, model_path)
+        print(f"✅ Model saved to {model_path}")
+        
+        metrics = {
+            name: value for name, value in metadata.get('metrics', {}).items()
+            if not name.endswith('_ci')  # Intervals of the old model no longer apply
+        }
+        point = point_metrics(y[holdout], predictions['after'])
+        metrics.update({name: float(values[0]) for name, values in point.items()})
+        metrics['mse'] = metrics['rmse'] ** 2
+        metrics['test_rows'] = len(holdout)
+        metadata['metrics'] = metrics
+        metadata['training_rows'] = self.n_rows
+        metadata['hyperparameters'] = updated.get_params()
+        metadata.setdefault('incremental_updates', []).append({
+            'date': datetime.now().isoformat(),
+            'new_rows': n_new,
+            'window_rows': len(window),
+            'holdout_rows': len(holdout),
+            'elapsed': elapsed,
+            'psi': drift['psi'],
+            'rmse_new_rows_before': drift['new_rmse'],
+            'rmse_holdout_before': rmse['before'],
+            'rmse_holdout_after': rmse['after'],
+            **change
+        })
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
+        print(f"✅ Metadata saved to {metadata_path}")
+        
+        return self.model, metrics
+    
+    def run_streaming(self, chunk_rows=100_000, epochs=3, output_dir='models/streaming', deploy_dir='models'):
+        """
+        Train from the CSV in fixed-size chunks - memory stays constant with dataset size
+        Fits an MLP with mini-batch partial fits on approximately robust-scaled features
+        
+        The model is saved to output_dir. It replaces the model in deploy_dir only
+        if its holdout R² is at least the deployed model's, and positive (deploy_dir=None never deploys).
+        """
+        print("=" * 70)
+        print("🌊 STREAMING (OUT-OF-CORE) HEALTH SCORE MODEL TRAINING")
+        print("=" * 70)
+        
+        if not os.path.exists(self.data_path):
+            raise FileNotFoundError(f"Data file not found: {self.data_path}")
+        
+        print(f"📥 Streaming {self.data_path} in chunks of {chunk_rows} rows...")
+        started = time.perf_counter()
+        streaming = StreamingTrainer(
+            self.data_path, FEATURE_COLUMNS, chunk_rows=chunk_rows, epochs=epochs
+        ).fit()
+        elapsed = time.perf_counter() - started
+        
+        self.scaler = streaming.scaler
+        self.model = streaming.model
+        self.n_rows = streaming.n_rows
+        self.best_model_name = 'StreamingMLP'
+        self.models = {self.best_model_name: self.model}
+        self.metrics = streaming.metrics
+        self.training_report = {
+            'mode': 'streaming',
+            'chunk_rows': chunk_rows,
+            'epochs': epochs,
+            'wall_time': elapsed
+        }
+        
+        print(f"\n📊 Holdout Metrics ({self.metrics.get('holdout_rows', 0)} rows, {elapsed:.1f}s):")
+        print(f"   ✓ R² Score: {self.metrics.get('r2', float('nan')):.4f}")
+        print(f"   ✓ RMSE: {self.metrics.get('rmse', float('nan')):.4f}")
+        print(f"   ✓ MAE: {self.metrics.get('mae', float('nan')):.4f}")
+        
+        self.save_model(output_dir)
+        
+        if deploy_dir is not None and os.path.abspath(deploy_dir) != os.path.abspath(output_dir):
+            deployed_r2 = None
+            metadata_path = os.path.join(deploy_dir, 'model_metadata.json')
+            if os.path.exists(metadata_path):
+                with open(metadata_path) as f:
+                    deployed_r2 = json.load(f).get('metrics', {}).get('r2')
+            
+            # With nothing deployed, a model still has to beat predicting the mean
+            r2 = self.metrics.get('r2')
+            bar = deployed_r2 if deployed_r2 is not None else 0.0
+            if r2 is not None and r2 >= bar and r2 > 0:
+                print(f"\n🚀 Holdout R² {r2:.4f} >= deployed "
+                      f"{'(none)' if deployed_r2 is None else f'{deployed_r2:.4f}'} - deploying")
+                self.save_model(deploy_dir)
+            else:
+                print(f"\n⚠️  Holdout R² {r2 if r2 is not None else float('nan'):.4f} is not above "
+                      f"{bar:.4f} - not deploying to {deploy_dir}, streaming model left in {output_dir}")
+        
+        return self.model, self.metrics
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train the health score model")
+    parser.add_argument(
+        '--search', choices=SEARCH_MODES, default='grid',
+        help="Hyperparameter search: exhaustive grid or budgeted successive halving"
+    )
+    parser.add_argument(
+        '--time-budget', type=float, default=None,
+        help="Wall-clock seconds for all hyperparameter searches (halving mode)"
+    )
+    parser.add_argument(
+        '--halving-factor', type=int, default=3,
+        help="Keep 1/factor of candidates per rung, with factor x more samples"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help="Worker processes shared by all model families (default: all cores)"
+    )
+    parser.add_argument(
+        '--cache-dir', default='models/.artifact_cache',
+        help="Content-addressed cache of fitted candidates and refits"
+    )
+    parser.add_argument(
+        '--cache-max-mb', type=float, default=2048,
+        help="Evict the least recently used cached artifacts above this size"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="Train every candidate from scratch without reading or writing the cache"
+    )
+    parser.add_argument(
+        '--checkpoint', default='models/.checkpoints/search.jsonl',
+        help="JSONL file recording every completed (candidate, fold) fit"
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help="Skip fits already recorded in the checkpoint of an interrupted run"
+    )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help="Warm-start the saved model with newly appended rows (full retrain on drift)"
+    )
+    parser.add_argument(
+        '--window-rows', type=int, default=1000,
+        help="Most recent rows the incremental update trains new trees/stages on"
+    )
+    parser.add_argument(
+        '--stream', action='store_true',
+        help="Out-of-core training: read the CSV in chunks with constant memory"
+    )
+    parser.add_argument('--chunk-rows', type=int, default=100_000, help="Rows per chunk (--stream)")
+    parser.add_argument('--epochs', type=int, default=3, help="Passes over the data (--stream)")
+    parser.add_argument(
+        '--stream-output', default='models/streaming',
+        help="Where --stream saves its model (deployed to models/ only if its holdout R² is no worse)"
+    )
+    parser.add_argument(
+        '--queue', default=None,
+        help="Shared queue directory: run the searches on distributed_search.py workers"
+    )
+    parser.add_argument(
+        '--local-workers', type=int, default=0,
+        help="Queue workers to start on this machine (with --queue)"
+    )
+    parser.add_argument(
+        '--dedup', action='store_true',
+        help="Fit on unique feature vectors weighted by row count (faster; approximate, see row_compaction.py)"
+    )
+    parser.add_argument(
+        '--max-p99-ms', type=float, default=None,
+        help="Deploy the best model whose single-row p99 latency is within this budget"
+    )
+    parser.add_argument(
+        '--max-model-mb', type=float, default=None,
+        help="Deploy the best model whose serialized size is within this budget"
+    )
+    parser.add_argument(
+        '--r2-tolerance', type=float, default=0.0,
+        help="Treat models within this R² of the best as tied and deploy the fastest"
+    )
+    parser.add_argument(
+        '--bootstrap', type=int, default=10000,
+        help="Paired bootstrap resamples for the test-metric confidence intervals (0 disables)"
+    )
+    parser.add_argument(
+        '--permutation-repeats', type=int, default=10,
+        help="Shuffles per feature for permutation importance (0 = impurity importances only)"
+    )
+    parser.add_argument(
+        '--no-plots', action='store_true',
+        help="Skip the feature importance / prediction plots"
+    )
+    parser.add_argument(
+        '--plots-inline', action='store_true',
+        help="Render the plots before exiting instead of in a background process"
+    )
+    parser.add_argument('--data', default='data/training_data.csv', help="Training CSV")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    
     # Create trainer
-    trainer = HealthScoreModelTrainer()
+    trainer = HealthScoreModelTrainer(
+        data_path=args.data,
+        search_mode=args.search,
+        time_budget=args.time_budget,
+        halving_factor=args.halving_factor,
+        n_workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        deduplicate=args.dedup,
+        max_p99_ms=args.max_p99_ms,
+        max_size_mb=args.max_model_mb,
+        r2_tolerance=args.r2_tolerance,
+        bootstrap_resamples=args.bootstrap,
+        permutation_repeats=args.permutation_repeats,
+        queue_dir=args.queue,
+        local_workers=args.local_workers,
+        report_mode='none' if args.no_plots else ('inline' if args.plots_inline else 'background')
+    )
     
     # Run pipeline
-    model, metrics = trainer.run_full_pipeline()
-
+    if args.stream:
+        model, metrics = trainer.run_streaming(
+            chunk_rows=args.chunk_rows, epochs=args.epochs, output_dir=args.stream_output
+        )
+    elif args.incremental:
+        model, metrics = trainer.run_incremental(window_rows=args.window_rows)
+    else:
+        model, metrics = trainer.run_full_pipeline()
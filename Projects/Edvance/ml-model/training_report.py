@@ -0,0 +1,144 @@
+"""
+Training Report Generation
+Renders the feature-importance and prediction PNGs. matplotlib / seaborn are
+imported only when a plot is drawn, so headless retrains never load them.
+The pipeline hands the plot data to a background process after the model is
+saved, so training finishes as soon as the model artifact is ready
+
+Usage:
+    python training_report.py models/.report_payload.joblib
+"""
+
+import os
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+PAYLOAD_NAME = '.report_payload.joblib'
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')  # Files only - no display needed
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def importance_frame(importances, feature_names):
+    return pd.DataFrame({
+        'feature': list(feature_names),
+        'importance': importances
+    }).sort_values('importance', ascending=False)
+
+
+def plot_feature_importance(importances, feature_names, output_dir='models'):
+    """
+    Bar charts of feature importance, one panel per model
+
+    Args:
+        importances: model name -> importances array (models without them are skipped)
+    """
+    if not importances:
+        return None
+
+    plt = _pyplot()
+    import seaborn as sns
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    fig, axes = plt.subplots(1, len(importances), figsize=(6 * len(importances), 5))
+    if len(importances) == 1:
+        axes = [axes]
+
+    for ax, (model_name, values) in zip(axes, importances.items()):
+        sns.barplot(data=importance_frame(values, feature_names), x='importance', y='feature',
+                    palette='viridis', ax=ax)
+        ax.set_title(f'{model_name} Feature Importance')
+        ax.set_xlabel('Importance Score')
+
+    plt.tight_layout()
+
+    plot_path = os.path.join(output_dir, 'feature_importance_comparison.png')
+    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"✅ Feature importance plot saved to {plot_path}")
+    return plot_path
+
+
+def plot_predictions(model_name, y_test, y_pred, output_dir='models'):
+    """Actual vs. predicted scatter and residual plot for one model"""
+    plt = _pyplot()
+
+    os.makedirs(output_dir, exist_ok=True)
+    y_test = np.asarray(y_test, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Actual vs Predicted scatter plot
+    axes[0].scatter(y_test, y_pred, alpha=0.6, edgecolors='k')
+    axes[0].plot([1, 10], [1, 10], 'r--', lw=2)
+    axes[0].set_xlabel('Actual Health Score')
+    axes[0].set_ylabel('Predicted Health Score')
+    axes[0].set_title(f'{model_name}: Actual vs Predicted')
+    axes[0].set_xlim(1, 10)
+    axes[0].set_ylim(1, 10)
+    axes[0].grid(True, alpha=0.3)
+
+    # Residuals plot
+    residuals = y_test - y_pred
+    axes[1].scatter(y_pred, residuals, alpha=0.6, edgecolors='k')
+    axes[1].axhline(y=0, color='r', linestyle='--', lw=2)
+    axes[1].set_xlabel('Predicted Health Score')
+    axes[1].set_ylabel('Residuals')
+    axes[1].set_title(f'{model_name}: Residual Plot')
+    axes[1].grid(True, alpha=0.3)
+
+    plt.tight_layout()
+
+    plot_path = os.path.join(output_dir, 'predictions_plot.png')
+    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"✅ Prediction plot saved to {plot_path}")
+    return plot_path
+
+
+def render_report(payload):
+    """Draw every plot described by a payload dict"""
+    plot_feature_importance(payload['importances'], payload['feature_names'], payload['output_dir'])
+    if payload.get('y_pred') is not None:
+        plot_predictions(
+            payload['best_model_name'], payload['y_test'], payload['y_pred'], payload['output_dir']
+        )
+
+
+def start_background_report(payload):
+    """
+    Render the report in a detached process; the caller does not wait for it
+
+    Returns:
+        subprocess.Popen of the renderer
+    """
+    output_dir = payload['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    payload_path = os.path.join(output_dir, PAYLOAD_NAME)
+    joblib.dump(payload, payload_path)
+
+    log_path = os.path.join(output_dir, 'report.log')
+    with open(log_path, 'w') as log:
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), payload_path],
+            stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            cwd=os.getcwd(), start_new_session=True
+        )
+    print(f"🖼  Rendering training report in the background (pid {process.pid}, log {log_path})")
+    return process
+
+
+if __name__ == "__main__":
+    payload_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join('models', PAYLOAD_NAME)
+    render_report(joblib.load(payload_path))
+    os.remove(payload_path)
@@ -0,0 +1,223 @@
+"""
+Concurrent Model-Family Training under a Global CPU Budget
+One process pool of n_workers runs every (candidate, fold) fit of every
+model family, so families and candidates train side by side instead of one
+family after another. Every fit is single-threaded (estimator n_jobs=1 and
+BLAS/OpenMP pools capped at 1 thread), so the pool size is the only source
+of parallelism and cores are never oversubscribed
+Reports per-family wall time and core utilization
+A fit that raises in a worker is scored NaN and skipped by the search
+instead of aborting every family
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from hyperparameter_search import failed_fit, fit_and_score, fit_with_weights, single_threaded
+
+# Training data, set once per worker process by the pool initializer
+_WORKER_DATA = {}
+
+
+def _init_worker(X, y, sample_weight=None):
+    """Pool initializer: keep the training data and cap native thread pools at 1"""
+    _WORKER_DATA['X'] = X
+    _WORKER_DATA['y'] = y
+    _WORKER_DATA['sample_weight'] = sample_weight
+    for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[variable] = '1'
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+
+def _fit_task(estimator, params, train_idx, val_idx):
+    return fit_and_score(
+        estimator, params, _WORKER_DATA['X'], _WORKER_DATA['y'], train_idx, val_idx,
+        _WORKER_DATA['sample_weight']
+    )
+
+
+def _refit_task(estimator, params):
+    cpu_started = time.process_time()
+    model = estimator.set_params(**params)
+    fit_with_weights(model, _WORKER_DATA['X'], _WORKER_DATA['y'], _WORKER_DATA['sample_weight'])
+    return model, time.process_time() - cpu_started
+
+
+class TrainingScheduler:
+    """
+    Shared worker pool for hyperparameter searches
+
+    Usage:
+        with TrainingScheduler(n_workers=4) as scheduler:
+            scheduler.start(X_train, y_train)
+            searches = scheduler.run_families({'RandomForest': rf_search, ...})
+        print(scheduler.report())
+    """
+
+    def __init__(self, n_workers=None):
+        self.n_workers = max(1, n_workers or os.cpu_count() or 1)
+        self._pool = None
+        self._data = None
+        self._lock = threading.Lock()
+        self._started = None
+        self._family_stats = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def start(self, X, y, sample_weight=None):
+        """Start the worker pool; each worker receives the training data (and row weights) once"""
+        self.shutdown()
+        self._data = (X, y, sample_weight)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.n_workers, initializer=_init_worker, initargs=(X, y, sample_weight)
+        )
+        self._started = time.perf_counter()
+        self._family_stats = {}
+        return self
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _abort(self):
+        """Drop queued fits; completed ones are already checkpointed / cached"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _record(self, label, cpu_time, n_tasks=1):
+        with self._lock:
+            stats = self._family_stats.setdefault(
+                label, {'tasks': 0, 'cpu_time': 0.0, 'wall_time': None}
+            )
+            stats['tasks'] += n_tasks
+            stats['cpu_time'] += cpu_time
+
+    def run_tasks(self, estimator, tasks, deadline=None, label=None, on_result=None):
+        """
+        Run (params, train_idx, val_idx) fit tasks on the pool
+
+        Tasks still queued when the deadline passes are cancelled and
+        reported as None; tasks already running are allowed to finish.
+        A task that raises is reported as a NaN-scored failed_fit result.
+        on_result(task position, result) is called as each fit completes.
+        """
+        estimator = single_threaded(estimator)
+        submitted = time.perf_counter()
+        futures = {
+            self._pool.submit(_fit_task, estimator, params, train_idx, val_idx): position
+            for position, (params, train_idx, val_idx) in enumerate(tasks)
+        }
+        results = [None] * len(tasks)
+        pending = set(futures)
+
+        def collect(future):
+            if future.cancelled():
+                return
+            try:
+                result = future.result()
+            except Exception as e:
+                result = failed_fit(e, submitted)
+            results[futures[future]] = result
+            self._record(label, result['cpu_time'])
+            if on_result is not None:
+                on_result(futures[future], result)
+
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+
+            if deadline is not None and time.perf_counter() > deadline:
+                for future in pending:
+                    future.cancel()
+                # Collect whatever was already running
+                for future in pending:
+                    collect(future)
+                break
+
+        return results
+
+    def refit(self, estimator, params, label=None):
+        """Fit the chosen candidate on all training data in a worker"""
+        model, cpu_time = self._pool.submit(_refit_task, single_threaded(estimator), params).result()
+        self._record(label, cpu_time)
+        return model
+
+    def run_families(self, searches, runner=None):
+        """
+        Run several searches concurrently, all sharing this pool
+
+        Args:
+            searches: dict family name -> GridSearch / SuccessiveHalvingSearch
+            runner: optional wrapper around this scheduler (e.g. CachingRunner)
+
+        Returns:
+            dict: family name -> fitted search
+        """
+        X, y, sample_weight = self._data
+        runner = runner or self
+        errors = {}
+
+        def run(family, search):
+            started = time.perf_counter()
+            search.name = family
+            try:
+                search.fit(X, y, runner=runner, sample_weight=sample_weight)
+            except Exception as e:
+                errors[family] = e
+            finally:
+                with self._lock:
+                    stats = self._family_stats.setdefault(
+                        family, {'tasks': 0, 'cpu_time': 0.0, 'wall_time': None}
+                    )
+                    stats['wall_time'] = time.perf_counter() - started
+
+        threads = [
+            threading.Thread(target=run, args=(family, search), name=f'search-{family}', daemon=True)
+            for family, search in searches.items()
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self._abort()
+            raise
+
+        if errors:
+            family, error = next(iter(errors.items()))
+            raise RuntimeError(f"{family} search failed: {error}") from error
+
+        return searches
+
+    def report(self):
+        """Per-family wall/CPU time and overall core utilization"""
+        wall = time.perf_counter() - self._started if self._started else 0.0
+        with self._lock:
+            families = {name: dict(stats) for name, stats in self._family_stats.items()}
+        cpu_total = sum(stats['cpu_time'] for stats in families.values())
+        for stats in families.values():
+            if stats['wall_time']:
+                stats['cores_used'] = stats['cpu_time'] / stats['wall_time']
+        return {
+            'workers': self.n_workers,
+            'wall_time': wall,
+            'cpu_time': cpu_total,
+            'utilization': cpu_total / (wall * self.n_workers) if wall else 0.0,
+            'families': families
+        }